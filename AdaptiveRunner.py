@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import numpy as np
+from utils import setup_logger, metric_mapping
+from ParseBenchmark import ParseLogFile, GetEngine, ADAPTIVE_SUFFIX
+from trace_sketch import TRACE_SUFFIX
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("adaptive_runner_logger")
+
+# Two-sided 95% Student t quantiles by degrees of freedom, 1.96 beyond the table
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+def RelativeHalfWidth(values: list):
+    # Half width of the 95% confidence interval of the mean, relative to the mean
+    if len(values) < 2:
+        return np.inf
+    values = np.asarray(values, dtype=float)
+    mean = values.mean()
+    if mean == 0:
+        return np.inf
+    df = len(values) - 1
+    t = T_95[df - 1] if df <= len(T_95) else 1.96
+    return float(t * values.std(ddof=1) / np.sqrt(len(values)) / abs(mean))
+
+def GetRoundPrompts(num_prompts: int, concurrency: int):
+    # A fifth of the fixed-size run, but at least 4 waves of the concurrency so every round reaches steady state
+    return min(num_prompts, max(num_prompts // 5, 4 * concurrency))
+
+def GetRoundConfig(config: str, round_prompts: int):
+    # Name of the rounds' own config, e.g., i32_o32_c16_p3000 with 600 prompts per round -> i32_o32_c16_p600
+    return re.sub(r"_p\d+$", f"_p{round_prompts}", config)
+
+def RunRound(bench_cmd: list, prefix: str, i: int, round_prompts: int, result_file: bool):
+    log_file = f"{prefix}_iter{i}.log"
+    cmd = bench_cmd + ["--num-prompts", str(round_prompts)]
+    if result_file:
+        cmd += ["--result-file", f"{prefix}_iter{i}.json", "--trace-file", f"{prefix}_iter{i}{TRACE_SUFFIX}"]
+    with open(log_file, "w") as f:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        for line in process.stdout:
+            sys.stdout.write(line)
+            f.write(line)
+        process.wait()
+    return f"{prefix}_iter{i}.json" if result_file else log_file
+
+def main(args):
+    prefix = args.log_prefix
+    engine = GetEngine(prefix)
+    metrics = args.metrics
+    # Short rounds are saved as a config of their own, named by their prompt count, so ParseBenchmark.py never
+    # averages them with full-size runs of the config
+    round_prompts = args.round_prompts or GetRoundPrompts(args.num_prompts, args.concurrency)
+    folder, config = os.path.split(prefix)
+    round_config = GetRoundConfig(config, round_prompts)
+    round_prefix = os.path.join(folder, round_config)
+    # Rounds of an earlier run of this config would be averaged in by ParseBenchmark.py
+    for f in os.listdir(folder or "."):
+        if f.startswith(round_config + "_iter"):
+            os.remove(os.path.join(folder, f))
+    samples = {metric: [] for metric in metrics}
+    rounds = []
+    converged = False
+    start = time.time()
+
+    for i in range(1, args.max_rounds + 1):
+        round_start = time.time()
+        result = RunRound(args.bench_cmd, round_prefix, i, round_prompts, args.result_file)
+        values = ParseLogFile(result, engine) if os.path.exists(result) else {}
+        round_time = time.time() - round_start
+        for metric in metrics:
+            if values.get(metric):
+                samples[metric].append(values[metric][0])
+        widths = {metric: RelativeHalfWidth(samples[metric]) for metric in metrics}
+        rounds.append({"round": i, "seconds": round_time, "values": {m: values.get(m, [None])[0] for m in metrics},
+                       "rel_half_width": {m: (None if np.isinf(w) else w) for m, w in widths.items()}})
+        logger.info(f"[{py_script}] {os.path.basename(prefix)} round {i}: " +
+                    ", ".join(f"{m} ±{w:.2%}" for m, w in widths.items()))
+
+        if i >= args.min_rounds and all(w <= args.target for w in widths.values()):
+            converged = True
+            break
+        # Stop before a round that would exceed the time budget, even before --min-rounds
+        elapsed = time.time() - start
+        if elapsed + elapsed / i > args.max_time:
+            logger.warning(f"[{py_script}] {os.path.basename(prefix)} stops after {i} rounds, "
+                           f"the next round would exceed the budget of {args.max_time:.0f}s.")
+            break
+
+    report = {
+        "converged": converged,
+        "rounds": len(rounds),
+        "round_prompts": round_prompts,
+        "round_config": round_config,
+        "target_rel_half_width": args.target,
+        "seconds": time.time() - start,
+        "mean": {m: float(np.mean(v)) if v else None for m, v in samples.items()},
+        "std": {m: float(np.std(v, ddof=1)) if len(v) > 1 else None for m, v in samples.items()},
+        "history": rounds,
+    }
+    with open(prefix + ADAPTIVE_SUFFIX, "w") as f:
+        json.dump(report, f, indent=4)
+    status = "converged" if converged else "did not converge"
+    logger.info(f"[{py_script}] {os.path.basename(prefix)} {status} after {len(rounds)} rounds of {round_prompts} prompts "
+                f"({report['seconds']:.0f}s), saved as {round_config}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repeat a benchmark config in short rounds until its confidence interval is narrow enough")
+    parser.add_argument("--log-prefix", type=str, required=True, help="e.g., Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000")
+    parser.add_argument("--num-prompts", type=int, required=True, help="num_prompts of the config")
+    parser.add_argument("--concurrency", type=int, required=True, help="max_concurrency of the config")
+    parser.add_argument("--round-prompts", type=int, default=None, help="Prompts per round (default: num_prompts/5, at least 4*concurrency)")
+    parser.add_argument("--metrics", type=str, nargs="+", default=[metric_mapping["tput"], metric_mapping["ttft"]], help="Metrics that must converge")
+    parser.add_argument("--target", type=float, default=0.02, help="Target 95%% CI half width relative to the mean")
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=10)
+    parser.add_argument("--max-time", type=float, default=1800, help="Time budget of the config in seconds, "
+                        "benchmark.sh passes what is left of the night's --adaptive-budget")
+    parser.add_argument("--result-file", action="store_true", help="The client is bench_client.py, save and parse its JSON result")
+    parser.add_argument("bench_cmd", nargs=argparse.REMAINDER, help="-- followed by the benchmark command without --num-prompts")
+    args = parser.parse_args()
+    if args.bench_cmd and args.bench_cmd[0] == "--":
+        args.bench_cmd = args.bench_cmd[1:]
+    if not args.bench_cmd:
+        parser.error("The benchmark command is missing")
+
+    main(args)
+
+
+'''
+python AdaptiveRunner.py --log-prefix Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000 \
+    --num-prompts 3000 --concurrency 16 --result-file -- \
+    python bench_client.py --port 8123 --model /data/huggingface/hub/meta-llama/Llama-3.1-8B-Instruct \
+    --random-input-len 32 --random-output-len 32 --max-concurrency 16
+'''
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from utils import setup_logger
+from ParseBenchmark import PrepareTasks, RunTasks
+from image_index import CARRIED_KEY, CarryEngine
+from result_store import OpenStore, ResultJsonToRows, SaveManyDates, DEFAULT_DB
+from SaveOverviewCSV import FlattenResult, SaveDates
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("backfill_logger")
+
+# Rebuild the history from the raw logs after a parser change, instead of running ParseBenchmark.py, result_store.py
+# and SaveOverviewCSV.py once per night. The engine/model folders of all nights are parsed by one process pool, then
+# every Result.json is written once, the results store in one transaction and every overview CSV in one read and write.
+# Accuracy, docker names and Ray versions aren't in the logs and are kept from each Result.json.
+
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def FindDates(result_folder: str, first_date: str = None, last_date: str = None):
+    dates = sorted(d for d in os.listdir(result_folder)
+                   if DATE_PATTERN.fullmatch(d) and os.path.isdir(os.path.join(result_folder, d)))
+    return [d for d in dates if (first_date is None or d >= first_date) and (last_date is None or d <= last_date)]
+
+def LoadResult(json_file: str):
+    if not os.path.exists(json_file):
+        logger.warning(f"[{py_script}] {json_file} doesn't exist, create it from the logs only.")
+        return {}
+    with open(json_file, "r") as f:
+        return json.load(f)
+
+def ApplyCarried(results: dict, result_folder: str):
+    # A night that reused an image's numbers has no logs for that engine, copy them again from the re-parsed night
+    for date_str, data in sorted(results.items()):
+        for engine, from_date in data.get(CARRIED_KEY, {}).items():
+            source = results.get(from_date)
+            if source is None:
+                source_file = os.path.join(result_folder, from_date, "Result.json")
+                if not os.path.exists(source_file):
+                    logger.warning(f"[{py_script}] {date_str}: {engine} numbers were carried from {from_date}, "
+                                   f"which no longer exists. Leave them empty.")
+                    continue
+                source = LoadResult(source_file)
+            CarryEngine(data, source, engine, from_date)
+
+def main(args):
+    start = time.time()
+    dates = FindDates(args.result_folder, args.first_date, args.last_date)
+    if not dates:
+        logger.error(f"[{py_script}] No date folder in {args.result_folder}.")
+        return 1
+
+    # 1. Parse the engine/model folders of all nights together
+    results, tasks, task_dates = {}, [], []
+    for date_str in dates:
+        folder = os.path.join(args.result_folder, date_str)
+        results[date_str] = LoadResult(os.path.join(folder, "Result.json"))
+        date_tasks = PrepareTasks(folder, results[date_str], not args.no_cache)
+        tasks += date_tasks
+        task_dates += [date_str] * len(date_tasks)
+    n_parsed = 0
+    for date_str, (bench_type, model, averages, parsed, _) in zip(task_dates, RunTasks(tasks, args.workers)):
+        results[date_str]["Benchmark"][bench_type][model] = averages
+        n_parsed += parsed
+    ApplyCarried(results, args.result_folder)
+    logger.info(f"[{py_script}] Parsed {len(tasks)} engine/model folders of {len(dates)} nights ({n_parsed} logs "
+                f"re-parsed, the rest cached) in {time.time() - start:.1f}s.")
+
+    # 2. Write everything once
+    for date_str, data in results.items():
+        with open(os.path.join(args.result_folder, date_str, "Result.json"), "w") as f:
+            json.dump(data, f, indent=4)
+    conn = OpenStore(args.db)
+    SaveManyDates(conn, {date_str: ResultJsonToRows(data, date_str) for date_str, data in results.items()})
+    conn.close()
+    SaveDates({date_str: FlattenResult(data) for date_str, data in results.items()})
+    logger.info(f"[{py_script}] {dates[0]} ~ {dates[-1]} are saved to Result.json, '{args.db}' and the overview CSVs "
+                f"in {time.time() - start:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse the logs of every night and rebuild Result.json, the results store and the overview CSVs")
+    parser.add_argument("--result-folder", type=str, default="Result", help="Folder of the <date>/ folders")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    parser.add_argument("--first-date", type=str, default=None, help="Only nights from this date, e.g., 2025-08-01")
+    parser.add_argument("--last-date", type=str, default=None, help="Only nights up to this date")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parsing processes (default: number of CPUs)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every log and ignore the manifests")
+    args = parser.parse_args()
+
+    sys.exit(main(args))
+
+
+'''
+# Run from $HOME/CI like main.sh, the overview CSVs are written to the current folder
+python3 Backfill.py --result-folder Result --db Result/results.db
+python3 Backfill.py --first-date 2025-08-01 --last-date 2025-08-31 --no-cache
+'''
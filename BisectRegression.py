@@ -0,0 +1,189 @@
+import json
+import argparse
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+from utils import setup_logger, regression_metrics
+from docker_tags import SplitImage, TagsBetween
+from ParseBenchmark import ParseLogFile, GetEngine, ADAPTIVE_SUFFIX
+from trace_sketch import SKETCH_SUFFIX
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("bisect_regression_logger")
+
+class DockerBenchmarkRunner:
+    """Run benchmark.sh inside a container of the given image, only for the regressed configs."""
+    def __init__(self, engine: str, ci_dir: str, host_model_dir: str, container_model_dir: str):
+        self.engine = engine
+        self.ci_dir = ci_dir
+        self.host_model_dir = host_model_dir
+        self.container_model_dir = container_model_dir
+
+    def Run(self, repo: str, tag: str, targets: list):
+        image = f"{repo}:{tag}"
+        container = f"CI_Bisect_{self.engine}"
+        out_dir = tempfile.mkdtemp(prefix="bisect_", dir=os.path.join(self.ci_dir, "Result"))
+        subprocess.run(["docker", "pull", image], check=True)
+        subprocess.run(["docker", "run", "-t", "-d", "--rm", "--privileged", f"--name={container}", "--network=host",
+                        "--device=/dev/kfd", "--device=/dev/dri", "--group-add", "video", "--cap-add=SYS_PTRACE",
+                        "--security-opt", "seccomp=unconfined", "--ipc=host", "--shm-size=32g",
+                        "-v", f"{self.host_model_dir}:{self.container_model_dir}", "-v", f"{self.ci_dir}:{self.ci_dir}",
+                        "-w", self.ci_dir, image], check=True)
+        try:
+            # Same CI script dependencies as main.sh
+            subprocess.run(["docker", "exec", container, "bash", "-c", "pip install colorlog aiohttp"], check=True)
+            if any("ray" in bench_type for bench_type, _, _, _ in targets):
+                # Same Ray dependencies as main.sh
+                subprocess.run(["docker", "exec", container, "bash", "-c",
+                                "mkdir -p /app && git clone https://github.com/ray-project/ray.git /app/ray && "
+                                "pip install -r /app/ray/python/requirements.txt && pip install --upgrade ray[serve,llm] --no-deps"], check=True)
+            # One benchmark.sh call per (mode, model) with only the regressed tests
+            groups = {}
+            for bench_type, model, config, _ in targets:
+                groups.setdefault((bench_type, model), set()).add(config)
+            for (bench_type, model), configs in groups.items():
+                mode = bench_type.split('_')[1]
+                subprocess.run(["docker", "exec", container, "bash", "-c",
+                                f"./benchmark.sh --engine {self.engine} --model-dir {self.container_model_dir} --out-dir {out_dir} "
+                                f"--only-mode {mode} --only-model {model} --only-tests {','.join(sorted(configs))}"], check=False)
+            return ParseTargets(out_dir, targets)
+        finally:
+            subprocess.run(["docker", "stop", container], check=False)
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+class FakeBenchmarkRunner:
+    """Return canned numbers for local testing. results_file: {tag: Result.json-like "Benchmark" section}"""
+    def __init__(self, results_file: str):
+        with open(results_file, "r") as f:
+            self.results = json.load(f)
+
+    def Run(self, repo: str, tag: str, targets: list):
+        benchmark = self.results.get(tag, {})
+        values = {}
+        for bench_type, model, config, metric in targets:
+            values[(bench_type, model, config, metric)] = benchmark.get(bench_type, {}).get(model, {}).get(config, {}).get(metric)
+        return values
+
+def ParseTargets(out_dir: str, targets: list):
+    values = {}
+    for bench_type, model, config, metric in targets:
+        folder = os.path.join(out_dir, bench_type, model)
+        samples = []
+        if os.path.isdir(folder):
+            files = sorted(f for f in os.listdir(folder) if f.startswith(config + "_"))
+            # Prefer bench_client.py's JSON result over the log of the same run
+            files = [f for f in files if f.endswith(".json") or (f.endswith(".log") and f[:-4] + ".json" not in files)]
+            # Convergence reports and latency sketches aren't benchmark results, like in ParseBenchmark.ParseModelFolder
+            files = [f for f in files if not f.endswith(ADAPTIVE_SUFFIX) and not f.endswith(SKETCH_SUFFIX)]
+            for log_file in files:
+                samples += ParseLogFile(os.path.join(folder, log_file), GetEngine(bench_type)).get(metric, [])
+        values[(bench_type, model, config, metric)] = sum(samples) / len(samples) if samples else None
+    return values
+
+def LoadTargets(verdict_file: str, engine: str):
+    # Regressed benchmark configs of this engine from CheckRegression.py's verdict
+    with open(verdict_file, "r") as f:
+        verdict = json.load(f)
+    targets = {}
+    for check in verdict["regressions"]:
+        if check["section"] == "Benchmark" and check["bench_type"].startswith(engine + "_"):
+            key = (check["bench_type"], check["model"], check["config"], check["metric"])
+            targets[key] = (check["baseline_median"], check["current"])
+    return targets
+
+def IsBad(values: dict, targets: dict):
+    # A tag is bad when any regressed config lands on the bad side of the midpoint between good and bad numbers
+    for key, (good, bad) in targets.items():
+        value = values.get(key)
+        if value is None or value == 0:
+            logger.warning(f"[{py_script}] No result for {key}, treat it as bad.")
+            return True
+        if abs(value - bad) < abs(value - good):
+            return True
+    return False
+
+def Bisect(repo: str, candidates: list, targets: dict, runner):
+    # candidates[0] is known good, candidates[-1] is known bad
+    tested = {}
+    lo, hi = 0, len(candidates) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        tag = candidates[mid]
+        logger.info(f"[{py_script}] Testing {repo}:{tag} ({hi - lo - 1} candidates left)")
+        values = runner.Run(repo, tag, list(targets))
+        bad = IsBad(values, targets)
+        tested[tag] = {"bad": bad, "values": {"/".join(key): value for key, value in values.items()}}
+        logger.info(f"[{py_script}] {repo}:{tag} is {'bad' if bad else 'good'}")
+        if bad:
+            hi = mid
+        else:
+            lo = mid
+    return candidates[lo], candidates[hi], tested
+
+def main(args):
+    targets = LoadTargets(args.verdict, args.engine)
+    if args.metrics:
+        targets = {key: value for key, value in targets.items() if key[3] in args.metrics}
+    if not targets:
+        logger.info(f"[{py_script}] No {args.engine} regression in {args.verdict}, nothing to bisect.")
+        return
+
+    repo, good_tag = SplitImage(args.good_image)
+    _, bad_tag = SplitImage(args.bad_image)
+    candidates = TagsBetween(repo, good_tag, bad_tag, args.tags_file)
+    logger.info(f"[{py_script}] {len(candidates) - 2} images between {good_tag} and {bad_tag}, "
+                f"{len(targets)} regressed configs to re-run")
+
+    if args.fake_results:
+        runner = FakeBenchmarkRunner(args.fake_results)
+    else:
+        runner = DockerBenchmarkRunner(args.engine, args.ci_dir, args.model_dir, args.container_model_dir)
+    last_good, first_bad, tested = Bisect(repo, candidates, targets, runner)
+    logger.info(f"[{py_script}] Last good: {repo}:{last_good}")
+    logger.warning(f"[{py_script}] First bad: {repo}:{first_bad}")
+
+    if args.out_json:
+        report = {
+            "repo": repo,
+            "last_good": last_good,
+            "first_bad": first_bad,
+            "candidates": candidates,
+            "targets": ["/".join(key) for key in targets],
+            "tested": tested,
+        }
+        with open(args.out_json, "w") as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"[{py_script}] Bisect report is saved to '{args.out_json}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    parser.add_argument("--verdict", type=str, required=True, help="Regression.json of the first bad date (CheckRegression.py)")
+    parser.add_argument("--good-image", type=str, required=True, help="Last good image, e.g., rocm/vllm-dev:rc1_20250811")
+    parser.add_argument("--bad-image", type=str, required=True, help="First bad image")
+    parser.add_argument("--metrics", type=str, nargs="+", default=None, choices=list(regression_metrics), help="Only bisect these metrics")
+    parser.add_argument("--tags-file", type=str, default=None, help="(Testing) Docker Hub tag list to use instead of the network")
+    parser.add_argument("--fake-results", type=str, default=None, help="(Testing) Canned benchmark numbers per tag instead of running benchmark.sh")
+    parser.add_argument("--ci-dir", type=str, default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--model-dir", type=str, default=os.path.expanduser("~/data/huggingface/hub/"), help="Model folder on the host")
+    parser.add_argument("--container-model-dir", type=str, default="/data/huggingface/hub/")
+    parser.add_argument("--out-json", type=str, default=None, help="Save the bisect report to this file.")
+    args = parser.parse_args()
+
+    main(args)
+
+'''
+python3 BisectRegression.py --engine vLLM \
+    --verdict Result/2025-08-18/Regression.json \
+    --good-image rocm/vllm-dev:rc1_20250811 \
+    --bad-image rocm/vllm-dev:rc1_20250818 \
+    --out-json Result/2025-08-18/Bisect_vLLM.json
+
+# Local test
+python3 BisectRegression.py --engine vLLM --verdict Regression.json \
+    --good-image rocm/vllm-dev:rc_0 --bad-image rocm/vllm-dev:rc_9 \
+    --tags-file tags.json --fake-results fake_results.json
+'''
@@ -5,114 +5,214 @@ import sys
 from datetime import datetime
 import colorlog
 import numpy as np
-from utils import setup_logger, bench_types, models, \
-    log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, metric_mapping, GetMetrics 
+from utils import setup_logger, bench_types, models, regression_metrics, startup_metrics, GetMetrics
+from image_index import CARRIED_KEY, HasNumbers
 import logging
 
 py_script = os.path.basename(sys.argv[0])
 logger = setup_logger("check_regression_logger")
 
-def CheckAccuracy(cur_acc: dict, pre_acc: dict, threshold):
-    engines = ["vLLM", "SGLang"]
-
-    for engine in engines:
-        if engine in cur_acc and engine in pre_acc:
-            for model in models:
-                if model in cur_acc[engine] and model in pre_acc[engine]:
-                    diff = (cur_acc[engine][model] - pre_acc[engine][model]) / pre_acc[engine][model]
-                    if diff < - threshold:
-                        logger.warning(f"[{py_script}] {engine} {model} Seeing a accuracy regression.")
-                else:
-                    logger.warning(f"[{py_script}] {engine} {model} accuracy in not in json file.")
-
-def CheckBenchmark(cur_bench: dict, pre_bench: dict, threshold):
-    tput_diff_8B_70B = []
-    ttft_diff_8B_70B = []
-    tput_diff_Scout = []
-    ttft_diff_Scout = []
-    def CheckValue(data: dict, metrics: list):
-        for metric in metrics:
-            if metric not in data:
-                return False
-            if data[metric] == 0: # value 0 means this benchmark didn't finish successfully
-                return False
-        return True
-
-    # Calculate the changes
-    for bt in bench_types:
-        if bt in cur_bench and bt in pre_bench:
-            metrics=GetMetrics(bt)
-            for model in models:
-                if model in cur_bench[bt] and model in pre_bench[bt]:
-                    model_8B_70B = ("meta-llama_Llama-3.1-8B-Instruct", "meta-llama_Llama-3.3-70B-Instruct")
-                    configs = log_files_prefix_Llama_8B_70B if model in model_8B_70B else log_file_prefix_Llama4_Scout
-                    tput_list, ttft_list = (
-                        (tput_diff_8B_70B, ttft_diff_8B_70B)
-                        if model in model_8B_70B
-                        else (tput_diff_Scout, ttft_diff_Scout)
-                    )
-
-                    for config in configs:
-                        if config in cur_bench[bt][model] and config in pre_bench[bt][model]:
-                            # Check metrics are saved correctly and non zero value
-                            pass_cur = CheckValue(cur_bench[bt][model][config], metrics)
-                            pass_pre = CheckValue(pre_bench[bt][model][config], metrics)
-                            if pass_cur and pass_pre:
-                                tput = metric_mapping["tput"]
-                                diff = (cur_bench[bt][model][config][tput] - pre_bench[bt][model][config][tput]) / pre_bench[bt][model][config][tput]
-                                tput_list.append(diff)
-
-                                ttft = metric_mapping["ttft"]
-                                diff = (cur_bench[bt][model][config][ttft] - pre_bench[bt][model][config][ttft]) / pre_bench[bt][model][config][ttft]
-                                ttft_list.append(diff)
-    
-    # Validate regression
-    tput_mean_8B_70B_pct = (0 if len(tput_diff_8B_70B) == 0 else np.mean(tput_diff_8B_70B)) * 100
-    ttft_mean_8B_70B_pct = (0 if len(ttft_diff_8B_70B) == 0 else np.mean(ttft_diff_8B_70B)) * 100
-    logger.debug(f"[{py_script}] Llama-8B+70B TPUT changes: {tput_mean_8B_70B_pct}%, threshold=-{threshold}%")
-    logger.debug(f"[{py_script}] Llama-8B+70B TTFT changes: {ttft_mean_8B_70B_pct}%, threshold=-{threshold}%")
-
-    tput_mean_Scout_pct = (0 if len(tput_diff_Scout) == 0 else np.mean(tput_diff_Scout)) * 100
-    ttft_mean_Scout_pct = (0 if len(ttft_diff_Scout) == 0 else np.mean(ttft_diff_Scout)) * 100
-    logger.debug(f"[{py_script}] Llama-Scout TPUT changes: {tput_mean_Scout_pct}%, threshold=-{threshold}%")
-    logger.debug(f"[{py_script}] Llama-Scout TTFT changes: {ttft_mean_Scout_pct}%, threshold=-{threshold}%")
-                 
+MAD_SCALE = 1.4826 # MAD * 1.4826 estimates the standard deviation of normal data
 
+def DropCarried(data: dict):
+    # An engine's numbers copied from an earlier night of the same image (image_index.py carry) aren't a new measurement
+    for engine in data.get(CARRIED_KEY, {}):
+        for section in ("Benchmark", "Startup"):
+            data[section] = {bt: value for bt, value in data.get(section, {}).items() if bt.split('_')[0] != engine}
+        data.get("Accuracy", {}).pop(engine, None)
+    return data
 
-def main(args):
-    # Load the current benchmark JSON
-    with open(args.json_file, "r") as f:
-        cur_data = json.load(f)
-    # Load the most recent benchmark JSON
-    if not os.path.isdir(args.result_folder):
-        print(f"Error: Directory '{args.result_folder}' not found.")
-        exit()
-
-    folders = [f for f in os.listdir(args.result_folder) if os.path.isdir(os.path.join(args.result_folder, f))]
+def LoadBaselines(result_folder: str, exclude_date: str, window: int):
+    # Load the Result.json of the date folders before the current one, newest first, until every engine has
+    # `window` measured nights. Carried-forward numbers are dropped, so one measurement is counted once.
+    folders = [f for f in os.listdir(result_folder) if os.path.isdir(os.path.join(result_folder, f))]
     date_folders = []
     for f in folders:
         try:
-            if args.exclude_date in f:
+            if exclude_date in f:
                 continue
             date_obj = datetime.strptime(f, "%Y-%m-%d")
             date_folders.append((date_obj, f))
         except ValueError:
             continue  # Ignore folders which are not named in data format
-    
-    if not date_folders: # No previous data so exit the script
-        sys.exit(0)
-    
-    previous_folder = max(date_folders, key=lambda x: x[0])[1]
-    previous_json = os.path.join(args.result_folder, previous_folder, "Result.json")
-    logger.debug(f"[{py_script}] Previous json: {previous_json}")
-    if not os.path.exists(previous_json):
-        print(f"Error: Directory '{previous_json}' not found.")
-        exit()
-    with open(previous_json, "r") as f:
-        pre_data = json.load(f)
-    
-    CheckAccuracy(cur_data["Accuracy"], pre_data["Accuracy"], args.threshold)
-    CheckBenchmark(cur_data["Benchmark"], pre_data["Benchmark"], args.threshold)
+
+    current_date = datetime.strptime(exclude_date, "%Y-%m-%d")
+    date_folders = sorted((d for d in date_folders if d[0] < current_date), reverse=True)
+    engines = {bt.split('_')[0] for bt in bench_types}
+    measured = {engine: 0 for engine in engines}
+    baselines = []
+    for _, folder in date_folders:
+        if all(n >= window for n in measured.values()):
+            break
+        json_file = os.path.join(result_folder, folder, "Result.json")
+        if not os.path.exists(json_file):
+            logger.warning(f"[{py_script}] {json_file} not found, skip it in the baseline.")
+            continue
+        with open(json_file, "r") as f:
+            data = DropCarried(json.load(f))
+        for engine in engines:
+            measured[engine] += HasNumbers({bt: value for bt, value in data.get("Benchmark", {}).items() if bt.split('_')[0] == engine})
+        baselines.append((folder, data))
+    return baselines[::-1]
+
+def GetValue(data: dict, keys: tuple):
+    # Missing values and 0 (benchmark didn't finish successfully) become NaN
+    for key in keys:
+        if not isinstance(data, dict) or key not in data:
+            return np.nan
+        data = data[key]
+    if data is None or data == 0:
+        return np.nan
+    return float(data)
+
+def CollectKeys(cur_data: dict, baselines: list):
+    # (section, bench_type|engine, model, config|None, metric, higher_is_better)
+    keys = set()
+    for data in [cur_data] + [b[1] for b in baselines]:
+        for bt, model_dict in data.get("Benchmark", {}).items():
+            for model, config_dict in model_dict.items():
+                for config, metric_dict in config_dict.items():
+                    for metric in metric_dict:
+                        if metric in regression_metrics:
+                            keys.add(("Benchmark", bt, model, config, metric, regression_metrics[metric]))
+        for engine, model_dict in data.get("Accuracy", {}).items():
+            for model in model_dict:
+                keys.add(("Accuracy", engine, model, None, "Accuracy", True))
+        for bt, model_dict in data.get("Startup", {}).items():
+            for model, metric_dict in model_dict.items():
+                for metric in metric_dict:
+                    if metric in startup_metrics:
+                        keys.add(("Startup", bt, model, None, metric, False))
+    return sorted(keys, key=lambda k: tuple("" if v is None else str(v) for v in k))
+
+def GetKeyPath(key: tuple):
+    section, group, model, config, metric, _ = key
+    if section == "Accuracy":
+        return (section, group, model)
+    if section == "Startup":
+        return (section, group, model, metric)
+    return (section, group, model, config, metric)
+
+def CheckRegression(cur_data: dict, baselines: list, threshold: float, z_threshold: float, min_runs: int,
+                    startup_threshold: float = None, window: int = None):
+    keys = CollectKeys(cur_data, baselines)
+    if len(keys) == 0:
+        return []
+
+    # current: [K], history: [N, K]
+    current = np.array([GetValue(cur_data, GetKeyPath(k)) for k in keys])
+    history = np.array([[GetValue(data, GetKeyPath(k)) for k in keys] for _, data in baselines]).reshape(len(baselines), len(keys))
+    if window is not None:
+        # Only the last `window` measured values of each key, the baselines reach further back for a rarely run engine
+        valid = ~np.isnan(history)
+        from_end = np.cumsum(valid[::-1], axis=0)[::-1]
+        history = np.where(valid & (from_end <= window), history, np.nan)
+    higher_is_better = np.array([k[5] for k in keys])
+    # Startup timings are noisier than steady-state numbers and get a threshold of their own
+    thresholds = np.array([startup_threshold if k[0] == "Startup" and startup_threshold is not None else threshold for k in keys])
+
+    n_runs = np.sum(~np.isnan(history), axis=0)
+    has_baseline = n_runs > 0
+    median = np.full(len(keys), np.nan)
+    mad = np.full(len(keys), np.nan)
+    if has_baseline.any():
+        median[has_baseline] = np.nanmedian(history[:, has_baseline], axis=0)
+        mad[has_baseline] = np.nanmedian(np.abs(history[:, has_baseline] - median[has_baseline]), axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = (current - median) / median * 100
+        # Positive when the change goes in the bad direction
+        worse_pct = np.where(higher_is_better, -change_pct, change_pct)
+        robust_z = np.abs(current - median) / (MAD_SCALE * mad)
+    robust_z = np.where(np.abs(current - median) == 0, 0, robust_z) # MAD=0 and no change
+
+    # A config is flagged on its own: bigger than the threshold and outside the baseline noise.
+    # With fewer than min_runs baseline runs the noise is unknown so only the threshold is used.
+    enough_runs = n_runs >= min_runs
+    beyond_noise = np.where(enough_runs, robust_z > z_threshold, True)
+    regressed = has_baseline & ~np.isnan(current) & (worse_pct > thresholds) & beyond_noise
+    improved = has_baseline & ~np.isnan(current) & (worse_pct < -thresholds) & beyond_noise
+    is_startup = np.array([k[0] == "Startup" for k in keys])
+    # A startup phase the server didn't log is no failure, the benchmark numbers decide that
+    failed = has_baseline & np.isnan(current) & ~is_startup
+    # Required metrics must exist even without a baseline
+    for i, k in enumerate(keys):
+        if k[0] == "Benchmark" and np.isnan(current[i]) and k[4] in GetMetrics(k[1]) and k[1] in cur_data.get("Benchmark", {}):
+            failed[i] = True
+
+    checks = []
+    for i, k in enumerate(keys):
+        if failed[i]:
+            status = "failed"
+        elif is_startup[i] and np.isnan(current[i]):
+            status = "missing"
+        elif not has_baseline[i]:
+            status = "no_baseline"
+        elif regressed[i]:
+            status = "regression"
+        elif improved[i]:
+            status = "improvement"
+        else:
+            status = "ok"
+        checks.append({
+            "section": k[0],
+            "bench_type": k[1],
+            "model": k[2],
+            "config": k[3],
+            "metric": k[4],
+            "status": status,
+            "current": None if np.isnan(current[i]) else float(current[i]),
+            "baseline_median": None if np.isnan(median[i]) else float(median[i]),
+            "baseline_mad": None if np.isnan(mad[i]) else float(mad[i]),
+            "baseline_runs": int(n_runs[i]),
+            "change_pct": None if np.isnan(change_pct[i]) else float(change_pct[i]),
+            "robust_z": None if np.isnan(robust_z[i]) or np.isinf(robust_z[i]) else float(robust_z[i]),
+        })
+    return checks
+
+def main(args):
+    # Load the current benchmark JSON
+    with open(args.json_file, "r") as f:
+        cur_data = json.load(f)
+    if not os.path.isdir(args.result_folder):
+        logger.error(f"[{py_script}] Error: Directory '{args.result_folder}' not found.")
+        sys.exit(1)
+
+    # Load the most recent benchmark JSONs as the baseline
+    baselines = LoadBaselines(args.result_folder, args.exclude_date, args.window)
+    baseline_dates = [date for date, _ in baselines]
+    logger.debug(f"[{py_script}] Baseline dates: {baseline_dates}")
+
+    checks = CheckRegression(cur_data, baselines, args.threshold, args.z_threshold, args.min_runs, args.startup_threshold, args.window)
+    regressions = [c for c in checks if c["status"] == "regression"]
+    failures = [c for c in checks if c["status"] == "failed"]
+    for c in regressions:
+        logger.error(f"[{py_script}] Regression: {c['bench_type']} {c['model']} {c['config'] or ''} {c['metric']} "
+                     f"{c['current']:.2f} vs baseline median {c['baseline_median']:.2f} ({c['change_pct']:+.2f}%)")
+    for c in failures:
+        logger.error(f"[{py_script}] Failed: {c['bench_type']} {c['model']} {c['config'] or ''} {c['metric']} has no result.")
+    for status in ["ok", "improvement", "no_baseline", "missing"]:
+        n = len([c for c in checks if c["status"] == status])
+        logger.info(f"[{py_script}] {status}: {n}")
+
+    passed = len(regressions) == 0 and len(failures) == 0
+    verdict = {
+        "date": args.exclude_date,
+        "passed": passed,
+        "baseline_dates": baseline_dates,
+        "threshold_pct": args.threshold,
+        "startup_threshold_pct": args.startup_threshold,
+        "z_threshold": args.z_threshold,
+        "min_runs": args.min_runs,
+        "regressions": regressions,
+        "failures": failures,
+        "checks": checks,
+    }
+    verdict_file = args.verdict_file or os.path.join(os.path.dirname(args.json_file), "Regression.json")
+    with open(verdict_file, "w") as f:
+        json.dump(verdict, f, indent=4)
+    logger.info(f"[{py_script}] Verdict saved to '{verdict_file}'. passed={passed}")
+    sys.exit(0 if passed else 1)
 
 
 if __name__ == "__main__":
@@ -121,12 +221,17 @@ if __name__ == "__main__":
     parser.add_argument("--result-folder", type=str, required=True, help="The 'root' of the benchmark folder")
     parser.add_argument("--exclude-date", type=str, required=True, help="Exclude the current benchmark folder")
     parser.add_argument("--threshold", type=float, default=3, help="The threshold of performance change in %.")
+    parser.add_argument("--startup-threshold", type=float, default=20, help="The threshold of server startup time change in %%.")
+    parser.add_argument("--window", type=int, default=7, help="Build the baseline from the last N measured runs.")
+    parser.add_argument("--z-threshold", type=float, default=3, help="Robust z-score (median/MAD) a change must exceed.")
+    parser.add_argument("--min-runs", type=int, default=3, help="Minimum baseline runs to use the MAD noise estimate.")
+    parser.add_argument("--verdict-file", type=str, default=None, help="Where to save the verdict (default: Regression.json next to --json-file)")
     args = parser.parse_args()
 
     if not os.path.exists(args.json_file):
-        print(f"Error: Json file {args.json_file} doesn't exist.")
-        print(f"CheckRegression.py failed.")
-        exit()
+        logger.error(f"[{py_script}] Error: Json file {args.json_file} doesn't exist.")
+        logger.error(f"[{py_script}] CheckRegression.py failed.")
+        sys.exit(1)
 
     main(args)
 
@@ -134,6 +239,7 @@ if __name__ == "__main__":
 python $HOME/CI/CheckRegression.py \
     --json-file $HOME/CI/Result/2025-08-18/Result.json \
     --result-folder $HOME/CI/Result/ \
-    --exclude-date 2025-08-18
+    --exclude-date 2025-08-18 \
+    --threshold 3 --window 7
 
-'''
\ No newline at end of file
+'''
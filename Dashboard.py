@@ -0,0 +1,234 @@
+import json
+import argparse
+import os
+import sys
+from utils import setup_logger, bench_types, models, log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, metric_mapping
+from result_store import OpenStore, LoadHistory, LoadDockerNames, DEFAULT_DB
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("dashboard_logger")
+
+default_metrics = [
+    metric_mapping["tput"],
+    metric_mapping["ttft"],
+    "P99 TTFT (ms)",
+    "Mean ITL (ms)",
+    "P99 ITL (ms)",
+]
+
+# Single file, no server and no external scripts: the data is embedded as JSON and drawn as SVG.
+# Every series is downsampled with largest-triangle-three-buckets to the pixel width of its chart,
+# so years of nightlies stay responsive.
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { font-family: sans-serif; margin: 16px; }
+  .controls { display: flex; flex-wrap: wrap; gap: 12px; align-items: center; margin-bottom: 12px; }
+  .grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(420px, 1fr)); gap: 12px; }
+  .chart { border: 1px solid #ddd; padding: 4px; position: relative; }
+  .chart h4 { margin: 2px 0 4px 0; font-size: 13px; }
+  .tip { position: absolute; pointer-events: none; background: #fff; border: 1px solid #999; font-size: 11px; padding: 2px 4px; display: none; white-space: nowrap; }
+  .legend span { margin-right: 12px; font-size: 12px; }
+  svg text { font-size: 10px; }
+</style>
+</head>
+<body>
+<h2>__TITLE__</h2>
+<div class="controls">
+  <label>Model <select id="model"></select></label>
+  <label>Engine <select id="engine"></select></label>
+  <label>Metric <select id="metric"></select></label>
+  <label>From <input type="date" id="from"></label>
+  <label>To <input type="date" id="to"></label>
+  <span class="legend"><span style="color:#ff7f0e">&#9644; ray</span><span style="color:#1f77b4">&#9644; standalone</span></span>
+  <span id="info"></span>
+</div>
+<div class="grid" id="grid"></div>
+<script>
+const DATA = __DATA__;
+const COLORS = {ray: "#ff7f0e", standalone: "#1f77b4"};
+const WIDTH = 420, HEIGHT = 220, PAD = {l: 52, r: 8, t: 8, b: 28};
+const times = DATA.dates.map(d => Date.parse(d));
+
+function lttb(points, threshold) {
+  // points: [[x, y], ...] sorted by x. Keeps the first and last point.
+  if (threshold >= points.length || threshold < 3) return points;
+  const sampled = [points[0]];
+  const every = (points.length - 2) / (threshold - 2);
+  let a = 0;
+  for (let i = 0; i < threshold - 2; i++) {
+    const start = Math.floor(i * every) + 1, end = Math.floor((i + 1) * every) + 1;
+    const nextStart = end, nextEnd = Math.min(Math.floor((i + 2) * every) + 1, points.length);
+    let avgX = 0, avgY = 0;
+    for (let j = nextStart; j < nextEnd; j++) { avgX += points[j][0]; avgY += points[j][1]; }
+    const n = Math.max(nextEnd - nextStart, 1);
+    avgX /= n; avgY /= n;
+    let maxArea = -1, pick = start;
+    for (let j = start; j < end; j++) {
+      const area = Math.abs((points[a][0] - avgX) * (points[j][1] - points[a][1]) - (points[a][0] - points[j][0]) * (avgY - points[a][1]));
+      if (area > maxArea) { maxArea = area; pick = j; }
+    }
+    sampled.push(points[pick]);
+    a = pick;
+  }
+  sampled.push(points[points.length - 1]);
+  return sampled;
+}
+
+function fill(select, values) {
+  select.innerHTML = values.map(v => `<option value="${v}">${v}</option>`).join("");
+}
+
+function seriesPoints(key, t0, t1) {
+  const values = DATA.series[key];
+  const points = [];
+  if (!values) return points;
+  for (let i = 0; i < values.length; i++) {
+    if (values[i] !== null && values[i] !== 0 && times[i] >= t0 && times[i] <= t1) points.push([times[i], values[i], i]);
+  }
+  return points;
+}
+
+function el(name, attrs) {
+  const node = document.createElementNS("http://www.w3.org/2000/svg", name);
+  for (const k in attrs) node.setAttribute(k, attrs[k]);
+  return node;
+}
+
+function drawChart(config, lines, t0, t1) {
+  const div = document.createElement("div");
+  div.className = "chart";
+  div.innerHTML = `<h4>${config}</h4>`;
+  const svg = el("svg", {width: WIDTH, height: HEIGHT});
+  const all = lines.flatMap(l => l.points);
+  const yMax = all.length ? Math.max(...all.map(p => p[1])) * 1.1 : 1;
+  const x = t => PAD.l + (t - t0) / Math.max(t1 - t0, 1) * (WIDTH - PAD.l - PAD.r);
+  const y = v => HEIGHT - PAD.b - v / yMax * (HEIGHT - PAD.t - PAD.b);
+  for (let i = 0; i <= 4; i++) {
+    const v = yMax * i / 4;
+    svg.appendChild(el("line", {x1: PAD.l, x2: WIDTH - PAD.r, y1: y(v), y2: y(v), stroke: "#eee"}));
+    const label = el("text", {x: PAD.l - 4, y: y(v) + 3, "text-anchor": "end"});
+    label.textContent = v.toFixed(v < 10 ? 2 : 0);
+    svg.appendChild(label);
+  }
+  for (const t of [t0, t1]) {
+    const label = el("text", {x: x(t), y: HEIGHT - 8, "text-anchor": t === t0 ? "start" : "end"});
+    label.textContent = new Date(t).toISOString().slice(0, 10);
+    svg.appendChild(label);
+  }
+  const target = WIDTH - PAD.l - PAD.r;
+  for (const line of lines) {
+    const points = lttb(line.points, target);
+    if (!points.length) continue;
+    svg.appendChild(el("polyline", {points: points.map(p => `${x(p[0])},${y(p[1])}`).join(" "), fill: "none", stroke: COLORS[line.mode], "stroke-width": 1.5}));
+    if (points.length < 120) for (const p of points) svg.appendChild(el("circle", {cx: x(p[0]), cy: y(p[1]), r: 2, fill: COLORS[line.mode]}));
+  }
+  const tip = document.createElement("div");
+  tip.className = "tip";
+  svg.addEventListener("mousemove", ev => {
+    const t = t0 + (ev.offsetX - PAD.l) / (WIDTH - PAD.l - PAD.r) * (t1 - t0);
+    const rows = [];
+    for (const line of lines) {
+      let best = null;
+      for (const p of line.points) if (best === null || Math.abs(p[0] - t) < Math.abs(best[0] - t)) best = p;
+      if (best) rows.push(`${line.mode} ${DATA.dates[best[2]]}: ${best[1].toFixed(2)} (${DATA.dockers[line.bench_type + "|" + DATA.dates[best[2]]] || ""})`);
+    }
+    tip.innerHTML = rows.join("<br>");
+    tip.style.display = rows.length ? "block" : "none";
+    tip.style.left = (ev.offsetX + 10) + "px";
+    tip.style.top = (ev.offsetY + 10) + "px";
+  });
+  svg.addEventListener("mouseleave", () => tip.style.display = "none");
+  div.appendChild(svg);
+  div.appendChild(tip);
+  return div;
+}
+
+function render() {
+  const model = document.getElementById("model").value;
+  const engine = document.getElementById("engine").value;
+  const metric = document.getElementById("metric").value;
+  const t0 = Date.parse(document.getElementById("from").value || DATA.dates[0]);
+  const t1 = Date.parse(document.getElementById("to").value || DATA.dates[DATA.dates.length - 1]);
+  const grid = document.getElementById("grid");
+  grid.innerHTML = "";
+  let total = 0;
+  for (const config of DATA.configs[model]) {
+    const lines = ["ray", "standalone"].map(mode => {
+      const bench_type = `${engine}_${mode}`;
+      const points = seriesPoints([bench_type, model, config, metric].join("|"), t0, t1);
+      total += points.length;
+      return {mode, bench_type, points};
+    });
+    grid.appendChild(drawChart(config, lines, t0, t1));
+  }
+  document.getElementById("info").textContent = `${total} points`;
+}
+
+fill(document.getElementById("model"), Object.keys(DATA.configs));
+fill(document.getElementById("engine"), DATA.engines);
+fill(document.getElementById("metric"), DATA.metrics);
+if (DATA.dates.length) {
+  document.getElementById("from").value = DATA.dates[0];
+  document.getElementById("to").value = DATA.dates[DATA.dates.length - 1];
+}
+for (const id of ["model", "engine", "metric", "from", "to"]) document.getElementById(id).addEventListener("change", render);
+render();
+</script>
+</body>
+</html>
+"""
+
+def BuildData(store, metrics: list, days: int):
+    dates, history = LoadHistory(store, bench_types, models, metrics, days)
+    dockers = LoadDockerNames(store)
+    series = {}
+    for key, values in history.items():
+        series["|".join(key)] = [values.get(d) for d in dates]
+    configs = {}
+    for model in models:
+        model_8B_70B = ("meta-llama_Llama-3.1-8B-Instruct", "meta-llama_Llama-3.3-70B-Instruct")
+        configs[model] = log_files_prefix_Llama_8B_70B if model in model_8B_70B else log_file_prefix_Llama4_Scout
+    return {
+        "dates": dates,
+        "engines": sorted({bt.split('_')[0] for bt in bench_types}, reverse=True), # vLLM first
+        "metrics": metrics,
+        "configs": configs,
+        "series": series,
+        "dockers": {f"{bt}|{d}": docker for (d, bt), docker in dockers.items() if d in set(dates)},
+    }
+
+def main(args):
+    store = OpenStore(args.db)
+    data = BuildData(store, args.metrics, args.days)
+    store.close()
+
+    # Escape '</' so the embedded JSON can't close the script tag
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    html = HTML_TEMPLATE.replace("__TITLE__", args.title).replace("__DATA__", payload)
+    out_dir = os.path.dirname(args.out_html)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(args.out_html, "w") as f:
+        f.write(html)
+    logger.info(f"[{py_script}] Dashboard with {len(data['dates'])} dates and {len(data['series'])} series saved to '{args.out_html}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out-html", type=str, required=True, help="Path of the generated HTML file.")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    parser.add_argument("--metrics", type=str, nargs="+", default=default_metrics, help="Metrics to embed.")
+    parser.add_argument("--days", type=int, default=None, help="Only embed the last N days")
+    parser.add_argument("--title", type=str, default="ROCm vLLM/SGLang Nightly Performance")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+python Dashboard.py --out-html Result/Figures/Dashboard.html
+'''
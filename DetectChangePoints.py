@@ -0,0 +1,142 @@
+import json
+import argparse
+import os
+import sys
+import numpy as np
+from utils import setup_logger, bench_types, models, regression_metrics
+from result_store import OpenStore, LoadHistory, LoadDockerNames, DEFAULT_DB, ACCURACY_METRIC
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("detect_change_points_logger")
+
+def EstimateNoise(values: np.ndarray):
+    # Robust sigma from first differences, insensitive to the step changes we are looking for
+    diffs = np.diff(values)
+    if len(diffs) == 0:
+        return 0.0
+    return 1.4826 * np.median(np.abs(diffs - np.median(diffs))) / np.sqrt(2)
+
+def PELT(values: np.ndarray, penalty: float, min_size: int = 2):
+    """Pruned Exact Linear Time search for mean shifts. Returns the start index of every new segment."""
+    n = len(values)
+    cum = np.concatenate([[0.0], np.cumsum(values)])
+    cum_sq = np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+    def Cost(s, t): # Squared error of values[s:t] around its mean
+        seg_sum = cum[t] - cum[s]
+        return (cum_sq[t] - cum_sq[s]) - seg_sum * seg_sum / (t - s)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=int)
+    candidates = [0]
+    for t in range(min_size, n + 1):
+        valid = [s for s in candidates if t - s >= min_size]
+        if not valid:
+            continue
+        costs = np.array([best[s] + Cost(s, t) + penalty for s in valid])
+        i = int(np.argmin(costs))
+        best[t], last[t] = costs[i], valid[i]
+        # Prune: s can never be the last change point once it is worse than best[t] without the penalty
+        candidates = [s for s in candidates if t - s < min_size or best[s] + Cost(s, t) <= best[t]]
+        candidates.append(t - min_size + 1)
+
+    change_points = []
+    t = n
+    while t > 0:
+        s = last[t]
+        if s > 0:
+            change_points.append(s)
+        t = s
+    return sorted(change_points)
+
+def AnalyzeSeries(key: tuple, dates: list, values: np.ndarray, dockers: dict, beta: float, min_size: int, min_change: float):
+    bench_type, model, config, metric = key
+    sigma = EstimateNoise(values)
+    scale = np.median(np.abs(values))
+    # Floor the noise at 0.1% of the level so flat series don't turn every wiggle into a change
+    sigma = max(sigma, 1e-3 * scale)
+    if sigma == 0:
+        return []
+    penalty = beta * sigma ** 2 * np.log(len(values))
+    higher_is_better = regression_metrics.get(metric, metric == ACCURACY_METRIC)
+
+    changes = []
+    bounds = [0] + PELT(values, penalty, min_size) + [len(values)]
+    for i in range(1, len(bounds) - 1):
+        before = values[bounds[i - 1]:bounds[i]].mean()
+        after = values[bounds[i]:bounds[i + 1]].mean()
+        if before == 0:
+            continue
+        change_pct = (after - before) / abs(before) * 100
+        if abs(change_pct) < min_change:
+            continue
+        first_date, last_good_date = dates[bounds[i]], dates[bounds[i] - 1]
+        worse = change_pct < 0 if higher_is_better else change_pct > 0
+        changes.append({
+            "bench_type": bench_type,
+            "model": model,
+            "config": config,
+            "metric": metric,
+            "date": first_date,
+            "docker": dockers.get((first_date, bench_type), ""),
+            "previous_date": last_good_date,
+            "previous_docker": dockers.get((last_good_date, bench_type), ""),
+            "mean_before": float(before),
+            "mean_after": float(after),
+            "change_pct": float(change_pct),
+            "direction": "regression" if worse else "improvement",
+        })
+    return changes
+
+def main(args):
+    store = OpenStore(args.db)
+    engines = sorted({bt.split('_')[0] for bt in bench_types})
+    metrics = args.metrics or (list(regression_metrics) + [ACCURACY_METRIC])
+    dates, history = LoadHistory(store, bench_types + engines, models, metrics, args.days)
+    dockers = LoadDockerNames(store)
+    store.close()
+
+    changes = []
+    for key, series in history.items():
+        # 0 means the benchmark didn't finish, so drop it from the series
+        series_dates = [d for d in dates if series.get(d) not in (None, 0)]
+        if len(series_dates) < 2 * args.min_size:
+            continue
+        values = np.array([series[d] for d in series_dates], dtype=float)
+        changes += AnalyzeSeries(key, series_dates, values, dockers, args.beta, args.min_size, args.min_change)
+
+    changes.sort(key=lambda c: abs(c["change_pct"]), reverse=True)
+    for c in changes[:args.top]:
+        log = logger.warning if c["direction"] == "regression" else logger.info
+        log(f"[{py_script}] {c['change_pct']:+.2f}% {c['bench_type']} {c['model']} {c['config']} {c['metric']} "
+            f"since {c['date']} ({c['previous_docker']} -> {c['docker']})")
+    logger.info(f"[{py_script}] Found {len(changes)} change points in {len(history)} series.")
+
+    if args.out_json:
+        with open(args.out_json, "w") as f:
+            json.dump(changes, f, indent=4)
+        logger.info(f"[{py_script}] Change points are saved to '{args.out_json}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    parser.add_argument("--days", type=int, default=None, help="Only analyze the last N days")
+    parser.add_argument("--metrics", type=str, nargs="+", default=None, help="Metrics to analyze (default: the gated metrics and accuracy)")
+    parser.add_argument("--beta", type=float, default=4, help="Penalty multiplier of sigma^2*log(n) per change point.")
+    parser.add_argument("--min-size", type=int, default=2, help="Minimum number of runs between two change points.")
+    parser.add_argument("--min-change", type=float, default=3, help="Ignore steps smaller than this (%%).")
+    parser.add_argument("--top", type=int, default=20, help="Number of change points to print.")
+    parser.add_argument("--out-json", type=str, default=None, help="Save all change points to this file.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        logger.error(f"[{py_script}] Error: Database {args.db} doesn't exist.")
+        sys.exit(1)
+
+    main(args)
+
+'''
+python $HOME/CI/DetectChangePoints.py --db $HOME/CI/Result/results.db --days 180 --out-json $HOME/CI/Result/ChangePoints.json
+'''
@@ -1,53 +1,39 @@
-import requests
+import argparse
 import sys
-from datetime import datetime
-from dateutil.parser import isoparse
 import subprocess
+from docker_tags import LatestTag
 
-# SGLang Docker repository URL
+# SGLang Docker repository
 DOCKER_REPO = "lmsysorg/sglang"
-PAGE_SIZE = 100
-URL = f"https://hub.docker.com/v2/repositories/{DOCKER_REPO}/tags?page_size={PAGE_SIZE}"
 
-def get_latest_mi30x_srt_tag():
+def get_latest_mi30x_srt_tag(hub_url: str = None):
     """
-    Fetches the latest SGLang Docker image tag with 'mi30x'.
+    Fetches the latest SGLang Docker image tag with 'mi30x', 'rc' and 'srt', see docker_tags.IsSGLangRcTag.
     """
     try:
-        response = requests.get(URL)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Failed to fetch tags from {URL}: {e}", file=sys.stderr)
+        latest = LatestTag(DOCKER_REPO, hub_url)
+    except Exception as e:
+        print(f"Failed to fetch tags of {DOCKER_REPO}: {e}", file=sys.stderr)
         sys.exit(1)
 
-    tags = response.json().get("results", [])
-    
-    # Filter for tags that contain both 'mi30x' and 'srt'
-    filtered_tags = [
-        {
-            "name": tag["name"],
-            "last_updated": isoparse(tag["last_updated"])
-        }
-        for tag in tags
-        if "mi30x" in tag["name"] and "rc" in tag["name"] and "srt" in tag["name"]
-    ]
-
-    if not filtered_tags:
+    if latest is None:
         print("No tags with both 'mi30x' and 'srt' found.", file=sys.stderr)
         sys.exit(1)
-
-    # Find the latest tag based on the 'last_updated' timestamp
-    latest = max(filtered_tags, key=lambda x: x["last_updated"])
-    return latest["name"]
+    return latest
 
 if __name__ == "__main__":
-    latest_tag = get_latest_mi30x_srt_tag()
+    parser = argparse.ArgumentParser(description="Pull the latest SGLang mi30x 'rc' image")
+    parser.add_argument("--hub-url", type=str, default=None, help="(Testing) Registry API instead of Docker Hub")
+    parser.add_argument("--no-pull", action="store_true", help="Only print the image")
+    args = parser.parse_args()
+    latest_tag = get_latest_mi30x_srt_tag(args.hub_url)
     full_image_name = f"{DOCKER_REPO}:{latest_tag}"
 
     try:
-        subprocess.run(["docker", "pull", full_image_name],  text=True)
+        if not args.no_pull:
+            subprocess.run(["docker", "pull", full_image_name],  text=True)
         print(f"{full_image_name}")
     except subprocess.CalledProcessError as e:
         print(f"Docker pull failed with error code {e.returncode}:", file=sys.stderr)
         print(e.stderr, file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
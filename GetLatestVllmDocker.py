@@ -1,55 +1,37 @@
-import requests
+import argparse
 import sys
-from datetime import datetime
-from dateutil.parser import isoparse
 import subprocess
+from docker_tags import LatestTag
 
 DOCKER_REPO = "rocm/vllm-dev"
-PAGE_SIZE = 100
-URL = f"https://hub.docker.com/v2/repositories/{DOCKER_REPO}/tags?page_size={PAGE_SIZE}"
 
-def get_latest_rc_tag():
+def get_latest_rc_tag(hub_url: str = None):
+    # Tags with 'rc' and without 'base' over every page of the repo, see docker_tags.IsVllmRcTag
     try:
-        response = requests.get(URL)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Failed to fetch tags: {e}")
+        latest = LatestTag(DOCKER_REPO, hub_url)
+    except Exception as e:
+        print(f"Failed to fetch tags: {e}", file=sys.stderr)
         sys.exit(1)
 
-    tags = response.json().get("results", [])
-    rc_tags = []
-    for tag in tags:
-        if "base" not in tag["name"]: # condition 1
-            parts = tag["name"].split('_')
-            for part in parts: # condition 2
-                if part.startswith('rc'):
-                    rc_tags.append(
-                        {
-                            "name": tag["name"],
-                            "last_updated": isoparse(tag["last_updated"])
-                        }
-                    )
-    
-
-    if not rc_tags:
-        print("No 'rc' tags found.")
+    if latest is None:
+        print("No 'rc' tags found.", file=sys.stderr)
         sys.exit(1)
-
-    latest = max(rc_tags, key=lambda x: x["last_updated"])
-    return latest["name"]
+    return latest
 
 if __name__ == "__main__":
-    latest_rc = get_latest_rc_tag()
+    parser = argparse.ArgumentParser(description="Pull the latest ROCm vLLM 'rc' image")
+    parser.add_argument("--hub-url", type=str, default=None, help="(Testing) Registry API instead of Docker Hub")
+    parser.add_argument("--no-pull", action="store_true", help="Only print the image")
+    args = parser.parse_args()
+    latest_rc = get_latest_rc_tag(args.hub_url)
     
     try:
         # run the docker pull command
-        subprocess.run(["docker", "pull", f"{DOCKER_REPO}:{latest_rc}"], check=True,
-            stdout=sys.stdout, stderr=sys.stderr,)
+        if not args.no_pull:
+            subprocess.run(["docker", "pull", f"{DOCKER_REPO}:{latest_rc}"], check=True,
+                stdout=sys.stdout, stderr=sys.stderr,)
         print(f"{DOCKER_REPO}:{latest_rc}")
     except subprocess.CalledProcessError as e:
         print(f"Docker pull failed with error code {e.returncode}:", file=sys.stderr)
         print(e.stderr, file=sys.stderr)
         sys.exit(1)
-    
-    
-    
\ No newline at end of file
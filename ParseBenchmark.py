@@ -4,27 +4,242 @@ import argparse
 import os
 import sys
 import re
+import hashlib
+import glob
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from telemetry import SUMMARY_FILE as TELEMETRY_FILE, TokensPerJoule
+from trace_sketch import SKETCH_SUFFIX, MergeSketchFiles, SketchMetrics
 from utils import setup_logger, bench_types, models, \
-    log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, GetMetrics
+    log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, GetMetrics, benchmark_metrics
 
 py_script = os.path.basename(sys.argv[0])
 logger = setup_logger("parse_benchmark_logger")
 
+MANIFEST_FILE = ".parse_manifest.json" # Saved in each engine/model folder
+ADAPTIVE_SUFFIX = "_adaptive.json" # Convergence report of AdaptiveRunner.py, not a benchmark result
+STARTUP_FILE = "startup.json" # Server startup timings of each engine/model folder, see startup_phases.py
+SHARD_PATTERN = "shard*" # Scheduler.py splits the tests of a config over several servers, each with its own files there
+
+# Summary labels printed by each benchmark client -> metric name saved in Result.json (see utils.benchmark_metrics)
+common_labels = {
+    "Successful requests": "Successful requests",
+    "Benchmark duration (s)": "Benchmark duration (s)",
+    "Request throughput (req/s)": "Request throughput (req/s)",
+    "Output token throughput (tok/s)": "Output token throughput (tok/s)",
+    "Mean TTFT (ms)": "Mean TTFT (ms)",
+    "Median TTFT (ms)": "Median TTFT (ms)",
+    "P99 TTFT (ms)": "P99 TTFT (ms)",
+    "Mean TPOT (ms)": "Mean TPOT (ms)",
+    "Median TPOT (ms)": "Median TPOT (ms)",
+    "P99 TPOT (ms)": "P99 TPOT (ms)",
+    "Mean ITL (ms)": "Mean ITL (ms)",
+    "Median ITL (ms)": "Median ITL (ms)",
+    "P99 ITL (ms)": "P99 ITL (ms)",
+}
+metric_labels = {
+    "vLLM": { # vllm bench serve
+        **common_labels,
+        "Failed requests": "Failed requests",
+        "Total Token throughput (tok/s)": "Total Token throughput (tok/s)",
+        "Mean E2EL (ms)": "Mean E2EL (ms)",
+        "Median E2EL (ms)": "Median E2EL (ms)",
+        "P99 E2EL (ms)": "P99 E2EL (ms)",
+    },
+    "SGLang": { # python -m sglang.bench_serving
+        **common_labels,
+        "Total token throughput (tok/s)": "Total Token throughput (tok/s)",
+        "Mean E2E Latency (ms)": "Mean E2EL (ms)",
+        "Median E2E Latency (ms)": "Median E2EL (ms)",
+        "P99 E2E Latency (ms)": "P99 E2EL (ms)",
+    },
+}
+
+def CompilePattern(labels: dict):
+    # One alternation per engine, e.g., "Output token throughput (tok/s):         543.82  "
+    alternation = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+    return re.compile(rf"^[ \t]*({alternation}):[ \t]+(\S+)[ \t]*$", re.MULTILINE)
+
+metric_patterns = {engine: CompilePattern(labels) for engine, labels in metric_labels.items()}
+
+def GetEngine(folder):
+    return "SGLang" if "SGLang" in folder else "vLLM"
+
+def ParseResultFile(result_file):
+    # Structured result of bench_client.py, its summary already uses the metric names of Result.json
+    with open(result_file, 'r') as file:
+        summary = json.load(file).get("summary", {})
+    return {metric: [float(value)] for metric, value in summary.items() if metric in benchmark_metrics}
+
+def ParseLogFile(log_file, engine):
+    # Single scan of the whole log. Returns {metric: [values]} for every summary field found.
+    if log_file.endswith(".json"):
+        return ParseResultFile(log_file)
+    labels = metric_labels[engine]
+    values = {}
+    with open(log_file, 'r', errors="replace") as file:
+        text = file.read()
+    for match in metric_patterns[engine].finditer(text):
+        try:
+            value = float(match.group(2))
+        except ValueError as e:
+            logger.error(f"[{py_script}] Skip '{match.group(0).strip()}' in {log_file} due to error: {e}")
+            continue
+        values.setdefault(labels[match.group(1)], []).append(value)
+    return values
+
 def CheckFileName(log_file, target_log_files):
     for target_log_file in target_log_files:
         if target_log_file in log_file: # e.g., log_file=i32_o32_c16_p3000_iter1.log
             return True, target_log_file
     return False, None
 
-def process_logs_in_folder(args):
-    # folders under args.folder
-    engine_folders = [os.path.join(args.folder, bt) for bt in bench_types]
-    
-    with open(args.json_file, "r") as f:
-        data = json.load(f)
+def GetParserFingerprint():
+    # Cached results are dropped whenever the metric definitions change
+    return hashlib.sha256(json.dumps([metric_labels, benchmark_metrics], sort_keys=True).encode()).hexdigest()
+
+def HashFile(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def LoadManifest(folder, fingerprint):
+    manifest_file = os.path.join(folder, MANIFEST_FILE)
+    if os.path.exists(manifest_file):
+        try:
+            with open(manifest_file, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("parser") == fingerprint:
+                return manifest
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"[{py_script}] Ignore broken manifest {manifest_file}: {e}")
+    return {"parser": fingerprint, "files": {}}
+
+def ParseLogFileCached(log_file, engine, manifest):
+    # Reuse the parsed values if the log is unchanged. mtime+size is checked first, the hash only when they differ.
+    # Returns (values, parsed, manifest changed)
+    name = os.path.basename(log_file)
+    stat = os.stat(log_file)
+    entry = manifest["files"].get(name)
+    if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+        return entry["values"], False, False
+    sha = HashFile(log_file)
+    if entry and entry["sha256"] == sha:
+        entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime_ns
+        return entry["values"], False, True
+    values = ParseLogFile(log_file, engine)
+    manifest["files"][name] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": sha, "values": values}
+    return values, True, True
+
+def ServerFiles(engine_model_folder, name):
+    # The file of the config's server, or one per shard when its tests ran on several servers
+    paths = [os.path.join(engine_model_folder, name)] + sorted(glob.glob(os.path.join(engine_model_folder, SHARD_PATTERN, name)))
+    return [path for path in paths if os.path.exists(path)]
+
+def ParseModelFolder(task):
+    # One task per engine/model folder, runs in a worker process
+    bench_type, model, engine_model_folder, use_cache = task
+    if model == "meta-llama_Llama-3.1-8B-Instruct" or model == "meta-llama_Llama-3.3-70B-Instruct":
+        log_files_prefix = log_files_prefix_Llama_8B_70B
+    else: 
+        log_files_prefix = log_file_prefix_Llama4_Scout
+    engine = GetEngine(bench_type)
+    metrics=GetMetrics(bench_type)
+    fingerprint = GetParserFingerprint()
+    manifest = LoadManifest(engine_model_folder, fingerprint) if use_cache else {"parser": fingerprint, "files": {}}
+
+    # AdaptiveRunner.py saves its short rounds as a config of their own, e.g., i32_o32_c16_p600, named in its report
+    for report_file in sorted(glob.glob(os.path.join(engine_model_folder, "*" + ADAPTIVE_SUFFIX))):
+        try:
+            with open(report_file, "r") as f:
+                round_config = json.load(f).get("round_config")
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"[{py_script}] Ignore broken report {report_file}: {e}")
+            continue
+        if round_config and round_config not in log_files_prefix:
+            log_files_prefix = log_files_prefix + [round_config]
+
+    # Init empty 
+    results={}
+    for filename in log_files_prefix:
+        results[filename] = {metric: [] for metric in metrics}
+
+    # List all files. e.g., i32_o32_c16_p3000_iter1.log, i32_o32_c64_p3000_iter1.log ...
+    log_files = [os.path.join(engine_model_folder, f) for f in sorted(os.listdir(engine_model_folder))]
+    # bench_client.py writes i*_o*_c*_p*_iter*.json next to its log, read the JSON instead of the same run's log
+    result_files = {f[:-len(".json")] for f in log_files if f.endswith(".json")}
+    log_files = [f for f in log_files if f.endswith(".json") or (f.endswith(".log") and f[:-len(".log")] not in result_files)]
+    log_files = [f for f in log_files if not f.endswith(ADAPTIVE_SUFFIX) and not f.endswith(SKETCH_SUFFIX)]
+    sketch_files = [os.path.join(engine_model_folder, f) for f in sorted(os.listdir(engine_model_folder)) if f.endswith(SKETCH_SUFFIX)]
+
+    # Parse performance numbers from logs
+    n_parsed = 0
+    changed = False
+    seen = set()
+    for log_file in log_files:
+        check, target = CheckFileName(os.path.basename(log_file), log_files_prefix)
+        if check:
+            values, parsed, updated = ParseLogFileCached(log_file, engine, manifest)
+            n_parsed += parsed
+            changed |= updated
+            seen.add(os.path.basename(log_file))
+            for metric, value_list in values.items():
+                results[target].setdefault(metric, []).extend(value_list)
+
+    # Only rewritten when something changed, a backfill of unchanged nights reads the manifests and writes nothing
+    if use_cache and (changed or len(manifest["files"]) != len(seen)):
+        manifest["files"] = {name: entry for name, entry in manifest["files"].items() if name in seen}
+        with open(os.path.join(engine_model_folder, MANIFEST_FILE), "w") as f:
+            f.write(json.dumps(manifest))
+
+    # Average. Required metrics are saved as 0 when missing, others only when found.
+    # With several runs (n_iter > 1 or AdaptiveRunner.py rounds) the sample std is saved as "<metric> std".
+    averages = {}
+    for config_name, metric_values in results.items():
+        averages[config_name] = {}
+        for metric, value_list in metric_values.items():
+            if len(value_list)==0:
+                average=0
+            else:
+                average = float(np.mean(value_list))
+            averages[config_name][metric]=average
+            if len(value_list) > 1:
+                averages[config_name][f"{metric} std"] = float(np.std(value_list, ddof=1))
+
+    # Runs with per-request traces: the percentiles of all runs together from their merged sketches, see trace_sketch.py.
+    # They replace the mean of the per-run percentiles and add P99.9.
+    config_sketches = {}
+    for sketch_file in sketch_files:
+        check, target = CheckFileName(os.path.basename(sketch_file), log_files_prefix)
+        if check:
+            config_sketches.setdefault(target, []).append(sketch_file)
+    for config_name, files in config_sketches.items():
+        averages[config_name].update(SketchMetrics(MergeSketchFiles(files)))
+
+    # Hardware telemetry of each test, see telemetry.py
+    # Shards ran different tests, so their summaries don't overlap
+    telemetry = {}
+    for telemetry_file in ServerFiles(engine_model_folder, TELEMETRY_FILE):
+        with open(telemetry_file, "r") as f:
+            telemetry.update(json.load(f))
+    if telemetry:
+        for config_name, metric_values in averages.items():
+            if config_name in telemetry:
+                metric_values.update(telemetry[config_name])
+                tokens_per_joule = TokensPerJoule(metric_values)
+                if tokens_per_joule is not None:
+                    metric_values["Output tokens per joule"] = tokens_per_joule
+    return bench_type, model, averages, n_parsed, len(seen)
+
+def PrepareTasks(folder, data, use_cache=True):
+    # Reset the parsed sections of a Result.json and return one task per engine/model folder under folder
+    engine_folders = [os.path.join(folder, bt) for bt in bench_types]
     data["Benchmark"] = {}
+    data["Startup"] = {}
     
+    tasks = []
     for engine_folder in engine_folders:
         bench_type = engine_folder.split('/')[-1]
         data["Benchmark"][bench_type] = {}
@@ -38,54 +253,46 @@ def process_logs_in_folder(args):
             if os.path.exists(engine_model_folder) == False:
                 logger.warning(f"[{py_script}] Model folder {engine_model_folder} deos not existed, skip...")
                 continue
-            
-            # Init empty 
-            if model == "meta-llama_Llama-3.1-8B-Instruct" or model == "meta-llama_Llama-3.3-70B-Instruct":
-                log_files_prefix = log_files_prefix_Llama_8B_70B
-            else: 
-                log_files_prefix = log_file_prefix_Llama4_Scout
-            metrics=GetMetrics(engine_folder)
-            results={}
-            for filename in log_files_prefix:
-                results[filename] = {metric: [] for metric in metrics}
-
-            # List all files. e.g., i32_o32_c16_p3000_iter1.log, i32_o32_c64_p3000_iter1.log ...
-            log_files = [os.path.join(engine_model_folder, f) for f in os.listdir(engine_model_folder)]
-
-            # Parse performance numbers from logs
-            for log_file in log_files:
-                check, target = CheckFileName(log_file, log_files_prefix)
-                if check:
-                    with open(log_file, 'r') as file:
-                        for line in file:
-                            for metric in metrics:
-                                if metric in line:
-                                    try: 
-                                        value = float(line.split()[-1]) # e.g., "Output token throughput (tok/s):         543.82  "
-                                        results[target][metric].append(value)
-                                    except (ValueError, IndexError) as e:
-                                        logger.error(f"[ParseBenchmark.py] Skip this file {log_file} due to error: {e}")
-            
-            # Average
-            for config_name, metric_values in results.items():
-                data["Benchmark"][bench_type][model][config_name]={}
-                for metric in metrics:
-                    value_list = metric_values[metric]
-                    if len(value_list)==0:
-                        average=0
-                    else:
-                        average = np.mean(value_list)
-                    data["Benchmark"][bench_type][model][config_name][metric]=average
+            tasks.append((bench_type, model, engine_model_folder, use_cache))
+            # Mean over the shards' servers
+            startups = []
+            for startup_file in ServerFiles(engine_model_folder, STARTUP_FILE):
+                with open(startup_file, "r") as f:
+                    startups.append(json.load(f)["metrics"])
+            if startups:
+                data["Startup"].setdefault(bench_type, {})[model] = {
+                    metric: float(np.mean([s[metric] for s in startups if metric in s]))
+                    for metric in dict.fromkeys(m for s in startups for m in s)}
+    return tasks
+
+def RunTasks(tasks, workers=None):
+    # Results of ParseModelFolder in the order of tasks, the folders are parsed by `workers` processes
+    if workers == 1 or len(tasks) <= 1:
+        return list(map(ParseModelFolder, tasks))
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A backfill has thousands of small folders, hand them out in chunks
+        return list(executor.map(ParseModelFolder, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+def process_logs_in_folder(args):
+    with open(args.json_file, "r") as f:
+        data = json.load(f)
+    tasks = PrepareTasks(args.folder, data, not args.no_cache)
+
+    for bench_type, model, averages, n_parsed, n_logs in RunTasks(tasks, args.workers):
+        data["Benchmark"][bench_type][model] = averages
+        logger.debug(f"[{py_script}] {bench_type}/{model}: parsed {n_parsed} of {n_logs} logs, the rest are cached.")
     
     with open(args.json_file, "w") as f:
         json.dump(data, f, indent=4)
         logger.info(f"[{py_script}] Benchmark numbers are saved successfully to '{args.json_file}'.")
 
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--json-file", type=str, required=True, help="Path to the save the benchmark result.")
     parser.add_argument("--folder", type=str, default=None, help="Folder of the benchmark logs")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parsing processes (default: number of CPUs)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every log and ignore the manifests")
     args = parser.parse_args()
 
     if not os.path.exists(args.json_file):
@@ -0,0 +1,254 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import numpy as np
+from utils import setup_logger, bench_types, models, regression_metrics
+from result_store import OpenStore, LoadHistory, LoadDockerNames, DEFAULT_DB
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("ray_overhead_logger")
+
+# Cost of serving an engine through Ray Serve: <engine>_ray against <engine>_standalone of the same night, model and config.
+# overhead_pct is signed so that positive always means Ray is worse (lower throughput, higher latency).
+
+OVERHEAD_METRICS = [
+    "Output token throughput (tok/s)",
+    "Mean TTFT (ms)",
+    "P99 TTFT (ms)",
+    "Mean ITL (ms)",
+    "P99 ITL (ms)",
+]
+RAY_VERSION_KEY = "Ray Version" # Result.json: {engine: ray.__version__ of the engine's image}
+UNKNOWN_VERSION = "unknown"
+MAD_SCALE = 1.4826
+CONFIG_PATTERN = re.compile(r"i(\d+)_o(\d+)_c(\d+)_p(\d+)")
+
+def RayEngines():
+    # Engines that have both deployment modes, e.g., vLLM
+    return sorted({bt.split('_')[0] for bt in bench_types if bt.endswith("_ray")
+                   and bt.replace("_ray", "_standalone") in bench_types})
+
+def LoadRayVersions(result_folder: str, dates: list):
+    # {(date, engine): version} from the Result.json of every night
+    versions = {}
+    for date_str in dates:
+        json_file = os.path.join(result_folder, date_str, "Result.json")
+        if not os.path.exists(json_file):
+            continue
+        with open(json_file, "r") as f:
+            for engine, version in json.load(f).get(RAY_VERSION_KEY, {}).items():
+                versions[(date_str, engine)] = version
+    return versions
+
+def ComputeDeltas(dates: list, history: dict, versions: dict, dockers: dict):
+    """One row per (engine, model, config, metric, date) measured in both modes. 0 means a failed run and is skipped."""
+    deltas = []
+    for (bench_type, model, config, metric), series in history.items():
+        if not bench_type.endswith("_standalone") or metric not in OVERHEAD_METRICS:
+            continue
+        engine = bench_type.split('_')[0]
+        ray_series = history.get((f"{engine}_ray", model, config, metric), {})
+        higher_is_better = regression_metrics[metric]
+        for date_str in dates:
+            standalone, ray = series.get(date_str), ray_series.get(date_str)
+            if standalone in (None, 0) or ray in (None, 0):
+                continue
+            delta_pct = (ray - standalone) / standalone * 100
+            deltas.append({
+                "engine": engine,
+                "model": model,
+                "config": config,
+                "metric": metric,
+                "date": date_str,
+                "ray_version": versions.get((date_str, engine), UNKNOWN_VERSION),
+                "docker": dockers.get((date_str, f"{engine}_ray"), ""),
+                "standalone": standalone,
+                "ray": ray,
+                "delta": ray - standalone,
+                "delta_pct": delta_pct,
+                "overhead_pct": -delta_pct if higher_is_better else delta_pct,
+            })
+    deltas.sort(key=lambda d: (d["engine"], d["model"], d["metric"], d["config"], d["date"]))
+    return deltas
+
+def FitScaling(rows: list):
+    """Least squares fit of overhead_pct = a + b * log2(concurrency) + c * log2(input length).
+    b and c are the percentage points the overhead grows per doubling. None if the configs can't separate them."""
+    features, targets = [], []
+    for row in rows:
+        match = CONFIG_PATTERN.fullmatch(row["config"])
+        if match:
+            ilen, _, concurrency, _ = map(int, match.groups())
+            features.append([1.0, np.log2(concurrency), np.log2(ilen)])
+            targets.append(row["overhead_pct"])
+    if len(targets) < 4:
+        return None
+    X, y = np.array(features), np.array(targets)
+    if np.linalg.matrix_rank(X) < X.shape[1]:
+        return None
+    coef, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    residual = y - X @ coef
+    total = np.sum((y - y.mean()) ** 2)
+    return {
+        "intercept_pct": float(coef[0]),
+        "per_concurrency_doubling_pct": float(coef[1]),
+        "per_input_doubling_pct": float(coef[2]),
+        "r2": float(1 - np.sum(residual ** 2) / total) if total > 0 else 1.0,
+        "n": len(targets),
+    }
+
+def GroupBy(rows: list, fields: tuple):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[f] for f in fields), []).append(row)
+    return groups
+
+def SummarizeVersions(deltas: list):
+    # Overhead of every Ray version over all the nights that ran it, with the scaling fit pooled over those nights
+    summary = []
+    for (engine, model, metric, version), rows in GroupBy(deltas, ("engine", "model", "metric", "ray_version")).items():
+        nights = sorted({row["date"] for row in rows})
+        summary.append({
+            "engine": engine,
+            "model": model,
+            "metric": metric,
+            "ray_version": version,
+            "first_date": nights[0],
+            "last_date": nights[-1],
+            "nights": len(nights),
+            "median_overhead_pct": float(np.median([row["overhead_pct"] for row in rows])),
+            "scaling": FitScaling(rows),
+        })
+    summary.sort(key=lambda s: (s["engine"], s["model"], s["metric"], s["first_date"]))
+    return summary
+
+def FindWidening(deltas: list, latest_date: str, window: int, threshold: float, z_threshold: float, min_runs: int):
+    """Configs whose overhead on latest_date exceeds the median of the previous `window` nights by more than
+    `threshold` percentage points, and by more than z_threshold robust sigmas once there are min_runs nights."""
+    widening = []
+    for (engine, model, config, metric), rows in GroupBy(deltas, ("engine", "model", "config", "metric")).items():
+        current = next((row for row in rows if row["date"] == latest_date), None)
+        baseline = [row["overhead_pct"] for row in rows if row["date"] < latest_date][-window:]
+        if current is None or not baseline:
+            continue
+        median = float(np.median(baseline))
+        noise = MAD_SCALE * float(np.median(np.abs(np.array(baseline) - median))) if len(baseline) >= min_runs else 0.0
+        growth = current["overhead_pct"] - median
+        if growth > threshold and growth > z_threshold * noise:
+            widening.append({
+                "engine": engine,
+                "model": model,
+                "config": config,
+                "metric": metric,
+                "date": latest_date,
+                "ray_version": current["ray_version"],
+                "baseline_ray_versions": sorted({row["ray_version"] for row in rows if row["date"] < latest_date}),
+                "overhead_pct": current["overhead_pct"],
+                "baseline_median_pct": median,
+                "growth_pct": growth,
+                "noise_pct": noise,
+            })
+    widening.sort(key=lambda w: w["growth_pct"], reverse=True)
+    return widening
+
+def SaveDeltasCSV(csv_file: str, deltas: list):
+    fields = ["date", "engine", "model", "config", "metric", "ray_version", "docker",
+              "standalone", "ray", "delta", "delta_pct", "overhead_pct"]
+    with open(csv_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(deltas)
+
+def Report(args):
+    engines = RayEngines()
+    store = OpenStore(args.db)
+    dates, history = LoadHistory(store, [f"{e}_{mode}" for e in engines for mode in ("ray", "standalone")],
+                                 models, OVERHEAD_METRICS, args.days)
+    dockers = LoadDockerNames(store)
+    store.close()
+    deltas = ComputeDeltas(dates, history, LoadRayVersions(args.result_folder, dates), dockers)
+    if not deltas:
+        logger.warning(f"[{py_script}] No night has both ray and standalone numbers of {engines}.")
+        return 0
+    latest_date = args.date or max(row["date"] for row in deltas)
+
+    latest = [row for row in deltas if row["date"] == latest_date]
+    scaling = []
+    for (engine, model, metric), rows in GroupBy(latest, ("engine", "model", "metric")).items():
+        fit = FitScaling(rows)
+        scaling.append({"engine": engine, "model": model, "metric": metric,
+                        "median_overhead_pct": float(np.median([row["overhead_pct"] for row in rows])), "fit": fit})
+        logger.info(f"[{py_script}] {latest_date} {engine} {model} {metric}: Ray overhead median "
+                    f"{scaling[-1]['median_overhead_pct']:+.2f}%" + (
+                    f", {fit['per_concurrency_doubling_pct']:+.2f}pp per concurrency doubling, "
+                    f"{fit['per_input_doubling_pct']:+.2f}pp per input length doubling (R²={fit['r2']:.2f})" if fit else ""))
+
+    widening = FindWidening(deltas, latest_date, args.window, args.threshold, args.z_threshold, args.min_runs)
+    for w in widening:
+        logger.warning(f"[{py_script}] Ray overhead widened: {w['engine']} {w['model']} {w['config']} {w['metric']} "
+                       f"{w['overhead_pct']:+.2f}% vs baseline median {w['baseline_median_pct']:+.2f}% "
+                       f"(Ray {', '.join(w['baseline_ray_versions'])} -> {w['ray_version']})")
+    logger.info(f"[{py_script}] {len(widening)} of {len(latest)} ray/standalone pairs of {latest_date} widened.")
+
+    if args.out_json:
+        report = {
+            "date": latest_date,
+            "ray_versions": sorted({row["ray_version"] for row in latest}),
+            "threshold_pct": args.threshold,
+            "window": args.window,
+            "deltas": latest,
+            "scaling": scaling,
+            "versions": SummarizeVersions(deltas),
+            "widening": widening,
+        }
+        with open(args.out_json, "w") as f:
+            json.dump(report, f, indent=4)
+        logger.info(f"[{py_script}] Ray overhead report is saved to '{args.out_json}'.")
+    if args.out_csv:
+        SaveDeltasCSV(args.out_csv, deltas)
+        logger.info(f"[{py_script}] {len(deltas)} ray/standalone deltas are saved to '{args.out_csv}'.")
+    return 0
+
+def RecordVersion(args):
+    with open(args.json_file, "r") as f:
+        data = json.load(f)
+    data.setdefault(RAY_VERSION_KEY, {})[args.engine] = args.version
+    with open(args.json_file, "w") as f:
+        json.dump(data, f, indent=4)
+    logger.info(f"[{py_script}] Ray {args.version} of {args.engine} is saved to '{args.json_file}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ray Serve overhead: <engine>_ray against <engine>_standalone")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    report = subparsers.add_parser("report", help="Deltas, scaling fit, history per Ray version and widening gaps")
+    report.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    report.add_argument("--result-folder", type=str, default="Result", help="Date folders whose Result.json has the Ray version")
+    report.add_argument("--date", type=str, default=None, help="Night to report (default: the latest one with both modes)")
+    report.add_argument("--days", type=int, default=None, help="Only use the last N days")
+    report.add_argument("--window", type=int, default=7, help="Baseline of the widening check: the last N nights before --date")
+    report.add_argument("--threshold", type=float, default=3, help="Overhead growth in percentage points that counts as widening")
+    report.add_argument("--z-threshold", type=float, default=3, help="Robust z-score (median/MAD) the growth must exceed")
+    report.add_argument("--min-runs", type=int, default=3, help="Minimum baseline nights to use the MAD noise estimate")
+    report.add_argument("--out-json", type=str, default=None, help="e.g., Result/2025-08-18/RayOverhead.json")
+    report.add_argument("--out-csv", type=str, default=None, help="Every delta of the history, one row per night and config")
+
+    record = subparsers.add_parser("record-version", help=f"Save the Ray version of an engine image to Result.json '{RAY_VERSION_KEY}'")
+    record.add_argument("--json-file", type=str, required=True)
+    record.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    record.add_argument("--version", type=str, required=True)
+    args = parser.parse_args()
+
+    actions = {"report": Report, "record-version": RecordVersion}
+    sys.exit(actions[args.action](args))
+
+
+'''
+python3 RayOverhead.py record-version --json-file Result/2025-08-18/Result.json --engine vLLM --version 2.49.0
+python3 RayOverhead.py report --db Result/results.db --days 180 --out-json Result/2025-08-18/RayOverhead.json --out-csv Result/RayOverhead.csv
+'''
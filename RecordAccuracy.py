@@ -1,4 +1,5 @@
 import argparse
+import fcntl
 import json
 import os
 import sys
@@ -42,7 +43,10 @@ def main():
         accuracy_score = get_accuracy_from_json(args.acc_path)
         dataset=os.path.basename(args.acc_path).split('.')[0]
 
-    # Save accuracy number
+    # Save accuracy number. benchmark.sh --accuracy may record from several configs at once, so the
+    # read-modify-write of the file is locked
+    lock = open(args.out_json + ".lock", "w")
+    fcntl.flock(lock, fcntl.LOCK_EX)
     if not os.path.exists(args.out_json):
         data = {
             "Accuracy": {
@@ -63,6 +67,7 @@ def main():
     with open(args.out_json, "w") as f:
         json.dump(data, f, indent=4)
         print(f"Data saved successfully to '{args.out_json}'.")
+    lock.close()
 
 
     if accuracy_score is not None:
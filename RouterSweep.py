@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("router_sweep_logger")
+
+# Cost of the Ray Serve front end alone, on CPUs. The same mock engine (mock_server.py's batching loop) is measured
+# directly and behind ray_engine.py --engine Mock for every router replica count and stream batching interval, with
+# the same bench_client.py load. The difference is what LLMRouter + LLMServer add:
+#   per request: E2EL and TTFT deltas, per token: TPOT delta, and the output throughput lost.
+
+# Every step costs the same whatever the batch, so the engine time of a request is fixed and the deltas are only Ray
+DETERMINISTIC_ENGINE = {"prefill_ms": 20.0, "prefill_ms_per_token": 0.0, "decode_ms": 10.0, "decode_ms_per_seq": 0.0}
+LATENCY_METRICS = ["Mean TTFT (ms)", "P99 TTFT (ms)", "Mean TPOT (ms)", "P99 TPOT (ms)", "Mean E2EL (ms)", "P99 E2EL (ms)"]
+THROUGHPUT_METRIC = "Output token throughput (tok/s)"
+MODEL = "mock"
+RAY_SERVE_API = "http://localhost:8265/api/serve/applications/"
+
+def StartServer(args, name: str, cmd: list, ray: bool):
+    state_file = os.path.join(args.out_dir, f"{name}.state.json")
+    lifecycle = ["python", "server_lifecycle.py"]
+    subprocess.run(lifecycle + ["start", "--state-file", state_file, "--port", str(args.port), "--timeout", str(args.timeout),
+                                "--log-file", os.path.join(args.out_dir, f"{name}.server.log")] +
+                   # Ray Serve answers before its replicas are up, wait for the Mock deployment and the router
+                   (["--ray", "--ray-api", RAY_SERVE_API, "--deployment-prefix", "Mock"] if ray else []) +
+                   ["--"] + cmd, check=True)
+    return state_file
+
+def StopServer(state_file: str, ray: bool):
+    subprocess.run(["python", "server_lifecycle.py", "stop", "--state-file", state_file] + (["--ray"] if ray else []))
+
+def RunClient(args, name: str, concurrency: int):
+    result_file = os.path.join(args.out_dir, f"{name}_c{concurrency}.json")
+    subprocess.run(["python", "bench_client.py", "--host", "127.0.0.1", "--port", str(args.port), "--model", MODEL,
+                    "--num-prompts", str(args.num_prompts), "--random-input-len", str(args.input_len),
+                    "--random-output-len", str(args.output_len), "--max-concurrency", str(concurrency),
+                    "--result-file", result_file], check=True, stdout=subprocess.DEVNULL)
+    with open(result_file, "r") as f:
+        summary = json.load(f)["summary"]
+    if summary["Failed requests"] > 0:
+        logger.warning(f"[{py_script}] {name} c{concurrency}: {summary['Failed requests']} failed requests.")
+    return {metric: summary.get(metric) for metric in LATENCY_METRICS + [THROUGHPUT_METRIC, "Failed requests"]}
+
+def MeasureServer(args, name: str, cmd: list, ray: bool):
+    # {concurrency: metrics}, one warmup run first so connection setup and the first routing aren't measured
+    state_file = StartServer(args, name, cmd, ray)
+    try:
+        RunClient(args, f"{name}_warmup", args.concurrency[0])
+        return {concurrency: RunClient(args, name, concurrency) for concurrency in args.concurrency}
+    finally:
+        StopServer(state_file, ray)
+
+def Overhead(direct: dict, ray: dict):
+    overhead = {f"{metric} delta": ray[metric] - direct[metric] for metric in LATENCY_METRICS
+                if ray.get(metric) is not None and direct.get(metric) is not None}
+    if direct.get(THROUGHPUT_METRIC):
+        overhead["Output throughput loss (%)"] = (1 - ray[THROUGHPUT_METRIC] / direct[THROUGHPUT_METRIC]) * 100
+    return overhead
+
+def main(args):
+    os.makedirs(args.out_dir, exist_ok=True)
+    engine = dict(DETERMINISTIC_ENGINE, **json.loads(args.mock_args))
+
+    direct_cmd = ["python", "mock_server.py", "--host", "127.0.0.1", "--port", str(args.port), "--model", MODEL,
+                  "--max-concurrency", str(max(args.concurrency) * 4)]
+    for key, value in engine.items():
+        direct_cmd += [f"--{key.replace('_', '-')}", str(value)]
+    logger.info(f"[{py_script}] Measuring the mock engine without Ray: {engine}")
+    direct = MeasureServer(args, "direct", direct_cmd, ray=False)
+
+    points = []
+    for router_replicas in args.router_replicas:
+        for interval in args.batching_intervals:
+            name = f"ray_r{router_replicas}_b{interval:g}"
+            ray_cmd = ["python", "ray_engine.py", "--engine", "Mock", "--port", str(args.port),
+                       "--cpu_core_per_llm_replica", "1", "--accelerator_type", "CPU", "--model_path", MODEL, "--dtype", "auto",
+                       "--llm_replica", "1", "--router_replica", str(router_replicas), "--tp", "1", "--max_model_len", "4096",
+                       "--stream_batching_interval_ms", str(interval), "--max_ongoing_requests", str(args.max_ongoing_requests),
+                       "--mock_args", json.dumps(engine)]
+            logger.info(f"[{py_script}] Measuring Ray Serve with {router_replicas} router replicas, {interval:g} ms stream batching")
+            try:
+                measured = MeasureServer(args, name, ray_cmd, ray=True)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"[{py_script}] {name} failed: {e}")
+                continue
+            for concurrency, metrics in measured.items():
+                point = {"router_replicas": router_replicas, "batching_interval_ms": interval, "concurrency": concurrency,
+                         "metrics": metrics, "overhead": Overhead(direct[concurrency], metrics)}
+                points.append(point)
+                o = point["overhead"]
+                logger.info(f"[{py_script}] r={router_replicas} b={interval:g}ms c={concurrency}: "
+                            f"per request {o.get('Mean E2EL (ms) delta', float('nan')):+.2f} ms "
+                            f"(P99 {o.get('P99 E2EL (ms) delta', float('nan')):+.2f}), "
+                            f"TTFT {o.get('Mean TTFT (ms) delta', float('nan')):+.2f} ms, "
+                            f"per token {o.get('Mean TPOT (ms) delta', float('nan')):+.3f} ms, "
+                            f"throughput {-o.get('Output throughput loss (%)', float('nan')):+.1f}%")
+
+    report = {
+        "engine": engine,
+        "num_prompts": args.num_prompts,
+        "input_len": args.input_len,
+        "output_len": args.output_len,
+        "max_ongoing_requests": args.max_ongoing_requests,
+        "direct": direct,
+        "points": points,
+    }
+    out_json = os.path.join(args.out_dir, "RouterSweep.json")
+    with open(out_json, "w") as f:
+        json.dump(report, f, indent=4)
+    logger.info(f"[{py_script}] {len(points)} sweep points are saved to '{out_json}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ray Serve router overhead over router replicas and stream batching intervals")
+    parser.add_argument("--out-dir", type=str, default="Result/RouterSweep", help="Client results, server logs and RouterSweep.json")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--router-replicas", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--batching-intervals", type=float, nargs="+", default=[0, 10, 50], help="stream_batching_interval_ms values")
+    parser.add_argument("--max-ongoing-requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--num-prompts", type=int, default=1000)
+    parser.add_argument("--input-len", type=int, default=128)
+    parser.add_argument("--output-len", type=int, default=128)
+    parser.add_argument("--mock-args", type=str, default="{}", help=f"JSON overriding the mock engine {DETERMINISTIC_ENGINE}")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for each server")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+# CPU-only, a local Ray cluster is started by ray_engine.py
+python3 RouterSweep.py --router-replicas 1 4 16 --batching-intervals 0 50 --concurrency 64 256
+'''
@@ -3,126 +3,158 @@ import json
 import os
 from datetime import datetime
 import argparse
-from utils import setup_logger, bench_types, models, overview_files, row_mapping_acc, row_mapping_8B, row_mapping_70B, row_mapping_Scout
-import shutil
-import logging
+import numpy as np
+from utils import setup_logger, overview_schema
 import sys
 
 py_script = os.path.basename(sys.argv[0])
 logger = setup_logger("save_overview_logger")
 
-def get_nested_value(data: dict, json_key_layer: list):
-    current_level = data
-    for key in json_key_layer:
-        if isinstance(current_level, dict) and key in current_level:
-            current_level = current_level[key]
-        else:
-            # if key not exist, return 0
-            # logger.warning(f"[SaveOverviewCSV.py] No key {key} found in {current_level}, json_key_layer={json_key_layer}")
-            return 0
-    return current_level
-
-def CheckDate(csv_lines: list, date_str: str, overview_file: str):
-    for i, row in enumerate(csv_lines):
-        if row and row[0] == "Date":
-            try:
-                date_col_index = row.index(date_str)
-                logger.debug(f"[{py_script}] {date_str} already in {overview_file}, overwrite it.")
-            except ValueError: # date_str doesn't exist in row
-                # Only save the newer data so checking the last date is older than current one.
-                if len(row) > 1 and row[-1] != "":
-                    latest_date_str = row[-1]
-                    latest_date = datetime.strptime(row[-1], "%Y-%m-%d")
-                    new_date = datetime.strptime(date_str, "%Y-%m-%d")
-                    if new_date < latest_date:
-                        logger.warning(f"[{py_script}] The date '{date_str}' is older than the latest date '{latest_date_str}'. {overview_file} Aborting.")
-                        return -1
-
-                csv_lines[i].append(date_str)
-                date_col_index = len(csv_lines[i]) - 1
-            break  
-
-    if date_col_index == -1:
-        logger.error(f"[{py_script}] Error: 'Date' row not found in the {overview_file}. Aborting.")
-        return -1
-    return date_col_index
-
-
-def SaveAccuracyOverview(csv_lines: list, data: dict, date_str: str, overview_file: str):
-    # Setup date
-    date_col_index = CheckDate(csv_lines, date_str, overview_file)
-    if date_col_index == -1:
+# Each overview CSV is two label columns (the second one names the bench type or metric of a heading) followed by one column per date. The label rows come from utils.overview_schema,
+# and every value row has a key like Result.json: ("Benchmark", bench_type, model, config, metric) or ("Accuracy", engine, model).
+# A file is loaded into a (value rows x dates) table, so a date column is written or read with one index operation.
+
+LABEL_COLUMNS = 2
+
+class OverviewLayout:
+    def __init__(self, labels: list, spec: dict):
+        self.labels = labels # Label cells of every row
+        self.keys = RowKeys(labels, spec) # Row index -> key, only value rows
+        self.slots = {key: slot for slot, key in enumerate(self.keys.values())} # key -> row of the value table
+
+def BuildLabels(spec: dict):
+    labels = [["Date"], [""]]
+    if spec["kind"] == "perf":
+        for bench_type in spec["bench_types"]:
+            labels.append(["Benchmark Type", bench_type])
+            for metric in spec["metrics"]:
+                labels.append(["Metric", metric])
+                labels += [[config] for config in spec["configs"]]
+                labels.append([""])
+    else:
+        for title, _, section_models in spec["sections"]:
+            labels.append([title])
+            labels += [[model] for model in section_models]
+            labels.append([""])
+    return labels[:-1] # Blocks are separated by a blank row, the file ends with an empty one
+
+def RowKeys(labels: list, spec: dict):
+    # Keys of the value rows, from the headings above them. Works on the labels of any older layout of the file too.
+    keys = {}
+    if spec["kind"] == "perf":
+        bench_type = metric = None
+        for i, row in enumerate(labels):
+            label = row[0] if row else ""
+            if label == "Benchmark Type":
+                bench_type, metric = row[1], None
+            elif label == "Metric":
+                metric = row[1]
+            elif label and label != "Date" and bench_type and metric:
+                keys[i] = ("Benchmark", bench_type, spec["model"], label, metric)
+    else:
+        engines = {title: engine for title, engine, _ in spec["sections"]}
+        engine = None
+        for i, row in enumerate(labels):
+            label = row[0] if row else ""
+            if label in engines:
+                engine = engines[label]
+            elif label and label != "Date" and engine:
+                keys[i] = ("Accuracy", engine, label)
+    return keys
+
+# Built once when the program starts
+overview_layouts = {overview_file: OverviewLayout(BuildLabels(spec), spec) for overview_file, spec in overview_schema.items()}
+
+def FlattenResult(data: dict):
+    # {key: value} of every number in Result.json, keys as in OverviewLayout
+    values = {}
+    for engine, model_dict in data.get("Accuracy", {}).items():
+        for model, value in (model_dict or {}).items():
+            values[("Accuracy", engine, model)] = value
+    for bench_type, model_dict in data.get("Benchmark", {}).items():
+        for model, config_dict in model_dict.items():
+            for config, metric_dict in config_dict.items():
+                for metric, value in metric_dict.items():
+                    values[("Benchmark", bench_type, model, config, metric)] = value
+    return values
+
+def LoadOverview(overview_file: str, layout: OverviewLayout, spec: dict):
+    """Return (dates, table) of the file in the current layout. Rows of keys the file doesn't have stay empty,
+    rows the schema no longer has are dropped."""
+    if not os.path.exists(overview_file):
+        logger.info(f"[{py_script}] {overview_file} doesn't exist, create it.")
+        return [], np.full((len(layout.slots), 0), "", dtype=object)
+    with open(overview_file, 'r', newline='') as f:
+        csv_lines = list(csv.reader(f))
+    dates = [d for d in csv_lines[0][LABEL_COLUMNS:] if d] if csv_lines and csv_lines[0] and csv_lines[0][0] == "Date" else []
+    old_keys = RowKeys([row[:2] for row in csv_lines], spec)
+    old_rows = {key: i for i, key in old_keys.items()}
+    table = np.full((len(layout.slots), len(dates)), "", dtype=object)
+    common = [key for key in layout.slots if key in old_rows]
+    if common and dates:
+        old_values = np.array([(row[LABEL_COLUMNS:] + [""] * len(dates))[:len(dates)] for row in csv_lines], dtype=object)
+        table[[layout.slots[key] for key in common]] = old_values[[old_rows[key] for key in common]]
+    return dates, table
+
+def GetDateColumn(dates: list, table: np.ndarray, date_str: str, overview_file: str):
+    # Column of date_str, appended if new. Only a date newer than the latest one can be appended.
+    if date_str in dates:
+        logger.debug(f"[{py_script}] {date_str} already in {overview_file}, overwrite it.")
+        return dates.index(date_str), table
+    if dates and datetime.strptime(date_str, "%Y-%m-%d") < datetime.strptime(dates[-1], "%Y-%m-%d"):
+        logger.warning(f"[{py_script}] The date '{date_str}' is older than the latest date '{dates[-1]}'. {overview_file} Aborting.")
+        return -1, table
+    dates.append(date_str)
+    return len(dates) - 1, np.hstack([table, np.full((len(table), 1), "", dtype=object)])
+
+def InsertDates(dates: list, table: np.ndarray, new_dates):
+    # Add the columns of new_dates in date order, wherever they fall
+    all_dates = sorted(set(dates) | set(new_dates))
+    merged = np.full((len(table), len(all_dates)), "", dtype=object)
+    position = {date_str: col for col, date_str in enumerate(all_dates)}
+    merged[:, [position[date_str] for date_str in dates]] = table
+    return all_dates, merged
+
+def SaveOverview(overview_file: str, layout: OverviewLayout, dates: list, table: np.ndarray):
+    csv_lines = []
+    for i, labels in enumerate(layout.labels):
+        row = labels + [""] * (LABEL_COLUMNS - len(labels))
+        if i == 0:
+            row += dates
+        elif i in layout.keys:
+            row += list(table[layout.slots[layout.keys[i]]])
+        csv_lines.append(row)
+    csv_lines.append([])
+    with open(overview_file, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerows(csv_lines)
+
+def SaveDates(values_by_date: dict):
+    """Write {date: FlattenResult(...)} of any number of dates, in any order, with one read and one write per file."""
+    if not values_by_date:
         return
-    
-    # Fill the accuracy numbers
-    for name, row, json_key_layer in row_mapping_acc:
-        value = get_nested_value(data, json_key_layer)
-        row = int(row)
-
-        while len(csv_lines[row]) <= date_col_index:
-            csv_lines[row].append("")
-        csv_lines[row][date_col_index] = value
-
-def Save_8B_70B_Overview(csv_lines: list, data: dict, date_str: str, overview_file: str, is_8B: bool):
-    date_col_index = CheckDate(csv_lines, date_str, overview_file)
-    if date_col_index == -1:
-        return
-    
-    # Fill the accuracy numbers
-    row_mapping = row_mapping_8B if is_8B else row_mapping_70B
-    for name, row, json_key_layer in row_mapping:
-        value = get_nested_value(data, json_key_layer)
-        row = int(row)
-
-        while len(csv_lines[row]) <= date_col_index:
-            csv_lines[row].append("")
-        csv_lines[row][date_col_index] = value
-
-def Save_Scout_Overview(csv_lines: list, data: dict, date_str: str, overview_file: str):
-    # Setup date
-    date_col_index = CheckDate(csv_lines, date_str, overview_file)
-    if date_col_index == -1:
-        return
-    
-    # Fill the accuracy numbers
-    for name, row, json_key_layer in row_mapping_Scout:
-        value = get_nested_value(data, json_key_layer)
-        row = int(row)
-
-        while len(csv_lines[row]) <= date_col_index:
-            csv_lines[row].append("")
-        csv_lines[row][date_col_index] = value
+    for overview_file, layout in overview_layouts.items():
+        dates, table = LoadOverview(overview_file, layout, overview_schema[overview_file])
+        dates, table = InsertDates(dates, table, values_by_date)
+        cols = [dates.index(date_str) for date_str in values_by_date]
+        table[:, cols] = np.array([[values.get(key, 0) for values in values_by_date.values()] for key in layout.slots],
+                                  dtype=object).reshape(len(layout.slots), len(cols))
+        SaveOverview(overview_file, layout, dates, table)
 
 def main(args):
     with open(args.json_file, "r") as f:
         data = json.load(f)
-    date_str = args.json_file.split('/')[-2] # e.g., $HOME/CI/Result/2025-08-12/Result.json 
-
-    # Check if the overview files exist
-    for overview_file in overview_files:
-        if not os.path.exists(overview_file):
-            print(f"{overview_file} doesn't exist. Copy an empty template from the folder ./template")
-            source_file = f"template/{overview_file}"
-            destination_file = "overview_file"
-            shutil.copyfile(source_file, overview_file)
-        
-        with open(overview_file, 'r', newline='') as f:
-            reader = csv.reader(f)
-            csv_lines = list(reader)
-            # print(f"{overview_file}\n {csv_lines}")
-        
-        if "accuracy" in overview_file:
-            SaveAccuracyOverview(csv_lines, data, date_str, overview_file)
-        elif "8B" in overview_file:
-            Save_8B_70B_Overview(csv_lines, data, date_str, overview_file, is_8B=True)
-        elif "70B" in overview_file:
-            Save_8B_70B_Overview(csv_lines, data, date_str, overview_file, is_8B=False)
-        elif "Scout" in overview_file:
-            Save_Scout_Overview(csv_lines, data, date_str, overview_file)
-        
-        with open(overview_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(csv_lines)
+    date_str = args.json_file.split('/')[-2] # e.g., $HOME/CI/Result/2025-08-12/Result.json
+    values = FlattenResult(data)
+
+    for overview_file, layout in overview_layouts.items():
+        dates, table = LoadOverview(overview_file, layout, overview_schema[overview_file])
+        col, table = GetDateColumn(dates, table, date_str, overview_file)
+        if col == -1:
+            continue
+        # Missing numbers are saved as 0, like a benchmark that didn't finish
+        table[:, col] = np.array([values.get(key, 0) for key in layout.slots], dtype=object)
+        SaveOverview(overview_file, layout, dates, table)
 
 
 if __name__ == "__main__":
@@ -136,14 +168,14 @@ if __name__ == "__main__":
         exit()
 
     main(args)
-    
+
 
 '''
-python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-12/Result.json 
+python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-12/Result.json
 
-python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-11/Result.json 
+python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-11/Result.json
 
-python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-13/Result.json 
+python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-13/Result.json
 
-python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-18/Result.json 
-'''
\ No newline at end of file
+python $HOME/CI/SaveOverviewCSV.py --json-file $HOME/CI/Result/2025-08-18/Result.json
+'''
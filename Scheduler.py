@@ -0,0 +1,231 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("scheduler_logger")
+
+# Packs the configs of benchmark.sh onto disjoint GPU sets of one node.
+# Every job is one benchmark.sh --config call with its own HIP_VISIBLE_DEVICES, port and CPU set.
+# Ray configs start a node-wide Ray cluster, so they run alone on the node. The tests of a standalone config smaller
+# than the node are split into shards, one server per shard, so e.g. the tp=1 tests fill all 8 GPUs.
+# The system tuning (NUMA balancing, CPU governor) is applied once before the jobs and reset after them.
+
+class Job:
+    def __init__(self, index: int, ray_enable: bool, model: str, tp: int, tests: list, shard: int = None):
+        self.index = index
+        self.ray_enable = ray_enable
+        self.model = model
+        self.tp = tp
+        self.tests = tests
+        self.shard = shard # None when the job runs all tests of the config
+        self.devices = []
+        self.cpus = []
+        self.port = None
+
+    @property
+    def exclusive(self):
+        return self.ray_enable
+
+    @property
+    def name(self):
+        mode = "ray" if self.ray_enable else "standalone"
+        shard = "" if self.shard is None else f"_shard{self.shard}"
+        return f"{self.index}_{mode}_{self.model.replace('/', '_')}_tp{self.tp}{shard}"
+
+def ListJobs(engine: str, extra_args: list):
+    cmd = ["./benchmark.sh", "--engine", engine, "--model-dir", "/", "--out-dir", "/tmp", "--list-configs"] + extra_args
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    jobs = []
+    for line in output.splitlines():
+        if line.startswith("CONFIG "):
+            _, index, ray_enable, model, tp, *tests = line.split()
+            jobs.append(Job(int(index), ray_enable == "true", model, int(tp), tests[0].split(",") if tests else []))
+    return jobs
+
+def SplitJobs(jobs: list, n_devices: int):
+    """One job per GPU set for the tests of a standalone config smaller than the node. Tests are dealt round-robin,
+    so the long and high concurrency ones of each input length spread over the shards."""
+    split = []
+    for job in jobs:
+        n_shards = min(n_devices // job.tp, len(job.tests))
+        if job.exclusive or n_shards <= 1:
+            split.append(job)
+            continue
+        for shard in range(n_shards):
+            split.append(Job(job.index, job.ray_enable, job.model, job.tp, job.tests[shard::n_shards], shard))
+    return split
+
+def OrderJobs(jobs: list):
+    # Node-wide jobs first, then the largest tp first so small jobs fill the gaps
+    return sorted(jobs, key=lambda job: (not job.exclusive, -job.tp, job.index, job.shard or 0))
+
+def PlaceDevices(free: list, devices: list, n: int):
+    """Pick n free devices. An aligned block (positions k*n..k*n+n-1) is preferred so a tp=4 job
+    doesn't split the node in a way that blocks the next tp=4 job. None if they don't fit."""
+    if n > len(devices):
+        return None
+    free_set = set(free)
+    for start in range(0, len(devices) - n + 1, n):
+        block = devices[start:start + n]
+        if all(device in free_set for device in block):
+            return block
+    if len(free) >= n:
+        return sorted(free, key=devices.index)[:n]
+    return None
+
+def GetCpus(job_devices: list, devices: list, cpus: list):
+    # Same share of CPUs for every device, the job gets the shares of its devices
+    per_device = max(len(cpus) // len(devices), 1)
+    job_cpus = []
+    for device in job_devices:
+        position = devices.index(device)
+        job_cpus += cpus[position * per_device:(position + 1) * per_device]
+    return job_cpus or cpus
+
+def Schedule(jobs: list, devices: list, cpus: list, base_port: int, start_job, poll_finished):
+    """Event loop shared by the real run and the dry run.
+    start_job(job) launches a placed job, poll_finished() blocks until at least one job finishes and returns them."""
+    pending = OrderJobs(jobs)
+    free = list(devices)
+    running = []
+    while pending or running:
+        launched = True
+        while launched and pending:
+            launched = False
+            job = pending[0]
+            if job.exclusive:
+                # Wait for the node to drain, nothing else starts meanwhile
+                if running:
+                    break
+                job.devices, job.cpus = list(devices), list(cpus)
+            else:
+                placed = None
+                for candidate in pending:
+                    if candidate.exclusive:
+                        break
+                    placed = PlaceDevices(free, devices, candidate.tp)
+                    if placed is not None:
+                        job = candidate
+                        break
+                if placed is None:
+                    break
+                job.devices, job.cpus = placed, GetCpus(placed, devices, cpus)
+            job.port = base_port + devices.index(job.devices[0])
+            free = [device for device in free if device not in job.devices]
+            pending.remove(job)
+            running.append(job)
+            start_job(job)
+            launched = True
+        if not running:
+            if pending:
+                raise RuntimeError(f"Job {pending[0].name} needs {pending[0].tp} devices, only {len(devices)} on the node")
+            break
+        for job in poll_finished():
+            running.remove(job)
+            free += job.devices
+
+def FormatCpus(cpus: list):
+    return ",".join(str(cpu) for cpu in cpus)
+
+def main(args):
+    devices = args.devices.split(",")
+    cpus = sorted(os.sched_getaffinity(0))
+    extra_args = []
+    if args.only_mode:
+        extra_args += ["--only-mode", args.only_mode]
+    if args.only_model:
+        extra_args += ["--only-model", args.only_model]
+    configs = ListJobs(args.engine, extra_args + args.benchmark_args)
+    jobs = SplitJobs(configs, len(devices))
+    logger.info(f"[{py_script}] {len(configs)} {args.engine} configs as {len(jobs)} jobs on devices {devices}")
+
+    if args.dry_run:
+        # Every job takes one time unit, print which jobs share the node
+        clock = {"now": 0}
+        running = {}
+        def StartJob(job):
+            running[job.name] = job
+            logger.info(f"[{py_script}] t={clock['now']}: start {job.name} on devices {job.devices}, "
+                        f"port {job.port}, CPUs {job.cpus[0]}-{job.cpus[-1]}, {len(job.tests)} tests")
+        def PollFinished():
+            clock["now"] += 1
+            finished = list(running.values())
+            running.clear()
+            return finished
+        Schedule(jobs, devices, cpus, args.base_port, StartJob, PollFinished)
+        return
+
+    benchmark = ["./benchmark.sh", "--engine", args.engine, "--model-dir", args.model_dir, "--out-dir", args.out_dir]
+    # The jobs share one night of --adaptive-budget, counted from here
+    start = int(time.time())
+    # Dependencies (unless --skip-setup) and the system tuning, once for all jobs
+    subprocess.run(benchmark + args.benchmark_args + ["--setup-only"] + (["--skip-setup"] if args.skip_setup else []), check=True)
+    log_dir = os.path.join(args.out_dir, "scheduler_logs")
+    os.makedirs(log_dir, exist_ok=True)
+    processes = {}
+    failed = []
+
+    def StartJob(job):
+        env = dict(os.environ)
+        if not job.exclusive:
+            env["HIP_VISIBLE_DEVICES"] = ",".join(job.devices)
+        cmd = ["taskset", "-c", FormatCpus(job.cpus)] + benchmark + args.benchmark_args + \
+              ["--config", str(job.index), "--port", str(job.port), "--skip-setup", "--skip-tuning", "--adaptive-start", str(start)]
+        if job.shard is not None:
+            cmd += ["--only-tests", ",".join(job.tests), "--shard", str(job.shard)]
+        log_file = open(os.path.join(log_dir, f"{args.engine}_{job.name}.log"), "w")
+        logger.info(f"[{py_script}] Start {job.name} on devices {job.devices}, port {job.port}")
+        processes[job.name] = (job, subprocess.Popen(cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT), log_file, time.time())
+
+    def PollFinished():
+        while True:
+            finished = []
+            for name, (job, process, log_file, start) in list(processes.items()):
+                if process.poll() is None:
+                    continue
+                log_file.close()
+                del processes[name]
+                finished.append(job)
+                if process.returncode != 0:
+                    failed.append(job.name)
+                logger.info(f"[{py_script}] {job.name} finished with code {process.returncode} in {time.time() - start:.0f}s")
+            if finished:
+                return finished
+            time.sleep(5)
+
+    try:
+        Schedule(jobs, devices, cpus, args.base_port, StartJob, PollFinished)
+    finally:
+        subprocess.run(benchmark + args.benchmark_args + ["--reset-tuning"])
+    if failed:
+        logger.error(f"[{py_script}] Failed jobs: {failed}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run benchmark.sh configs concurrently on disjoint GPU sets")
+    parser.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    parser.add_argument("--model-dir", type=str, required=True)
+    parser.add_argument("--out-dir", type=str, required=True)
+    parser.add_argument("--devices", type=str, default="0,1,2,3,4,5,6,7", help="GPU ids of the node (a simulated list with --dry-run)")
+    parser.add_argument("--base-port", type=int, default=8123, help="Job port = base port + position of its first GPU")
+    parser.add_argument("--only-mode", type=str, default=None, choices=["ray", "standalone"])
+    parser.add_argument("--only-model", type=str, default=None)
+    parser.add_argument("--skip-setup", action="store_true", help="Dependencies are already installed, the system tuning is still applied")
+    parser.add_argument("--dry-run", action="store_true", help="Print the placement without running anything")
+    parser.add_argument("benchmark_args", nargs=argparse.REMAINDER, help="-- followed by extra benchmark.sh args, e.g., -- --client builtin")
+    args = parser.parse_args()
+    if args.benchmark_args and args.benchmark_args[0] == "--":
+        args.benchmark_args = args.benchmark_args[1:]
+
+    main(args)
+
+
+'''
+python3 Scheduler.py --engine vLLM --model-dir /data/huggingface/hub/ --out-dir Result/2025-08-18
+python3 Scheduler.py --engine vLLM --model-dir /data/huggingface/hub/ --out-dir /tmp/out --devices 0,1,2,3 --dry-run
+'''
@@ -3,52 +3,45 @@ import json
 import os
 from datetime import datetime
 import argparse
-from utils import setup_logger, bench_types, models, overview_files, log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, \
-    csv_row_overview_Acc, csv_row_overview_8B_70B, csv_row_overview_Scout
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from utils import setup_logger, bench_types, models, log_files_prefix_Llama_8B_70B, log_file_prefix_Llama4_Scout, \
+    metric_mapping, plot_groups_Acc, plot_models_Perf
+from result_store import OpenStore, LoadHistory, DEFAULT_DB, ACCURACY_CONFIG, ACCURACY_METRIC
 import shutil
 import logging
 import sys
-import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use("Agg") # Figures are rendered in worker processes without a display
 import matplotlib.pyplot as plt
 
 py_script = os.path.basename(sys.argv[0])
 logger = setup_logger("save_overview_logger")
 
-START=0
-END=1
-
-def Plot_Accuracy(df: pd.DataFrame, title, csv_row_mapping: dict, out_dir: str):
-    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-    axes = axes.flatten()  
-    fig.suptitle(title, fontsize=20, y=1.0) 
-    dates = df.iloc[0, 2:].dropna().tolist()
- 
-    plot_index = 0
-    for group_title, model_dict in csv_row_mapping.items():
-        for model, row in model_dict.items(): # E.g., "meta-llama_Llama-3.1-8B-Instruct": 3,
-            # Get values
-            values = df.iloc[row, 2:].astype(float).tolist()
-            ax = axes[plot_index]
-            ax.plot(dates, values, marker='o')
-            
-            # Setting figure
-            ax.set_title(f"{group_title}\n{model}")
-            ax.set_ylabel("Accuracy")
-            ax.set_xlabel("Date")
-            ax.set_ylim(0, 1)
-            ax.grid(True)
-            ax.tick_params(axis='x', rotation=-45)
-            plot_index += 1
-    
-    img_name = os.path.join(out_dir, title + ".jpg")
-    logger.info(f"[{py_script}] Saving {img_name}.")
-    axes[5].set_visible(False) # Hide figure 6 as it is empty
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    plt.savefig(img_name, dpi=300)
-    plt.close()
-
-def Plot_Benchmark(df: pd.DataFrame, title: str, csv_row_mapping: dict, out_dir: str):
-    dates = df.iloc[0, 2:].dropna().tolist()
+# Bump it when the drawing code changes so every figure is redrawn once
+FIGURE_VERSION = 1
+MANIFEST_FILE = ".figure_manifest.json" # Saved in --out-dir, {image: fingerprint}
+
+def GetValues(history: dict, key: tuple, dates: list):
+    # Missing dates become NaN so every series lines up with the date axis
+    series = history.get(key, {})
+    return [np.nan if series.get(d) is None else series[d] for d in dates]
+
+def CollectAccuracy(store, title, plot_groups: dict):
+    engines = [group["engine"] for group in plot_groups.values()]
+    dates, history = LoadHistory(store, engines, models, [ACCURACY_METRIC])
+    panels = []
+    for group_title, group in plot_groups.items():
+        for model in group["models"]:
+            values = GetValues(history, (group["engine"], model, ACCURACY_CONFIG, ACCURACY_METRIC), dates)
+            panels.append({"title": f"{group_title}\n{model}", "values": values})
+    return [{"kind": "accuracy", "title": title, "dates": dates, "panels": panels}]
+
+def CollectBenchmark(store, title: str, model: str):
+    tput = metric_mapping["tput"]
+    ttft = metric_mapping["ttft"]
+    dates, history = LoadHistory(store, bench_types, [model], [tput, ttft])
     if "Scout" in title:
         benchmark_labels = log_file_prefix_Llama4_Scout
         plot_row, plot_col = 1, 4
@@ -64,96 +57,152 @@ def Plot_Benchmark(df: pd.DataFrame, title: str, csv_row_mapping: dict, out_dir:
             "SGLang": ["SGLang_ray", "SGLang_standalone"],
         }
 
-    # Go through plot_combinations
+    # One figure per plot_combinations
+    figures = []
     for engine, local_bench_types in plot_combinations.items():
-        fig, axes = plt.subplots(plot_row, plot_col, figsize=(plot_col*6, plot_row*6))
-        axes = axes.flatten()  
-        bench_title = "_".join([title, engine])
-        fig.suptitle(bench_title, fontsize=20, y=1.0) 
-
-        margin = 2000
-        # Go through benchmark configs
-        for i in range(len(benchmark_labels)):
-            # Get data
-            ray_tput_data = None
-            ray_ttft_data = None
-            standalone_tput_data = None
-            standalone_ttft_data = None
-            # Collect data
+        panels = []
+        for label in benchmark_labels:
+            panel = {"label": label}
             for bench_type in local_bench_types:
-                if bench_type not in csv_row_mapping:
-                    logger.warning(f"[{py_script}] Benchmark type '{bench_type}' not found in overview csv. Skipping.")
-                    continue
-
-                tput_rows = csv_row_mapping[bench_type]["tput"]
-                ttft_rows = csv_row_mapping[bench_type]["ttft"]
-
-                tput_values = df.iloc[tput_rows[START] + i, 2:].astype(float).tolist()
-                ttft_values = df.iloc[ttft_rows[START] + i, 2:].astype(float).tolist()
-                
-                if "ray" in bench_type:
-                    ray_tput_data = tput_values
-                    ray_ttft_data = ttft_values
-
-                else:
-                    standalone_tput_data = tput_values
-                    standalone_ttft_data = ttft_values
-
-            # Plot data
-            ax = axes[i]
-            ax_ttft = ax.twinx()
-            ax.plot(dates, ray_tput_data, marker='o', color='tab:orange', label="tput_ray")
-            ax.plot(dates, standalone_tput_data, marker='o', color='tab:blue', label="tput_standalone")
-            ax_ttft.plot(dates, ray_ttft_data, marker='x', linestyle='--', color='tab:orange', label="ttft_ray")   
-            ax_ttft.plot(dates, standalone_ttft_data, marker='x', linestyle='--', color='tab:blue', label="ttft_standalone")                 
-
-            # Set titles and labels
-            tput_max = max(ray_tput_data + standalone_tput_data) + margin
-            tput_min = 0 # max(-100, min(ray_tput_data + standalone_tput_data) - margin)
-            ttft_max = max(ray_ttft_data + standalone_ttft_data) + margin
-            ttft_min = 0 # max(-100, min(ray_ttft_data + standalone_ttft_data) - margin)
-            ax.set_title(benchmark_labels[i], fontsize=12)
-            ax.set_xlabel("Date")
-            ax.set_ylabel("Throughput (tok/s)")
-            ax_ttft.set_ylabel("TTFT (ms)")
-            ax.set_ylim(tput_min, tput_max)
-            ax_ttft.set_ylim(ttft_min, ttft_max)
-            ax.grid(True)
-            ax.tick_params(axis='y')
-            ax_ttft.tick_params(axis='y')
-            ax.tick_params(axis='x', rotation=-45)
-            
-            # Create a combined legend for both lines on the subplot
-            lines_tput, labels_tput = ax.get_legend_handles_labels()
-            lines_ttft, labels_ttft = ax_ttft.get_legend_handles_labels()
-            ax.legend()
-            ax.legend(lines_tput + lines_ttft, labels_tput + labels_ttft, loc='best', fontsize='small')
-
-        img_name = os.path.join(out_dir, bench_title + ".jpg")
-        logger.info(f"[{py_script}] Saving {img_name}.")
-        plt.tight_layout(rect=[0, 0, 1, 0.96])
-        plt.savefig(img_name, dpi=300)
-        plt.close()
+                mode = "ray" if "ray" in bench_type else "standalone"
+                panel[f"{mode}_tput"] = GetValues(history, (bench_type, model, label, tput), dates)
+                panel[f"{mode}_ttft"] = GetValues(history, (bench_type, model, label, ttft), dates)
+            panels.append(panel)
+        figures.append({"kind": "benchmark", "title": "_".join([title, engine]), "dates": dates,
+                        "layout": [plot_row, plot_col], "panels": panels})
+    return figures
+
+def Plot_Accuracy(figure: dict, out_dir: str):
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    axes = axes.flatten()
+    fig.suptitle(figure["title"], fontsize=20, y=1.0)
+    dates = figure["dates"]
+
+    for plot_index, panel in enumerate(figure["panels"]):
+        ax = axes[plot_index]
+        ax.plot(dates, panel["values"], marker='o')
+
+        # Setting figure
+        ax.set_title(panel["title"])
+        ax.set_ylabel("Accuracy")
+        ax.set_xlabel("Date")
+        ax.set_ylim(0, 1)
+        ax.grid(True)
+        ax.tick_params(axis='x', rotation=-45)
+
+    img_name = os.path.join(out_dir, figure["title"] + ".jpg")
+    logger.info(f"[{py_script}] Saving {img_name}.")
+    axes[5].set_visible(False) # Hide figure 6 as it is empty
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    plt.savefig(img_name, dpi=300)
+    plt.close()
 
+def Plot_Benchmark(figure: dict, out_dir: str):
+    plot_row, plot_col = figure["layout"]
+    dates = figure["dates"]
+    fig, axes = plt.subplots(plot_row, plot_col, figsize=(plot_col*6, plot_row*6))
+    axes = axes.flatten()
+    bench_title = figure["title"]
+    fig.suptitle(bench_title, fontsize=20, y=1.0)
+
+    margin = 2000
+    # Go through benchmark configs
+    for i, panel in enumerate(figure["panels"]):
+        # Get data
+        ray_tput_data = panel["ray_tput"]
+        ray_ttft_data = panel["ray_ttft"]
+        standalone_tput_data = panel["standalone_tput"]
+        standalone_ttft_data = panel["standalone_ttft"]
+
+        # Plot data
+        ax = axes[i]
+        ax_ttft = ax.twinx()
+        ax.plot(dates, ray_tput_data, marker='o', color='tab:orange', label="tput_ray")
+        ax.plot(dates, standalone_tput_data, marker='o', color='tab:blue', label="tput_standalone")
+        ax_ttft.plot(dates, ray_ttft_data, marker='x', linestyle='--', color='tab:orange', label="ttft_ray")
+        ax_ttft.plot(dates, standalone_ttft_data, marker='x', linestyle='--', color='tab:blue', label="ttft_standalone")
+
+        # Set titles and labels
+        tput_max = np.nan_to_num(np.nanmax(ray_tput_data + standalone_tput_data + [0])) + margin
+        tput_min = 0 # max(-100, min(ray_tput_data + standalone_tput_data) - margin)
+        ttft_max = np.nan_to_num(np.nanmax(ray_ttft_data + standalone_ttft_data + [0])) + margin
+        ttft_min = 0 # max(-100, min(ray_ttft_data + standalone_ttft_data) - margin)
+        ax.set_title(panel["label"], fontsize=12)
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Throughput (tok/s)")
+        ax_ttft.set_ylabel("TTFT (ms)")
+        ax.set_ylim(tput_min, tput_max)
+        ax_ttft.set_ylim(ttft_min, ttft_max)
+        ax.grid(True)
+        ax.tick_params(axis='y')
+        ax_ttft.tick_params(axis='y')
+        ax.tick_params(axis='x', rotation=-45)
+
+        # Create a combined legend for both lines on the subplot
+        lines_tput, labels_tput = ax.get_legend_handles_labels()
+        lines_ttft, labels_ttft = ax_ttft.get_legend_handles_labels()
+        ax.legend()
+        ax.legend(lines_tput + lines_ttft, labels_tput + labels_ttft, loc='best', fontsize='small')
+
+    img_name = os.path.join(out_dir, bench_title + ".jpg")
+    logger.info(f"[{py_script}] Saving {img_name}.")
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    plt.savefig(img_name, dpi=300)
+    plt.close()
+
+def RenderFigure(job):
+    figure, out_dir = job
+    if figure["kind"] == "accuracy":
+        Plot_Accuracy(figure, out_dir)
+    else:
+        Plot_Benchmark(figure, out_dir)
+    return figure["title"]
+
+def GetFingerprint(figure: dict):
+    # Content of the data behind the figure, NaN included
+    payload = json.dumps([FIGURE_VERSION, figure], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 def main(args):
-    # 讀取 CSV
-    for csv_file in overview_files:
-        df = pd.read_csv(csv_file, header=None)
+    store = OpenStore(args.db)
+    figures = CollectAccuracy(store, "Accuracy", plot_groups_Acc)
+    for title, model in plot_models_Perf.items():
+        figures += CollectBenchmark(store, title, model)
+    store.close()
+
+    # Skip figures whose data didn't change since they were drawn
+    manifest_file = os.path.join(args.out_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_file) and not args.force:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+    jobs = []
+    fingerprints = {}
+    for figure in figures:
+        img_name = figure["title"] + ".jpg"
+        fingerprints[img_name] = GetFingerprint(figure)
+        if manifest.get(img_name) == fingerprints[img_name] and os.path.exists(os.path.join(args.out_dir, img_name)):
+            logger.debug(f"[{py_script}] {img_name} is up to date, skip.")
+            continue
+        jobs.append((figure, args.out_dir))
+
+    if args.workers == 1 or len(jobs) <= 1:
+        list(map(RenderFigure, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(RenderFigure, jobs))
 
-        if csv_file == "overview_accuracy.csv":
-            Plot_Accuracy(df, "Accuracy", csv_row_overview_Acc, args.out_dir)
-        elif csv_file == "overview_perf_8B.csv":
-            Plot_Benchmark(df, "Performance_Llama-8B", csv_row_overview_8B_70B, args.out_dir)
-        elif csv_file == "overview_perf_70B.csv":
-            Plot_Benchmark(df, "Performance_Llama-70B", csv_row_overview_8B_70B, args.out_dir)
-        elif csv_file == "overview_perf_Scout.csv":
-            Plot_Benchmark(df, "Performance_Llama-Scout", csv_row_overview_Scout, args.out_dir)
+    with open(manifest_file, "w") as f:
+        json.dump(fingerprints, f, indent=4)
+    logger.info(f"[{py_script}] Rendered {len(jobs)} of {len(figures)} figures.")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--out-dir", type=str, required=True, help="Path to save the plots.")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of rendering processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="Redraw every figure")
     args = parser.parse_args()
 
     if not os.path.exists(args.out_dir):
@@ -166,4 +215,4 @@ if __name__ == "__main__":
 python Visualize.py --out-dir Result/Figures
 
 
-'''
\ No newline at end of file
+'''
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import aiohttp
+import numpy as np
+from trace_sketch import TraceFromBenchClient, SaveTraceAndSketches, TRACE_SUFFIX
+
+# Same random-dataset workload for every engine: prompts are random token ids sent as a token list,
+# so the input length is exact and no tokenizer is needed. Output length is forced with ignore_eos.
+# The summary uses the labels of `vllm bench serve` so ParseBenchmark.py reads both the log and --result-file.
+
+def GenerateRequests(num_prompts: int, input_len: int, output_len: int, range_ratio: float, vocab_size: int, seed: int):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(num_prompts):
+        # Lengths are uniform in [len*(1-ratio), len*(1+ratio)], like the random dataset of vllm bench serve
+        ilen = max(1, rng.randint(int(input_len * (1 - range_ratio)), int(input_len * (1 + range_ratio))))
+        olen = max(1, rng.randint(int(output_len * (1 - range_ratio)), int(output_len * (1 + range_ratio))))
+        requests.append(([rng.randrange(vocab_size) for _ in range(ilen)], olen))
+    return requests
+
+async def SendRequest(session, url: str, model: str, prompt: list, output_len: int, bench_start: float):
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "max_tokens": output_len,
+        "min_tokens": output_len,
+        "ignore_eos": True,
+        "temperature": 0.0,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    result = {"start": 0.0, "ttft": None, "itl": [], "e2el": None, "input_len": len(prompt), "output_len": 0, "error": ""}
+    start = time.perf_counter()
+    result["start"] = start - bench_start
+    last = start
+    n_chunks = 0
+    try:
+        async with session.post(url, json=payload) as response:
+            if response.status != 200:
+                result["error"] = f"HTTP {response.status}: {(await response.text())[:200]}"
+                return result
+            async for line in response.content:
+                # Server-sent events: b"data: {...}\n"
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                now = time.perf_counter()
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    result["output_len"] = chunk["usage"].get("completion_tokens", 0)
+                if not chunk.get("choices") or not chunk["choices"][0].get("text"):
+                    continue
+                if result["ttft"] is None:
+                    result["ttft"] = now - start
+                else:
+                    result["itl"].append(now - last)
+                last = now
+                n_chunks += 1
+        result["e2el"] = last - start
+        if result["output_len"] == 0:
+            result["output_len"] = n_chunks
+        if result["ttft"] is None:
+            result["error"] = "No token received"
+    except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+        result["error"] = repr(e)
+    return result
+
+async def RunBenchmark(args, requests: list):
+    url = f"http://{args.host}:{args.port}/v1/completions"
+    limit = args.max_concurrency or len(requests)
+    semaphore = asyncio.Semaphore(limit)
+    connector = aiohttp.TCPConnector(limit=limit, force_close=False)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        bench_start = time.perf_counter()
+
+        async def LimitedRequest(prompt, output_len):
+            async with semaphore:
+                return await SendRequest(session, url, args.model, prompt, output_len, bench_start)
+
+        results = await asyncio.gather(*[LimitedRequest(prompt, olen) for prompt, olen in requests])
+        duration = time.perf_counter() - bench_start
+    return results, duration
+
+def Summarize(results: list, duration: float, percentiles: list):
+    ok = [r for r in results if not r["error"]]
+    ttfts = np.array([r["ttft"] for r in ok]) * 1000
+    e2els = np.array([r["e2el"] for r in ok]) * 1000
+    itls = np.array([x for r in ok for x in r["itl"]]) * 1000
+    # TPOT excludes the first token, requests with a single token have no TPOT
+    tpots = np.array([(r["e2el"] - r["ttft"]) / (r["output_len"] - 1) for r in ok if r["output_len"] > 1]) * 1000
+    input_tokens = sum(r["input_len"] for r in ok)
+    output_tokens = sum(r["output_len"] for r in ok)
+
+    summary = {
+        "Successful requests": len(ok),
+        "Failed requests": len(results) - len(ok),
+        "Benchmark duration (s)": duration,
+        "Total input tokens": input_tokens,
+        "Total generated tokens": output_tokens,
+        "Request throughput (req/s)": len(ok) / duration,
+        "Output token throughput (tok/s)": output_tokens / duration,
+        "Total Token throughput (tok/s)": (input_tokens + output_tokens) / duration,
+    }
+    for name, values in [("TTFT", ttfts), ("TPOT", tpots), ("ITL", itls), ("E2EL", e2els)]:
+        if len(values) == 0:
+            continue
+        summary[f"Mean {name} (ms)"] = float(np.mean(values))
+        summary[f"Median {name} (ms)"] = float(np.median(values))
+        for p in percentiles:
+            summary[f"P{p:g} {name} (ms)"] = float(np.percentile(values, p))
+    return summary
+
+def PrintSummary(summary: dict):
+    print("{s:{c}^{n}}".format(s=" Serving Benchmark Result ", n=50, c="="))
+    for label, value in summary.items():
+        if isinstance(value, int):
+            print("{:<40} {:<10}".format(label + ":", value))
+        else:
+            print("{:<40} {:<10.2f}".format(label + ":", value))
+    print("=" * 50)
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming load generator for OpenAI-compatible /v1/completions endpoints")
+    parser.add_argument("--host", type=str, default="localhost")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", type=str, required=True, help="Model name sent in the request")
+    parser.add_argument("--dataset-name", type=str, default="random", choices=["random"])
+    parser.add_argument("--num-prompts", type=int, required=True)
+    parser.add_argument("--random-input-len", type=int, required=True)
+    parser.add_argument("--random-output-len", type=int, required=True)
+    parser.add_argument("--random-range-ratio", type=float, default=0.0, help="Lengths are drawn from [len*(1-r), len*(1+r)]")
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--vocab-size", type=int, default=128000, help="Random token ids are drawn from [0, vocab-size)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--percentiles", type=float, nargs="+", default=[99])
+    parser.add_argument("--timeout", type=float, default=7200, help="Timeout of each request in seconds")
+    parser.add_argument("--result-file", type=str, default=None, help="Save the summary and per-request timings to this JSON file")
+    parser.add_argument("--trace-file", type=str, default=None,
+                        help=f"Save the per-request timings to this {TRACE_SUFFIX} trace and its latency sketches instead (see trace_sketch.py)")
+    args = parser.parse_args()
+
+    requests = GenerateRequests(args.num_prompts, args.random_input_len, args.random_output_len,
+                                args.random_range_ratio, args.vocab_size, args.seed)
+    results, duration = asyncio.run(RunBenchmark(args, requests))
+    summary = Summarize(results, duration, args.percentiles)
+    PrintSummary(summary)
+    for r in results:
+        if r["error"]:
+            print(f"Request failed: {r['error']}", file=sys.stderr)
+            break
+
+    if args.trace_file:
+        SaveTraceAndSketches(args.trace_file, TraceFromBenchClient(results))
+    if args.result_file:
+        result = {
+            "client": "bench_client",
+            "config": {k: v for k, v in vars(args).items() if k not in ("result_file", "trace_file")},
+            "summary": summary,
+        }
+        if not args.trace_file:
+            result["requests"] = results
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+
+if __name__ == "__main__":
+    main()
+
+'''
+python bench_client.py --host localhost --port 8123 --model /data/huggingface/hub/meta-llama/Llama-3.1-8B-Instruct \
+    --num-prompts 3000 --random-input-len 32 --random-output-len 32 --max-concurrency 16 \
+    --result-file Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter1.json \
+    --trace-file Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter1.trace.npz
+'''
@@ -4,6 +4,7 @@ set -x
 # Sample cmd:
 # ./benchmark.sh --engine vLLM   --model-dir /data/huggingface/hub --out-dir Result/{Date}
 # ./benchmark.sh --engine SGLang --model-dir /data/huggingface/hub --out-dir Result/{Date}
+# ./benchmark.sh --engine vLLM   --model-dir /data/huggingface/hub --out-dir Result/{Date} --accuracy before # No separate accuracy server
 
 while [[ "$#" -gt 0 ]]; do
     case "$1" in
@@ -23,11 +24,123 @@ while [[ "$#" -gt 0 ]]; do
             out_dir=$2
             shift 2
             ;;
+        --only-mode)
+            only_mode=$2
+            shift 2
+            ;;
+        --only-model)
+            only_model=$2
+            shift 2
+            ;;
+        --only-tests)
+            only_tests=$2
+            shift 2
+            ;;
+        --client)
+            if [[ "$2" != "engine" && "$2" != "builtin" ]]; then
+                echo "Error: Invalid value for --client. Choices are [engine, builtin]."
+                exit 1
+            fi
+            client=$2
+            shift 2
+            ;;
+        --mock)
+            mock=true
+            shift 1
+            ;;
+        --adaptive)
+            adaptive=true
+            shift 1
+            ;;
+        --adaptive-budget)
+            adaptive_budget=$2
+            shift 2
+            ;;
+        --adaptive-start)
+            adaptive_start=$2
+            shift 2
+            ;;
+        --list-configs)
+            list_configs=true
+            shift 1
+            ;;
+        --config)
+            only_config=$2
+            shift 2
+            ;;
+        --port)
+            server_port=$2
+            shift 2
+            ;;
+        --skip-setup)
+            skip_setup=true
+            shift 1
+            ;;
+        --setup-only)
+            setup_only=true
+            shift 1
+            ;;
+        --skip-tuning)
+            skip_tuning=true
+            shift 1
+            ;;
+        --reset-tuning)
+            reset_tuning=true
+            shift 1
+            ;;
+        --shard)
+            shard=$2
+            shift 2
+            ;;
+        --checkpoint)
+            checkpoint=$2
+            shift 2
+            ;;
+        --max-retries)
+            max_retries=$2
+            shift 2
+            ;;
+        --accuracy)
+            if [[ "$2" != "before" && "$2" != "after" ]]; then
+                echo "Error: Invalid value for --accuracy. Choices are [before, after]."
+                exit 1
+            fi
+            accuracy=$2
+            shift 2
+            ;;
         --help)
             echo "Usage: $0 [OPTIONS]"
             echo "Options:"
             echo "   --engine         (required) choices=[vLLM, SGLang]"
             echo "   --model-dir      (required) path to the folder of the model"
+            echo "   --only-mode      (optional) only run this deployment mode, choices=[ray, standalone]"
+            echo "   --only-model     (optional) only run this model, e.g., meta-llama_Llama-3.1-8B-Instruct"
+            echo "   --only-tests     (optional) comma separated tests to run, e.g., i32_o32_c16_p3000,i128_o128_c256_p3000"
+            echo "   --client         (optional) load generator, choices=[engine, builtin] (default: engine)"
+            echo "                    engine: vllm bench serve / sglang.bench_serving, builtin: bench_client.py for both engines"
+            echo "   --mock           (optional) serve every config with mock_server.py instead of the engine, no GPU needed."
+            echo "                    Uses the builtin client by default. Extra mock_server.py args can be given in \$MOCK_SERVER_ARGS"
+            echo "   --adaptive       (optional) repeat each test in short rounds with AdaptiveRunner.py until throughput and TTFT converge."
+            echo "                    The rounds are saved as a config of their own, e.g., i32_o32_c16_p600 for i32_o32_c16_p3000."
+            echo "                    Extra AdaptiveRunner.py args can be given in \$ADAPTIVE_ARGS"
+            echo "   --adaptive-budget (optional) seconds of adaptive rounds for the whole night, each test gets what is left (default: 10800)"
+            echo "   --adaptive-start (optional) epoch seconds the budget counts from, Scheduler.py passes its own start (default: now)"
+            echo "                    The GPU power, clocks and temperature are sampled during every test, extra telemetry.py record args"
+            echo "                    can be given in \$TELEMETRY_ARGS"
+            echo "   --list-configs   (optional) print 'index ray_enable model tp tests' of every selected config and exit"
+            echo "   --config         (optional) only run the config with this index (see --list-configs)"
+            echo "   --port           (optional) server port (default: 8123)"
+            echo "   --skip-setup     (optional) skip installing dependencies"
+            echo "   --setup-only     (optional) only install dependencies (unless --skip-setup) and apply the system tuning, then exit"
+            echo "   --skip-tuning    (optional) leave NUMA balancing and the CPU governor alone, e.g., when Scheduler.py manages them"
+            echo "   --reset-tuning   (optional) only reset the CPU governor to performance and exit"
+            echo "   --shard          (optional) index of this job among the jobs running the tests of one config side by side."
+            echo "                    Its server state, logs, startup and telemetry files go to <result folder>/shard<index>"
+            echo "   --checkpoint     (optional) checkpoint file. Finished runs are recorded there and skipped, bad runs are retried"
+            echo "   --max-retries    (optional) retries of a crashed or truncated run when --checkpoint is given (default: 2)"
+            echo "   --accuracy       (optional) also run the gsm8k accuracy test on the server of each standalone config, choices=[before, after]"
+            echo "                    before: right after the launch, before the warmup. after: after the performance tests."
+            echo "                    The score is saved to <out-dir>/Result.json by RecordAccuracy.py"
             exit 0
             ;;
         *)
@@ -38,16 +151,42 @@ while [[ "$#" -gt 0 ]]; do
 done
 
 
+if [[ "$mock" == "true" ]]; then
+    client=${client:-builtin}
+fi
+if [[ "$mock" == "true" || "$list_configs" == "true" ]]; then
+    skip_setup=true
+    skip_tuning=true
+fi
+if [[ "$reset_tuning" == "true" ]]; then
+    [[ "$skip_tuning" != "true" ]] && cpupower frequency-set -g performance
+    exit 0
+fi
+
 # Dependencies
-pip install xgrammar==0.1.11 pynvml==12.0.0 botocore datasets
-apt-get update
-apt-get install -y jq
-apt install -y linux-tools-common linux-tools-$(uname -r)
-source ./utils.sh
+if [[ "$skip_setup" != "true" ]]; then
+    pip install xgrammar==0.1.11 pynvml==12.0.0 botocore datasets
+    apt-get update
+    apt-get install -y jq
+    apt install -y linux-tools-common linux-tools-$(uname -r)
+fi
+
+# System tuning, reset at the end. Scheduler.py applies it once around all of its jobs.
+cpu_mode="schedutil"
+if [[ "$skip_tuning" != "true" ]]; then
+    sysctl kernel.numa_balancing=0
+    cpupower frequency-set -g $cpu_mode
+fi
+if [[ "$setup_only" == "true" ]]; then
+    exit 0
+fi
+
+# Every adaptive test gets what is left of the night's budget
+adaptive_deadline=$(( ${adaptive_start:-$(date +%s)} + ${adaptive_budget:-10800} ))
 
 # Export environment variables
 # General variables
-export SERVER_PORT=8123
+export SERVER_PORT=${server_port:-8123}
 export TORCH_BLAS_PREFER_HIPBLASLT=1
 export NCCL_MIN_NCHANNELS=112
 export HIP_FORCE_DEV_KERNARG=1
@@ -71,7 +210,6 @@ export VLLM_ROCM_USE_AITER_RMSNORM=0
 export RAYLLM_ROUTER_HTTP_TIMEOUT=7200 # 2 hour. Default=600 second
 export RAY_CGRAPH_submit_timeout=120 # default 10 sec
 export RAY_CGRAPH_get_timeout=120 # default 10 sec
-sysctl kernel.numa_balancing=0
 
 
 # 1. Llama 8B/70B benchmark
@@ -81,13 +219,12 @@ sysctl kernel.numa_balancing=0
 
 
 # Ray settings
-cpu_mode="schedutil"
 n_iter=1
+max_retries=${max_retries:-2}
 llm_replica=1
 router_replica=16   # need to update ray_engine.py
-total_cpu_cores=num_cpus=$(lscpu | grep '^CPU(s):' | awk '{print $2}')
+total_cpu_cores=$(nproc) # CPUs this process may run on, a CPU set under Scheduler.py
 remaining_cpu_core=$((total_cpu_cores - router_replica))
-cpupower frequency-set -g $cpu_mode 
 
 echo "The total number of CPU core on this system is: $total_cpu_cores"
 
@@ -183,24 +320,22 @@ elif [[ "$engine" == "SGLang" ]]; then
 fi
 
 echo "models_configs=$models_configs"
-for config in "${models_configs[@]}"; do
-    engine=$(echo "$config" | awk '{print $1}')
-    if [[ "$engine" == "vLLM" ]]; then
-        IFS=' ' read -r _ ray_enable model_name dtype tp quant_type kv_type max_model_len batched_tokens llm_replica<<< "$config"
-    elif [[ "$engine" == "SGLang" ]]; then
-        IFS=' ' read -r _ ray_enable model_name dtype tp max_model_len kv_type<<< "$config"   
-    fi
-    echo "llm_replica is $llm_replica"
-    deployment_mode=$([[ "$ray_enable" == "true" ]] && echo "ray" || echo "standalone")
-    result_folder=$out_dir/${engine}_${deployment_mode}/${model_name/\//_}
-    cpu_core_per_llm_replica=$((remaining_cpu_core / llm_replica))
-    
-    model_path="${model_dir}${model_name}"
-	mkdir -p $result_folder
-    echo "Launching $engine with config: $config"
 
-    if [[ "$ray_enable" == "true" ]]; then
+launch_server() {
+    # Uses the variables of the current config. server_lifecycle.py starts the server in its own process group
+    # and returns once it serves requests. The server output goes to server.log, its startup phases to startup.json
+    state_file="${server_folder}/server_lifecycle.json"
+    server_log="${server_folder}/server.log"
+    lifecycle_args="--state-file $state_file --port $SERVER_PORT --log-file $server_log"
+    if [[ "$ray_enable" == "true" && "$mock" != "true" ]]; then
+        lifecycle_args="$lifecycle_args --ray --ray-api http://localhost:8265/api/serve/applications/ --deployment-prefix $engine"
+    fi
+    if [[ "$mock" == "true" ]]; then
+        python server_lifecycle.py start $lifecycle_args -- \
+            python mock_server.py --port $SERVER_PORT --model ${model_path} --max-model-len "$max_model_len" $MOCK_SERVER_ARGS
+    elif [[ "$ray_enable" == "true" ]]; then
         if [[ "$engine" == "vLLM" ]]; then
+            python server_lifecycle.py start $lifecycle_args -- \
             python ray_engine.py \
                 --engine $engine \
                 --port $SERVER_PORT \
@@ -214,8 +349,9 @@ for config in "${models_configs[@]}"; do
                 --quant_type "$quant_type" \
                 --kv_type "$kv_type" \
                 --max_model_len "$max_model_len" \
-                --max_num_batched_tokens "$batched_tokens" &
+                --max_num_batched_tokens "$batched_tokens"
         elif [[ "$engine" == "SGLang" ]]; then
+            python server_lifecycle.py start $lifecycle_args -- \
             python ray_engine.py \
                 --engine $engine \
                 --port $SERVER_PORT \
@@ -226,20 +362,22 @@ for config in "${models_configs[@]}"; do
                 --llm_replica $llm_replica \
                 --router_replica $router_replica \
                 --tp $tp \
-                --max_model_len "$max_model_len" & \
+                --max_model_len "$max_model_len"
         fi
     elif [[ "$ray_enable" == "false" ]]; then # It was used to compare with ray+vllm
         if [[ "$engine" == "vLLM" ]]; then
+            python server_lifecycle.py start $lifecycle_args -- \
             vllm serve ${model_path} --swap-space 16 --disable-log-requests --port $SERVER_PORT \
                 --tensor-parallel-size $tp --distributed-executor-backend mp \
                 --dtype "$dtype" --gpu-memory-utilization 0.9 --no-enable-chunked-prefill \
                 --max-model-len "$max_model_len" --max-num-batched-tokens "$batched_tokens" \
                 --max-num-seqs 512  \
                 --compilation-config '{"full_cuda_graph": false}' \
-                --kv-cache-dtype "$kv_type" --no-enable-prefix-caching --uvicorn-log-level warning & 
+                --kv-cache-dtype "$kv_type" --no-enable-prefix-caching --uvicorn-log-level warning
                 # --quantization "$quant_type"
                 # --max-seq-len-to-capture $max_model_len # Deprecated in vLLM 0.11
         elif [[ "$engine" == "SGLang" ]]; then
+            python server_lifecycle.py start $lifecycle_args -- \
             python -m sglang.launch_server --port $SERVER_PORT \
                 --model-path ${model_path} \
                 --dtype $dtype \
@@ -250,40 +388,154 @@ for config in "${models_configs[@]}"; do
                 --disable-radix-cache  \
                 --context-length  $max_model_len \
                 --kv-cache-dtype  $kv_type \
-                --log-level "warning" &
+                --log-level "info" --decode-log-interval 100000 # info: load and graph capture phases for startup_phases.py
         fi
     fi
+    local status=$?
+    if [[ $status -ne 0 ]]; then
+        tail -n 100 $server_log
+        return $status
+    fi
+    python startup_phases.py --engine $engine $([[ "$ray_enable" == "true" && "$mock" != "true" ]] && echo "--ray") \
+        --log-file $server_log --state-file $state_file --out-json ${server_folder}/startup.json
+    return 0
+}
+
+run_accuracy() {
+    # gsm8k on the running server of the current config, the same tests main.sh runs on a server of its own
+    echo "--------------------------- $engine Accuracy Test ------------------------------------"
+    if [[ "$mock" == "true" ]]; then
+        echo "The mock server has no accuracy, skip."
+        return 0
+    fi
+    local model_name_str=${model_name/\//_}
+    if [[ "$engine" == "vLLM" ]]; then
+        local output=$(evalscope eval \
+            --model $model_path \
+            --api-url http://localhost:${SERVER_PORT}/v1 \
+            --api-key EMPTY \
+            --eval-type openai_api \
+            --datasets gsm8k \
+            --limit 50 2>&1)
+        local report_path=$(echo "$output" | grep "Dump report to:" | awk '{print $NF}')
+        echo "The report file is located at: $report_path"
+        [[ -n "$report_path" ]] && python RecordAccuracy.py --engine vLLM --model $model_name_str --acc-path $report_path --out-json $accuracy_json
+    elif [[ "$engine" == "SGLang" ]]; then
+        local output=$(python3 -m sglang.test.few_shot_gsm8k --num-questions 200 --parallel 200 \
+            --host http://127.0.0.1 --port $SERVER_PORT)
+        local acc=$(echo "$output" | grep "Accuracy:" | awk '{print $2}')
+        [[ -n "$acc" ]] && python RecordAccuracy.py --engine SGLang --model $model_name_str --acc $acc --out-json $accuracy_json
+    fi
+    local status=$?
+    if [[ -n "$checkpoint" && $status -eq 0 ]]; then
+        python checkpoint.py --checkpoint $checkpoint mark "$accuracy_unit"
+    fi
+    echo "------------------------------------------------------------------------"
+    return $status
+}
 
-    # Wait for server to be ready
-    echo "Waiting for the server to be ready..."
-    if [[ "$ray_enable" == "true" ]]; then
-        api_url="http://localhost:8265/api/serve/applications/"
-        echo "Checking replica status..."
-        while true; do
-            sleep 5
-            set +x
-            if check_replicas_status $api_url $engine; then
-                echo "All replicas are RUNNING."
-                set -x
-                break
-            fi
-        done
-    else 
-        server_url="http://localhost:${SERVER_PORT}"
-        server_launch_time=0
-        while ! curl -s "$server_url" > /dev/null; do
-            sleep 5
-            server_launch_time=$((server_launch_time + 5))
-            echo "Waiting for ${model_name} launch... ${server_launch_time}s"
+accuracy_json=$out_dir/Result.json
+config_index=-1
+for config in "${models_configs[@]}"; do
+    config_index=$((config_index + 1))
+    engine=$(echo "$config" | awk '{print $1}')
+    if [[ "$engine" == "vLLM" ]]; then
+        IFS=' ' read -r _ ray_enable model_name dtype tp quant_type kv_type max_model_len batched_tokens llm_replica<<< "$config"
+    elif [[ "$engine" == "SGLang" ]]; then
+        IFS=' ' read -r _ ray_enable model_name dtype tp max_model_len kv_type<<< "$config"   
+    fi
+    echo "llm_replica is $llm_replica"
+    deployment_mode=$([[ "$ray_enable" == "true" ]] && echo "ray" || echo "standalone")
+    if [[ -n "$only_mode" && "$deployment_mode" != "$only_mode" ]] || [[ -n "$only_model" && "${model_name/\//_}" != "$only_model" ]] \
+        || [[ -n "$only_config" && "$config_index" != "$only_config" ]]; then
+        echo "Skip $config"
+        continue
+    fi
+    if [[ "$model_name" == "meta-llama/Llama-3.1-8B-Instruct" ]] || [[ "$model_name" == "meta-llama/Llama-3.3-70B-Instruct" ]]; then
+        TESTS=("${TESTS_8B_70B[@]}")
+    elif [[ "$model_name" == "meta-llama/Llama-4-Scout-17B-16E-Instruct" ]]; then
+        TESTS=("${TESTS_Scout[@]}")
+    fi
+    test_names=()
+    for test in "${TESTS[@]}"; do
+        IFS=' ' read -r ilen olen concurrency num_prompts <<< "$test"
+        test_name="i${ilen}_o${olen}_c${concurrency}_p${num_prompts}"
+        if [[ -n "$only_tests" && ",$only_tests," != *",${test_name},"* ]]; then
+            continue
+        fi
+        test_names+=("$test_name")
+    done
+    if [[ "$list_configs" == "true" ]]; then
+        echo "CONFIG $config_index $ray_enable $model_name $tp $(IFS=,; echo "${test_names[*]}")"
+        continue
+    fi
+    result_folder=$out_dir/${engine}_${deployment_mode}/${model_name/\//_}
+    # Files of this job's server. Jobs of the same config (Scheduler.py shards) share result_folder but not these.
+    server_folder=$result_folder${shard:+/shard$shard}
+    cpu_core_per_llm_replica=$((remaining_cpu_core / llm_replica))
+    
+    model_path="${model_dir}${model_name}"
+	mkdir -p $result_folder $server_folder
+
+    # One checkpoint unit per run, e.g., vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000/iter1
+    units=()
+    for test_name in "${test_names[@]}"; do
+        if [[ "$adaptive" == "true" ]]; then
+            units+=("${engine}_${deployment_mode}/${model_name/\//_}/${test_name}/adaptive")
+        else
+            for i in $(seq 1 $n_iter); do
+                units+=("${engine}_${deployment_mode}/${model_name/\//_}/${test_name}/iter${i}")
+            done
+        fi
+    done
+    # Accuracy runs on the standalone server of the model, same stage name as main.sh uses for a server of its own.
+    # Of the shards of a config only the first one runs it.
+    accuracy_unit=""
+    if [[ -n "$accuracy" && "$ray_enable" == "false" && "${shard:-0}" == "0" ]]; then
+        accuracy_unit="stage/accuracy/${engine}/${model_name/\//_}"
+        if [[ -n "$checkpoint" ]] && python checkpoint.py --checkpoint $checkpoint is-done "$accuracy_unit"; then
+            accuracy_unit=""
+        fi
+    fi
+    if [[ -z "$accuracy_unit" && -n "$checkpoint" ]] && python checkpoint.py --checkpoint $checkpoint is-done "${units[@]}"; then
+        echo "All tests of $config are done, skip."
+        continue
+    fi
+
+    echo "Launching $engine with config: $config"
+    state_file="${server_folder}/server_lifecycle.json"
+    if ! launch_server; then
+        echo "Error: the server of $config failed to start, skip it."
+        for unit in "${units[@]}"; do
+            [[ -n "$checkpoint" ]] && python checkpoint.py --checkpoint $checkpoint mark "$unit" --failed --reason "server failed to start"
         done
+        continue
     fi
 
 
+    # Hardware telemetry until the server stops, summarized per test by the windows in telemetry_windows.tsv.
+    # Scheduler.py pins a standalone config to its GPUs with HIP_VISIBLE_DEVICES, Ray spreads over all of them.
+    if [[ "$ray_enable" == "true" ]]; then
+        telemetry_devices="all"
+    else
+        telemetry_devices=${HIP_VISIBLE_DEVICES:-$(seq -s, 0 $((tp - 1)))}
+    fi
+    python telemetry.py record --out "${server_folder}/telemetry_$(date +%s).npz" --devices $telemetry_devices \
+        $([[ "$mock" == "true" ]] && echo "--source fake") $TELEMETRY_ARGS &
+    telemetry_pid=$!
+
+    if [[ -n "$accuracy_unit" && "$accuracy" == "before" ]]; then
+        run_accuracy || echo "Warning: the accuracy test of $model_name failed."
+    fi
+
     # Warmup
     common_args="--host 127.0.0.1 --port $SERVER_PORT --model ${model_path} \
                     --dataset-name random --num-prompts 100 \
                     --random-input-len 128 --random-output-len 128 --random-range-ratio 0"
-    if [[ "$engine" == "vLLM" ]]; then        
+    if [[ "$client" == "builtin" ]]; then
+        bench_cmd="python bench_client.py"
+        specific_args=""
+    elif [[ "$engine" == "vLLM" ]]; then        
         bench_cmd="vllm bench serve --backend openai --random-range-ratio 0 --ignore-eos" 
         specific_args="--percentile-metrics ttft,tpot,itl,e2el"
     elif [[ "$engine" == "SGLang" ]]; then
@@ -291,45 +543,113 @@ for config in "${models_configs[@]}"; do
         specific_args=""
     fi
     $bench_cmd $common_args $specific_args        
-    
-    if [[ "$model_name" == "meta-llama/Llama-3.1-8B-Instruct" ]] || [[ "$model_name" == "meta-llama/Llama-3.3-70B-Instruct" ]]; then
-        TESTS=("${TESTS_8B_70B[@]}")
-    elif [[ "$model_name" == "meta-llama/Llama-4-Scout-17B-16E-Instruct" ]]; then
-        TESTS=("${TESTS_Scout[@]}")
-    fi
 
-    for test in "${TESTS[@]}"; do
-        IFS=' ' read -r ilen olen concurrency num_prompts <<< "$test"
-        
-        for i in $(seq 1 $n_iter); do
-            # Define the benchmark file path
-            benchmark_file="${result_folder}/i${ilen}_o${olen}_c${concurrency}_p${num_prompts}_iter${i}.log"
-
-            # Run the benchmark and capture the output in a log file
-            $bench_cmd  \
-                --host localhost \
-                --port $SERVER_PORT \
-                --model $model_path \
-                --dataset-name random \
-                --num-prompts $num_prompts \
-                --random-input-len "$ilen" \
-                --random-output-len "$olen" \
-                --max-concurrency "$concurrency" \
-                $specific_args \
-                2>&1 | tee "${benchmark_file}"
-        done  
+    for unit in "${units[@]}"; do
+        IFS='/' read -r _ _ test_name run <<< "$unit"
+        IFS=' ' read -r ilen olen concurrency num_prompts <<< "$(echo $test_name | sed 's/[iocp]//g; s/_/ /g')"
+        if [[ -n "$checkpoint" ]] && python checkpoint.py --checkpoint $checkpoint is-done "$unit"; then
+            echo "$unit is done, skip."
+            continue
+        fi
+
+        # A crashed or truncated run is retried up to $max_retries times, on a restarted server if it died
+        for attempt in $(seq 0 $max_retries); do
+            run_start=$(date +%s.%N)
+            if [[ "$run" == "adaptive" ]]; then
+                result_flag=$([[ "$client" == "builtin" ]] && echo "--result-file" || echo "")
+                result_file="${result_folder}/${test_name}_adaptive.json"
+                adaptive_left=$(( adaptive_deadline - $(date +%s) ))
+                (( adaptive_left < 0 )) && adaptive_left=0 # Out of budget, a single round
+                python AdaptiveRunner.py \
+                    --log-prefix "${result_folder}/${test_name}" \
+                    --num-prompts $num_prompts \
+                    --concurrency $concurrency \
+                    $result_flag $ADAPTIVE_ARGS --max-time $adaptive_left -- \
+                    $bench_cmd \
+                    --host localhost \
+                    --port $SERVER_PORT \
+                    --model $model_path \
+                    --dataset-name random \
+                    --random-input-len "$ilen" \
+                    --random-output-len "$olen" \
+                    --max-concurrency "$concurrency" \
+                    $specific_args
+            else
+                # Define the benchmark file path
+                benchmark_file="${result_folder}/${test_name}_${run}.log"
+                result_file=$([[ "$client" == "builtin" ]] && echo "${benchmark_file%.log}.json" || echo "$benchmark_file")
+                # Per-request timings go to a trace and its latency sketches (trace_sketch.py). The engine clients
+                # save them as JSON first, which is converted after the run.
+                trace_file="${benchmark_file%.log}.trace.npz"
+                detail_file="${benchmark_file%.log}.detail.jsonl"
+                if [[ "$client" == "builtin" ]]; then
+                    result_args="--result-file ${benchmark_file%.log}.json --trace-file $trace_file"
+                elif [[ "$engine" == "vLLM" ]]; then
+                    result_args="--save-result --save-detailed --result-dir $result_folder --result-filename $(basename $detail_file)"
+                else
+                    result_args="--output-file $detail_file --output-details"
+                fi
+                # A stale result would hide a failed run
+                rm -f "${benchmark_file%.log}.json" "$trace_file" "${benchmark_file%.log}.sketch.json" "$detail_file"
+
+                # Run the benchmark and capture the output in a log file
+                $bench_cmd  \
+                    --host localhost \
+                    --port $SERVER_PORT \
+                    --model $model_path \
+                    --dataset-name random \
+                    --num-prompts $num_prompts \
+                    --random-input-len "$ilen" \
+                    --random-output-len "$olen" \
+                    --max-concurrency "$concurrency" \
+                    $specific_args $result_args \
+                    2>&1 | tee "${benchmark_file}"
+                if [[ -f "$detail_file" ]]; then
+                    python trace_sketch.py convert --input "$detail_file" --trace "$trace_file" --remove-input \
+                        || echo "Warning: the per-request timings of $benchmark_file couldn't be converted."
+                fi
+            fi
+
+            run_end=$(date +%s.%N)
+            if [[ -z "$checkpoint" ]] || python checkpoint.py --checkpoint $checkpoint validate "$unit" --result "$result_file"; then
+                printf "%s\t%s\t%s\t%s\n" "$test_name" "$run" "$run_start" "$run_end" >> "${server_folder}/telemetry_windows.tsv"
+                break
+            fi
+            if [[ $attempt -lt $max_retries ]] && ! curl -sf "http://localhost:${SERVER_PORT}/v1/models" > /dev/null; then
+                echo "The server of $config is down, restarting it."
+                python server_lifecycle.py stop --state-file $state_file $([[ "$ray_enable" == "true" && "$mock" != "true" ]] && echo "--ray")
+                launch_server || break
+            fi
+        done
     done
 
+    if [[ -n "$accuracy_unit" && "$accuracy" == "after" ]]; then
+        if ! curl -sf "http://localhost:${SERVER_PORT}/v1/models" > /dev/null; then
+            python server_lifecycle.py stop --state-file $state_file
+            launch_server
+        fi
+        run_accuracy || echo "Warning: the accuracy test of $model_name failed."
+    fi
+
     # Kill vLLM/Ray engine after benchmarking
     echo "Stopping the server for model $model_name"
-    ps -ef | grep '[p]ython' | awk '{print $2}' | xargs kill -9
-    pkill -9 -f VLLM
-    sleep 10
+    # Only this server's process group, other configs may be running on the other GPUs.
+    # Returns once the port and GPU memory are free.
+    python server_lifecycle.py stop --state-file $state_file $([[ "$ray_enable" == "true" && "$mock" != "true" ]] && echo "--ray")
+    kill -TERM $telemetry_pid 2>/dev/null
+    wait $telemetry_pid
+    python telemetry.py summarize --folder $server_folder
 done
 
+if [[ "$list_configs" == "true" ]]; then
+    exit 0
+fi
+
 echo "✅ Benchmark complete."
 
-cpupower frequency-set -g  performance # reset to perf mode
+if [[ "$skip_tuning" != "true" ]]; then
+    cpupower frequency-set -g  performance # reset to perf mode
+fi
 
 
 
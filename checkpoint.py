@@ -0,0 +1,119 @@
+import argparse
+import fcntl
+import json
+import os
+import sys
+from datetime import datetime
+from utils import setup_logger, GetMetrics
+from ParseBenchmark import ParseLogFile, GetEngine, ADAPTIVE_SUFFIX
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("checkpoint_logger")
+
+# Progress of one night, saved as Result/{date}/checkpoint.json so main.sh --resume-date can skip finished work.
+#   units: "vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000/iter1" -> {"status", "attempts", "time", "reason"}
+#   stages of main.sh use the same table, e.g., "stage/accuracy/vLLM/meta-llama_Llama-3.1-8B-Instruct"
+# Several benchmark.sh run at once under Scheduler.py, every update is a locked read-modify-write.
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = path + ".lock"
+
+    def _Load(self):
+        if not os.path.exists(self.path):
+            return {"units": {}}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def Load(self):
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            return self._Load()
+
+    def Update(self, unit: str, ok: bool, reason: str = ""):
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._Load()
+            entry = data["units"].setdefault(unit, {"attempts": 0})
+            entry["attempts"] += 1
+            entry["status"] = "done" if ok else "failed"
+            entry["time"] = datetime.now().isoformat(timespec="seconds")
+            entry["reason"] = reason
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp, self.path) # Never leave a half-written checkpoint behind
+
+    def IsDone(self, unit: str):
+        return self.Load()["units"].get(unit, {}).get("status") == "done"
+
+def ValidateResult(result_file: str, max_failed_ratio: float):
+    """(ok, reason) of one benchmark run. A crashed or truncated run has no summary, or a summary without
+    the required metrics, or too many failed requests."""
+    if not os.path.exists(result_file) or os.path.getsize(result_file) == 0:
+        return False, "missing or empty result"
+    required = GetMetrics(result_file)
+    if result_file.endswith(ADAPTIVE_SUFFIX):
+        with open(result_file, "r") as f:
+            mean = json.load(f).get("mean", {})
+        values = {metric: [mean[metric]] for metric in required if mean.get(metric)}
+    else:
+        values = ParseLogFile(result_file, GetEngine(result_file))
+    for metric in required:
+        if not values.get(metric) or values[metric][-1] <= 0:
+            return False, f"no '{metric}' in the summary"
+    failed = values.get("Failed requests", [0])[-1]
+    successful = values.get("Successful requests", [0])[-1]
+    if failed > max_failed_ratio * (failed + successful):
+        return False, f"{failed:.0f} failed requests"
+    return True, ""
+
+def main(args):
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.action == "is-done":
+        # Exit code 0 only when every unit is done
+        sys.exit(0 if all(checkpoint.IsDone(unit) for unit in args.units) else 1)
+    elif args.action == "mark":
+        checkpoint.Update(args.unit, not args.failed, args.reason)
+    elif args.action == "validate":
+        ok, reason = ValidateResult(args.result, args.max_failed_ratio)
+        checkpoint.Update(args.unit, ok, reason)
+        if not ok:
+            logger.warning(f"[{py_script}] {args.unit} failed: {reason}")
+        sys.exit(0 if ok else 1)
+    elif args.action == "summary":
+        units = checkpoint.Load()["units"]
+        failed = {unit: entry for unit, entry in units.items() if entry["status"] != "done"}
+        retried = sum(1 for entry in units.values() if entry["attempts"] > 1)
+        logger.info(f"[{py_script}] {len(units) - len(failed)} of {len(units)} units done, {retried} needed a retry.")
+        for unit, entry in failed.items():
+            logger.error(f"[{py_script}] {unit} failed after {entry['attempts']} attempts: {entry['reason']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checkpoint of the nightly benchmark")
+    parser.add_argument("--checkpoint", type=str, required=True, help="e.g., Result/2025-08-18/checkpoint.json")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    is_done = subparsers.add_parser("is-done", help="Exit 0 if all the units are done")
+    is_done.add_argument("units", nargs="+")
+    mark = subparsers.add_parser("mark", help="Record a unit as done (or --failed)")
+    mark.add_argument("unit")
+    mark.add_argument("--failed", action="store_true")
+    mark.add_argument("--reason", type=str, default="")
+    validate = subparsers.add_parser("validate", help="Check a benchmark result and record the unit, exit 1 if it is bad")
+    validate.add_argument("unit")
+    validate.add_argument("--result", type=str, required=True, help="Log or JSON result of the run, or an _adaptive.json report")
+    validate.add_argument("--max-failed-ratio", type=float, default=0.01, help="Max share of failed requests of a good run")
+    subparsers.add_parser("summary", help="Print done and failed units")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+python3 checkpoint.py --checkpoint Result/2025-08-18/checkpoint.json summary
+python3 checkpoint.py --checkpoint Result/2025-08-18/checkpoint.json validate \
+    vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000/iter1 \
+    --result Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter1.log
+'''
@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+from dateutil.parser import isoparse
+
+# Docker Hub tag resolver shared by GetLatest*Docker.py, BisectRegression.py and image_index.py.
+# All pages of a repo are fetched concurrently. Responses are cached on disk and revalidated with
+# ETag/If-Modified-Since, a rate-limited or unreachable Docker Hub falls back to the cached pages.
+# DOCKER_HUB_URL points everything to another registry API, e.g., the fixture server of this script.
+
+HUB_URL = os.environ.get("DOCKER_HUB_URL", "https://hub.docker.com/v2/repositories")
+CACHE_DIR = os.environ.get("DOCKER_TAGS_CACHE", os.path.expanduser("~/.cache/ci_docker_tags"))
+PAGE_SIZE = 100
+CONCURRENCY = 8 # Pages in flight at once
+MAX_ATTEMPTS = 4
+MAX_RETRY_WAIT = 30 # Seconds, a longer Retry-After uses the cache instead
+REQUEST_TIMEOUT = 30
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+def IsVllmRcTag(name: str):
+    # e.g., rocm/vllm-dev:rc1_20250811, skip the 'base' images
+    return "base" not in name and any(part.startswith('rc') for part in name.split('_'))
+
+def IsSGLangRcTag(name: str):
+    # e.g., lmsysorg/sglang:v0.5.0rc0-rocm630-mi30x-srt
+    return "mi30x" in name and "rc" in name and "srt" in name
+
+tag_filters = {
+    "rocm/vllm-dev": IsVllmRcTag,
+    "lmsysorg/sglang": IsSGLangRcTag,
+}
+
+class ResponseCache:
+    # One file per URL: {"etag", "last_modified", "body"}
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _Path(self, url: str):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def Load(self, url: str):
+        if self.cache_dir is None or not os.path.exists(self._Path(url)):
+            return None
+        with open(self._Path(url), "r") as f:
+            return json.load(f)
+
+    def Save(self, url: str, etag: str, last_modified: str, body: dict):
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self._Path(url)}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "body": body}, f)
+        os.replace(tmp, self._Path(url))
+
+def RetryAfter(value: str, attempt: int):
+    # Retry-After is seconds or an HTTP date, without it the wait doubles every attempt
+    if value:
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+            except (TypeError, ValueError):
+                pass
+    return 2 ** attempt
+
+async def FetchJson(session: aiohttp.ClientSession, url: str, cache: ResponseCache):
+    """Body of url, None on 404. A cached body is revalidated and reused on 304, or when Docker Hub keeps failing."""
+    cached = cache.Load(url)
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    error = None
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached is not None:
+                    return cached["body"]
+                if response.status == 404:
+                    return None
+                if response.status not in RETRY_STATUS:
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+                    cache.Save(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), body)
+                    return body
+                error = f"HTTP {response.status}"
+                wait = RetryAfter(response.headers.get("Retry-After"), attempt)
+        except aiohttp.ClientResponseError as e:
+            # 401, 403, ... won't change on a retry, fall back to the cache right away
+            error = f"HTTP {e.status}"
+            break
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            error = f"{type(e).__name__}: {e}"
+            wait = RetryAfter(None, attempt)
+        if attempt == MAX_ATTEMPTS - 1 or (wait > MAX_RETRY_WAIT and cached is not None):
+            break
+        print(f"{url}: {error}, retry in {min(wait, MAX_RETRY_WAIT):.0f}s", file=sys.stderr)
+        await asyncio.sleep(min(wait, MAX_RETRY_WAIT))
+    if cached is not None:
+        print(f"{url}: {error}, using the cached response", file=sys.stderr)
+        return cached["body"]
+    raise RuntimeError(f"Failed to fetch {url}: {error}")
+
+def NewSession():
+    return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+
+async def FetchResultsAsync(repo: str, hub_url: str, cache: ResponseCache):
+    # The first page tells the tag count, the other pages are fetched side by side
+    page_url = f"{hub_url}/{repo}/tags?page_size={PAGE_SIZE}&page=" + "{}"
+    async with NewSession() as session:
+        first = await FetchJson(session, page_url.format(1), cache)
+        if first is None:
+            raise ValueError(f"Repository {repo} is not found at {hub_url}")
+        n_pages = max(math.ceil(first.get("count", 0) / PAGE_SIZE), 1)
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        async def FetchPage(page: int):
+            async with semaphore:
+                return await FetchJson(session, page_url.format(page), cache)
+        pages = await asyncio.gather(*(FetchPage(page) for page in range(2, n_pages + 1)))
+    results = list(first.get("results", []))
+    for page in pages:
+        results += (page or {}).get("results", [])
+    # A tag pushed while paging shifts the pages by one, keep one entry per name
+    return list({tag["name"]: tag for tag in results}.values())
+
+def GetDigest(tag: dict):
+    return tag.get("digest") or next((image.get("digest") for image in tag.get("images", []) if image.get("digest")), None)
+
+def FetchTags(repo: str, tags_file: str = None, hub_url: str = None, cache_dir: str = CACHE_DIR):
+    """Return every tag of the repo as [{"name", "last_updated", "digest"}].
+    tags_file is a stand-in for Docker Hub: a JSON file with the same 'results' list."""
+    if tags_file is not None:
+        with open(tags_file, "r") as f:
+            results = json.load(f)["results"]
+    else:
+        results = asyncio.run(FetchResultsAsync(repo, hub_url or HUB_URL, ResponseCache(cache_dir)))
+
+    tags = []
+    for tag in results:
+        tags.append({
+            "name": tag["name"],
+            "last_updated": isoparse(tag["last_updated"]),
+            "digest": GetDigest(tag),
+        })
+    return tags
+
+def GetTagDigest(repo: str, tag: str, tags_file: str = None, hub_url: str = None, cache_dir: str = CACHE_DIR):
+    # Digest the tag points to now, a re-pushed tag gets a new digest. None if the tag doesn't exist.
+    if tags_file is not None:
+        return next((t["digest"] for t in FetchTags(repo, tags_file) if t["name"] == tag), None)
+    async def Fetch():
+        async with NewSession() as session:
+            return await FetchJson(session, f"{hub_url or HUB_URL}/{repo}/tags/{tag}", ResponseCache(cache_dir))
+    data = asyncio.run(Fetch())
+    return GetDigest(data) if data is not None else None
+
+def FilterTags(repo: str, tags: list):
+    tag_filter = tag_filters.get(repo, lambda name: True)
+    return sorted([tag for tag in tags if tag_filter(tag["name"])], key=lambda tag: tag["last_updated"])
+
+def LatestTag(repo: str, hub_url: str = None, cache_dir: str = CACHE_DIR):
+    # Newest candidate tag name of the repo over all its pages, None if there is none
+    tags = FilterTags(repo, FetchTags(repo, hub_url=hub_url, cache_dir=cache_dir))
+    return tags[-1]["name"] if tags else None
+
+def SplitImage(image: str):
+    # rocm/vllm-dev:nightly_main_20250811 -> ("rocm/vllm-dev", "nightly_main_20250811")
+    repo, _, tag = image.rpartition(':')
+    return repo, tag
+
+def TagsBetween(repo: str, good_tag: str, bad_tag: str, tags_file: str = None):
+    # Candidate tags ordered by release time, from the last good to the first bad one (both included)
+    tags = FilterTags(repo, FetchTags(repo, tags_file))
+    names = [tag["name"] for tag in tags]
+    for name in (good_tag, bad_tag):
+        if name not in names:
+            raise ValueError(f"Tag '{name}' is not a candidate tag of {repo}")
+    start, end = names.index(good_tag), names.index(bad_tag)
+    if start >= end:
+        raise ValueError(f"Good tag '{good_tag}' is not older than bad tag '{bad_tag}'")
+    return names[start:end + 1]
+
+def ServeFixture(tags_file: str, port: int, fail_first: int):
+    """Docker Hub stand-in for offline tests: serves the 'results' of tags_file for every repo,
+    paginated like Docker Hub, with ETag revalidation. The first fail_first requests get a 429."""
+    from aiohttp import web
+    with open(tags_file, "r") as f:
+        results = json.load(f)["results"]
+    etag = '"' + hashlib.sha1(json.dumps(results, sort_keys=True).encode()).hexdigest() + '"'
+    counter = {"requests": 0}
+
+    def Reply(request, body):
+        counter["requests"] += 1
+        if counter["requests"] <= fail_first:
+            return web.json_response({"message": "rate limited"}, status=429, headers={"Retry-After": "1"})
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        if body is None:
+            return web.json_response({"message": "not found"}, status=404)
+        return web.json_response(body, headers={"ETag": etag})
+
+    async def Tags(request):
+        page = int(request.query.get("page", 1))
+        page_size = min(int(request.query.get("page_size", 10)), PAGE_SIZE)
+        newest_first = sorted(results, key=lambda tag: tag["last_updated"], reverse=True)
+        return Reply(request, {"count": len(results), "next": None, "previous": None,
+                               "results": newest_first[(page - 1) * page_size:page * page_size]})
+
+    async def Tag(request):
+        return Reply(request, next((tag for tag in results if tag["name"] == request.match_info["tag"]), None))
+
+    app = web.Application()
+    app.router.add_get("/v2/repositories/{namespace}/{repo}/tags", Tags)
+    app.router.add_get("/v2/repositories/{namespace}/{repo}/tags/{tag}", Tag)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the candidate tags of a Docker Hub repository")
+    parser.add_argument("repo", type=str, nargs="?", default="rocm/vllm-dev")
+    parser.add_argument("--hub-url", type=str, default=None, help=f"Registry API (default: {HUB_URL})")
+    parser.add_argument("--no-cache", action="store_true", help=f"Don't read or write the response cache in {CACHE_DIR}")
+    parser.add_argument("--serve-fixture", type=str, default=None, metavar="TAGS_FILE",
+                        help="(Testing) Serve this tag list as Docker Hub at http://127.0.0.1:PORT/v2/repositories")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0, help="(Testing) The fixture server rate-limits its first N requests")
+    args = parser.parse_args()
+
+    if args.serve_fixture:
+        ServeFixture(args.serve_fixture, args.port, args.fail_first)
+        sys.exit(0)
+    start = time.time()
+    tags = FilterTags(args.repo, FetchTags(args.repo, hub_url=args.hub_url, cache_dir=None if args.no_cache else CACHE_DIR))
+    for tag in tags:
+        print(f"{tag['last_updated'].isoformat()} {args.repo}:{tag['name']}")
+    print(f"{len(tags)} candidate tags in {time.time() - start:.1f}s", file=sys.stderr)
+
+'''
+python docker_tags.py rocm/vllm-dev
+python docker_tags.py --serve-fixture tags.json --port 8765 &
+python docker_tags.py lmsysorg/sglang --hub-url http://127.0.0.1:8765/v2/repositories
+'''
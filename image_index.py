@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import sys
+from utils import setup_logger
+from docker_tags import SplitImage, GetTagDigest
+from RayOverhead import RAY_VERSION_KEY
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("image_index_logger")
+
+# Images that were already measured, keyed by digest so a re-pushed tag counts as a new image:
+#   {digest: {"engine", "image", "date"}}, date is the night whose Result.json holds its numbers
+DEFAULT_INDEX = "Result/image_index.json"
+CARRIED_KEY = "Carried Forward" # Result.json: {engine: date the numbers were copied from}
+EXIT_MEASURED = 10 # `check` exit code when the image was already measured
+
+def LoadIndex(index_file: str):
+    if not os.path.exists(index_file):
+        return {}
+    with open(index_file, "r") as f:
+        return json.load(f)
+
+def SaveIndex(index_file: str, index: dict):
+    with open(index_file, "w") as f:
+        json.dump(index, f, indent=4)
+
+def ResolveDigest(image: str, tags_file: str = None):
+    repo, tag = SplitImage(image)
+    return GetTagDigest(repo, tag, tags_file)
+
+def FindMeasured(index: dict, digest: str, engine: str, result_folder: str, exclude_date: str):
+    # The night must still have its Result.json, otherwise the image is measured again
+    entry = index.get(digest) if digest else None
+    if entry is None or entry["engine"] != engine or entry["date"] == exclude_date:
+        return None
+    if not os.path.exists(os.path.join(result_folder, entry["date"], "Result.json")):
+        return None
+    return entry
+
+def EngineSections(data: dict, engine: str):
+    # Parts of Result.json produced by one engine
+    benchmark = {bt: value for bt, value in data.get("Benchmark", {}).items() if bt.split('_')[0] == engine}
+    startup = {bt: value for bt, value in data.get("Startup", {}).items() if bt.split('_')[0] == engine}
+    accuracy = data.get("Accuracy", {}).get(engine)
+    return benchmark, startup, accuracy
+
+def HasNumbers(benchmark: dict):
+    return any(value for models in benchmark.values() for configs in models.values()
+               for metrics in configs.values() for value in metrics.values())
+
+def Check(args):
+    index = LoadIndex(args.index)
+    digest = ResolveDigest(args.image, args.tags_file)
+    if digest is None:
+        logger.warning(f"[{py_script}] Can't resolve the digest of {args.image}, benchmark it.")
+        return 0
+    entry = FindMeasured(index, digest, args.engine, args.result_folder, args.date)
+    if entry is None:
+        logger.info(f"[{py_script}] {args.image} ({digest[:19]}) is new, benchmark it.")
+        return 0
+    logger.info(f"[{py_script}] {args.image} ({digest[:19]}) was measured on {entry['date']} as {entry['image']}, reuse its numbers.")
+    print(entry["date"])
+    return EXIT_MEASURED
+
+def CarryEngine(data: dict, source: dict, engine: str, from_date: str):
+    benchmark, startup, accuracy = EngineSections(source, engine)
+    data.setdefault("Benchmark", {}).update(benchmark)
+    data.setdefault("Startup", {}).update(startup)
+    if accuracy is not None:
+        data.setdefault("Accuracy", {})[engine] = accuracy
+    if engine in source.get(RAY_VERSION_KEY, {}):
+        data.setdefault(RAY_VERSION_KEY, {})[engine] = source[RAY_VERSION_KEY][engine]
+    data.setdefault(CARRIED_KEY, {})[engine] = from_date
+
+def Carry(args):
+    # Copy an engine's numbers of the night that measured the same image into today's Result.json
+    with open(os.path.join(args.result_folder, args.from_date, "Result.json"), "r") as f:
+        source = json.load(f)
+    with open(args.json_file, "r") as f:
+        data = json.load(f)
+    CarryEngine(data, source, args.engine, args.from_date)
+    with open(args.json_file, "w") as f:
+        json.dump(data, f, indent=4)
+    logger.info(f"[{py_script}] {args.engine} numbers of {args.from_date} are carried forward to '{args.json_file}'.")
+    return 0
+
+def Record(args):
+    # Only a night with numbers counts as measured, a failed night is measured again
+    with open(args.json_file, "r") as f:
+        data = json.load(f)
+    if args.engine in data.get(CARRIED_KEY, {}):
+        return 0
+    benchmark, _, _ = EngineSections(data, args.engine)
+    if not HasNumbers(benchmark):
+        logger.warning(f"[{py_script}] No {args.engine} numbers in '{args.json_file}', {args.image} isn't recorded.")
+        return 0
+    digest = ResolveDigest(args.image, args.tags_file)
+    if digest is None:
+        logger.warning(f"[{py_script}] Can't resolve the digest of {args.image}, it isn't recorded.")
+        return 0
+    index = LoadIndex(args.index)
+    index[digest] = {"engine": args.engine, "image": args.image, "date": args.date}
+    SaveIndex(args.index, index)
+    logger.info(f"[{py_script}] {args.image} ({digest[:19]}) is recorded as measured on {args.date}.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index of measured docker images by digest")
+    parser.add_argument("--index", type=str, default=DEFAULT_INDEX)
+    parser.add_argument("--tags-file", type=str, default=None, help="(Testing) Docker Hub tag list to use instead of the network")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    check = subparsers.add_parser("check", help=f"Exit {EXIT_MEASURED} and print the date if the image was measured, else 0")
+    check.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    check.add_argument("--image", type=str, required=True, help="e.g., rocm/vllm-dev:rc1_20250818")
+    check.add_argument("--date", type=str, required=True, help="Date of this run, never reused")
+    check.add_argument("--result-folder", type=str, default="Result")
+
+    carry = subparsers.add_parser("carry", help="Copy the engine's numbers of --from-date into --json-file")
+    carry.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    carry.add_argument("--from-date", type=str, required=True)
+    carry.add_argument("--json-file", type=str, required=True)
+    carry.add_argument("--result-folder", type=str, default="Result")
+
+    record = subparsers.add_parser("record", help="Record the image as measured by the night of --json-file")
+    record.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    record.add_argument("--image", type=str, required=True)
+    record.add_argument("--date", type=str, required=True)
+    record.add_argument("--json-file", type=str, required=True)
+    args = parser.parse_args()
+
+    actions = {"check": Check, "carry": Carry, "record": Record}
+    sys.exit(actions[args.action](args))
+
+
+'''
+python3 image_index.py check --engine vLLM --image rocm/vllm-dev:rc1_20250818 --date 2025-08-19
+python3 image_index.py carry --engine vLLM --from-date 2025-08-18 --json-file Result/2025-08-19/Result.json
+python3 image_index.py record --engine vLLM --image rocm/vllm-dev:rc1_20250818 --date 2025-08-18 --json-file Result/2025-08-18/Result.json
+'''
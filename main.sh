@@ -3,16 +3,14 @@ set -x
 
 # Sample cmd:
 # ./main.sh --model-dir $HOME/data/huggingface/hub
+# ./main.sh --model-dir $HOME/data/huggingface/hub --resume-date 2025-08-18 # Continue a run that died
+# ./main.sh --model-dir $HOME/data/huggingface/hub --force # Benchmark the images even if they were measured before
+# ./main.sh --model-dir $HOME/data/huggingface/hub --shared-server before # Accuracy tests on the performance test servers
 
 pip3 install -r requirement.txt
 
 # 1. Download models
 ci_dir=$(pwd)
-date=$(date +"%Y-%m-%d") #  +"%Y-%m-%d-%H%M%S"
-out_dir=$ci_dir/Result/$date
-out_json=$out_dir/Result.json
-out_figures_dir=$ci_dir/Result/Figures
-mkdir -p $out_dir
 host_model_dir=$HOME/data/huggingface/hub/
 container_model_dir=/data/huggingface/hub/
 while [[ "$#" -gt 0 ]]; do
@@ -21,10 +19,30 @@ while [[ "$#" -gt 0 ]]; do
             host_model_dir=$2
             shift 2
             ;;
+        --resume-date)
+            resume_date=$2
+            shift 2
+            ;;
+        --force)
+            force=true
+            shift
+            ;;
+        --shared-server)
+            if [[ "$2" != "before" && "$2" != "after" ]]; then
+                echo "Error: Invalid value for --shared-server. Choices are [before, after]."
+                exit 1
+            fi
+            shared_server=$2
+            shift 2
+            ;;
         --help)
             echo "Usage: $0 [OPTIONS]"
             echo "Options:"
             echo "  --model-dir         Directory of model (default: $host_model_dir)"
+            echo "  --resume-date       Continue the run of this date (YYYY-MM-DD) from its checkpoint, e.g., after a crash"
+            echo "  --force             Benchmark every engine, even if its image digest was measured on an earlier date"
+            echo "  --shared-server     Run the accuracy tests on the server of the performance tests, before the warmup or after"
+            echo "                      the performance tests, instead of a server of their own. choices=[before, after]"
             exit 0
             ;;
         *)
@@ -34,6 +52,24 @@ while [[ "$#" -gt 0 ]]; do
     esac
 done
 
+date=${resume_date:-$(date +"%Y-%m-%d")} #  +"%Y-%m-%d-%H%M%S"
+out_dir=$ci_dir/Result/$date
+out_json=$out_dir/Result.json
+out_figures_dir=$ci_dir/Result/Figures
+mkdir -p $out_dir
+
+# Finished stages and benchmark runs of this date, see checkpoint.py. A new run starts from scratch.
+checkpoint=$out_dir/checkpoint.json
+if [[ -z "$resume_date" ]]; then
+    rm -f $checkpoint
+fi
+stage_done() {
+    python3 checkpoint.py --checkpoint $checkpoint is-done "stage/$1"
+}
+mark_stage() {
+    python3 checkpoint.py --checkpoint $checkpoint mark "stage/$1"
+}
+
 echo "Set host_model_dir=$host_model_dir"
 models=(
     "meta-llama/Llama-3.1-8B-Instruct"
@@ -67,20 +103,90 @@ if [ ${#download_pids[@]} -gt 0 ]; then
 fi
 echo "All models are ready."
 
+# Read the weights into the page cache while the containers start and install their dependencies,
+# the first server launch of each model then loads them from memory. See $out_dir/Prewarm.json
+model_paths=()
+for model_name in "${models[@]}"; do
+    model_paths+=("${host_model_dir}/${model_name}")
+done
+python3 prewarm.py "${model_paths[@]}" --json-file $out_dir/Prewarm.json > $out_dir/prewarm.log 2>&1 &
+prewarm_pid=$!
+wait_prewarm() {
+    if [[ -n "$prewarm_pid" ]]; then
+        wait $prewarm_pid
+        prewarm_pid=""
+        tail -n 2 $out_dir/prewarm.log
+    fi
+}
+
 
 # 2. Setup
-# 2.1 Fetch latest ROCm vLLM image with 'rc' sub-string
-latest_vLLM_docker=$(python3 -u GetLatestVllmDocker.py | tee /dev/tty | tail -n 1)
+if stage_done docker_images; then
+    # A resumed run keeps the images it started with, even if newer ones were released meanwhile
+    latest_vLLM_docker=$(python3 -c "import json; print(json.load(open('$out_json'))['vLLM Docker'])")
+    latest_SGLang_docker=$(python3 -c "import json; print(json.load(open('$out_json'))['SGLang Docker'])")
+else
+    # 2.1 Fetch latest ROCm vLLM image with 'rc' sub-string
+    latest_vLLM_docker=$(python3 -u GetLatestVllmDocker.py | tee /dev/tty | tail -n 1)
+    # latest_vLLM_docker="rocm/vllm-dev:nightly_main_20250804"
+    # 2.2 Fetch latest ROCm SGLang image with 'mi30x' and 'srt' sub-string
+    latest_SGLang_docker=$(python3 -u GetLatestSGLangDocker.py | tee /dev/tty | tail -n 1)
+    python3 RecordDockerName.py \
+        --json-file $out_json \
+        --vLLM $latest_vLLM_docker \
+        --SGLang $latest_SGLang_docker \
+        && mark_stage docker_images
+fi
 echo "Latest vLLM docker=$latest_vLLM_docker"
-# latest_vLLM_docker="rocm/vllm-dev:nightly_main_20250804"
-# 2.2 Fetch latest ROCm SGLang image with 'mi30x' and 'srt' sub-string
-latest_SGLang_docker=$(python3 -u GetLatestSGLangDocker.py | tee /dev/tty | tail -n 1)
 echo "Latest SGLang docker=$latest_SGLang_docker"
-# ToDo: Record docker images to a list. Check if the images are already in the list, if so, skip benchmark.
-python3 RecordDockerName.py \
-    --json-file $out_json \
-    --vLLM $latest_vLLM_docker \
-    --SGLang $latest_SGLang_docker
+
+# Accuracy tests launch a server of their own, unless benchmark.sh runs them on its servers (--shared-server),
+# which saves one model load and graph capture per model and engine
+accuracy_models=("${models[@]}")
+benchmark_args="--checkpoint $checkpoint"
+if [[ -n "$shared_server" ]]; then
+    accuracy_models=()
+    benchmark_args="$benchmark_args --accuracy $shared_server"
+fi
+
+# 2.3 An image whose digest was measured on an earlier date isn't benchmarked again, its numbers are carried forward.
+# Exit code 10 of image_index.py means measured, the date of those numbers is printed.
+image_index=$ci_dir/Result/image_index.json
+measured_date() {
+    local engine="$1"
+    local docker_image="$2"
+    if [[ "$force" == "true" ]]; then
+        return 1
+    fi
+    local output
+    output=$(python3 -u image_index.py --index $image_index check --engine $engine --image $docker_image --date $date \
+        --result-folder $ci_dir/Result | tee /dev/tty; exit ${PIPESTATUS[0]})
+    [[ $? -eq 10 ]] && echo "$output" | tail -n 1
+}
+run_vLLM=true
+run_SGLang=true
+if vLLM_from_date=$(measured_date vLLM $latest_vLLM_docker); then
+    run_vLLM=false
+    echo "$latest_vLLM_docker was measured on $vLLM_from_date, skip the vLLM benchmark."
+fi
+if SGLang_from_date=$(measured_date SGLang $latest_SGLang_docker); then
+    run_SGLang=false
+    echo "$latest_SGLang_docker was measured on $SGLang_from_date, skip the SGLang benchmark."
+fi
+
+# A container is only reused when resuming a night and it runs that night's image. Otherwise it is left over from
+# a night that crashed before its docker stop, and is replaced.
+reuse_container() {
+    local container_name="$1"
+    local docker_image="$2"
+    if [[ -n "$resume_date" && -n "$(docker ps -q -f name=^${container_name}\$)" && \
+          "$(docker inspect -f '{{.Config.Image}}' "$container_name")" == "$docker_image" ]]; then
+        echo "Reusing the running container ${container_name} of ${docker_image}."
+        return 0
+    fi
+    docker rm -f "$container_name" > /dev/null 2>&1
+    return 1
+}
 
 run_benchmark_container() {
     local container_name="$1"
@@ -109,116 +215,153 @@ pip install -r requirement.txt
 
 
 # 3. vLLM benchmark
-vllm_container_id=$(run_benchmark_container "CI_vLLM" "$latest_vLLM_docker")
-# Dependencies of accuracy test
-docker exec "CI_vLLM" bash -c "pip install gradio plotly evalscope" 
-# Dependencies of benchmark
-docker exec "CI_vLLM" bash -c "
-    mkdir -p /app && \
-    git clone https://github.com/ray-project/ray.git /app/ray && \
-    pip install -r /app/ray/python/requirements.txt && \
-    pip install --upgrade ray[serve,llm] --no-deps
-"
-
-
-# 3.1 Accuracy Test-evalscope
-for model_name in "${models[@]}"; do
-    echo "--------------------------- vLLM Accuracy Test ------------------------------------"
-    model_path="$container_model_dir/${model_name}"
-    # "--distributed-executor-backend ray"  tends to result in 'HW Exception by GPU node-5 (Agent handle: 0x16f721e0) reason :GPU Hang'
-    docker exec -d "CI_vLLM" bash -c \
-        "vllm serve $model_path -tp 8 --max_model_len 8192 --uvicorn-log-level warning \
-        --distributed-executor-backend mp \
-        --compilation-config '{\"full_cuda_graph\": false}' > /tmp/vllm_accuracy_test.log 2>&1 "
-    docker exec "CI_vLLM" tail -f /tmp/vllm_accuracy_test.log &
-    log_pid=$!
-
-    wait_time=0
-    until curl -s http://localhost:8000/v1/models | grep -q '"object"'; do
-        echo "Waiting for the vLLM server to start $model_name...$wait_time sec"
-        sleep 5
-        wait_time=$((wait_time + 5))
+if [[ "$run_vLLM" == "true" ]]; then
+    # A container left by the run being resumed already has its dependencies
+    if ! reuse_container "CI_vLLM" "$latest_vLLM_docker"; then
+        vllm_container_id=$(run_benchmark_container "CI_vLLM" "$latest_vLLM_docker")
+        # Dependencies of accuracy test
+        docker exec "CI_vLLM" bash -c "pip install gradio plotly evalscope" 
+        # Dependencies of the CI scripts running inside the container (server_lifecycle.py, Scheduler.py)
+        docker exec "CI_vLLM" bash -c "pip install colorlog aiohttp"
+        # Dependencies of benchmark
+        docker exec "CI_vLLM" bash -c "
+            mkdir -p /app && \
+            git clone https://github.com/ray-project/ray.git /app/ray && \
+            pip install -r /app/ray/python/requirements.txt && \
+            pip install --upgrade ray[serve,llm] --no-deps
+        "
+    fi
+    # RayOverhead.py tracks the ray/standalone gap per Ray version
+    ray_version=$(docker exec "CI_vLLM" python3 -c "import ray; print(ray.__version__)")
+    if [[ -n "$ray_version" ]]; then
+        python3 RayOverhead.py record-version --json-file $out_json --engine vLLM --version $ray_version
+    fi
+
+
+    wait_prewarm # The weights are in the page cache before the first server launch
+
+    # 3.1 Accuracy Test-evalscope
+    for model_name in "${accuracy_models[@]}"; do
+        model_name_str=$(echo "$model_name" | sed 's/\//_/g') # "meta-llama/Llama-3.1-8B-Instruct" -> "meta-llama_Llama-3.1-8B-Instruct"
+        if stage_done accuracy/vLLM/$model_name_str; then
+            echo "vLLM accuracy of $model_name is done, skip."
+            continue
+        fi
+        echo "--------------------------- vLLM Accuracy Test ------------------------------------"
+        model_path="$container_model_dir/${model_name}"
+        # "--distributed-executor-backend ray"  tends to result in 'HW Exception by GPU node-5 (Agent handle: 0x16f721e0) reason :GPU Hang'
+        docker exec "CI_vLLM" python3 server_lifecycle.py start \
+            --state-file /tmp/vllm_accuracy_server.json --port 8000 --log-file /tmp/vllm_accuracy_test.log -- \
+            vllm serve $model_path -tp 8 --max_model_len 8192 --uvicorn-log-level warning \
+            --distributed-executor-backend mp \
+            --compilation-config '{"full_cuda_graph": false}' \
+            || docker exec "CI_vLLM" tail -n 100 /tmp/vllm_accuracy_test.log
+
+        output=$(docker exec "CI_vLLM" bash -c \
+            "evalscope eval \
+                --model $model_path  \
+                --api-url http://localhost:8000/v1 \
+                --api-key EMPTY \
+                --eval-type openai_api \
+                --datasets gsm8k \
+                --limit 50 2>&1")
+        report_path=$(echo "$output" | grep "Dump report to:" | awk '{print $NF}')
+        echo "The report file is located at: $report_path"
+        docker exec "CI_vLLM" python3 server_lifecycle.py stop --state-file /tmp/vllm_accuracy_server.json
+        if [[ -n "$report_path" ]]; then
+            python3 RecordAccuracy.py --engine vLLM --model $model_name_str --acc-path $report_path --out-json $out_json \
+                && mark_stage accuracy/vLLM/$model_name_str
+        fi
+        echo "------------------------------------------------------------------------"
     done
-    kill $log_pid
-
-    output=$(docker exec "CI_vLLM" bash -c \
-        "evalscope eval \
-            --model $model_path  \
-            --api-url http://localhost:8000/v1 \
-            --api-key EMPTY \
-            --eval-type openai_api \
-            --datasets gsm8k \
-            --limit 50 2>&1")
-    report_path=$(echo "$output" | grep "Dump report to:" | awk '{print $NF}')
-    echo "The report file is located at: $report_path"
-    docker exec "CI_vLLM" bash -c "ps -ef | grep '[p]ython' | awk '{print \$2}' | xargs kill -9 && echo 'Kill server...'"
-    docker exec "CI_vLLM" bash -c "pkill -9 -f VLLM"
-    sleep 10 # Wait for killing server
-    model_name_str=$(echo "$model_name" | sed 's/\//_/g') # "meta-llama/Llama-3.1-8B-Instruct" -> "meta-llama_Llama-3.1-8B-Instruct"
-    python3 RecordAccuracy.py --engine vLLM --model $model_name_str --acc-path $report_path --out-json $out_json
-    echo "------------------------------------------------------------------------"
-done
 
-# 3.2 Performance Test
-docker exec "CI_vLLM" bash -c \
-    "./benchmark.sh --engine vLLM  --model-dir $container_model_dir --out-dir $out_dir "
+    # 3.2 Performance Test. tp<8 configs run side by side on disjoint GPUs, Ray configs alone.
+    # Finished runs in the checkpoint are skipped, crashed or truncated ones are retried.
+    docker exec "CI_vLLM" bash -c \
+        "python3 Scheduler.py --engine vLLM --model-dir $container_model_dir --out-dir $out_dir -- $benchmark_args"
+fi
 
 
 
 # 4. SGLang benchmark
-sglang_container_id=$(run_benchmark_container "CI_SGLang" "$latest_SGLang_docker")
+if [[ "$run_SGLang" == "true" ]]; then
+    if ! reuse_container "CI_SGLang" "$latest_SGLang_docker"; then
+        sglang_container_id=$(run_benchmark_container "CI_SGLang" "$latest_SGLang_docker")
 
-# Delete sglang code signal.signal...
-docker exec "CI_SGLang" bash -c "
-    sed -i '/signal.signal/d' /sgl-workspace/sglang/python/sglang/srt/entrypoints/engine.py
-"
+        docker exec "CI_SGLang" bash -c "pip install colorlog aiohttp"
 
-# 4.1 Accuracy Test
-for model_name in "${models[@]}"; do
-    if [ "$model_name" = "meta-llama/Llama-4-Scout-17B-16E-Instruct" ]; then
-        continue
+        # Delete sglang code signal.signal...
+        docker exec "CI_SGLang" bash -c "
+            sed -i '/signal.signal/d' /sgl-workspace/sglang/python/sglang/srt/entrypoints/engine.py
+        "
     fi
+
+    wait_prewarm # The weights are in the page cache before the first server launch
+
+    # 4.1 Accuracy Test
+    for model_name in "${accuracy_models[@]}"; do
+        if [ "$model_name" = "meta-llama/Llama-4-Scout-17B-16E-Instruct" ]; then
+            continue
+        fi
+        model_name_str=$(echo "$model_name" | sed 's/\//_/g') # "meta-llama/Llama-3.1-8B-Instruct" -> "meta-llama_Llama-3.1-8B-Instruct"
+        if stage_done accuracy/SGLang/$model_name_str; then
+            echo "SGLang accuracy of $model_name is done, skip."
+            continue
+        fi
     
-    echo "--------------------------- SGLang Accuracy Test ------------------------------------"
-    model_path="$container_model_dir/${model_name}"
-    docker exec -d "CI_SGLang" bash -c \
-       "python -m sglang.launch_server --model-path $model_path --tp 8 \
-       --mem-fraction-static 0.7 --context-length 8192 --log-level warning > /tmp/sglang_accuracy_test.log 2>&1"
-    docker exec "CI_SGLang" tail -f /tmp/sglang_accuracy_test.log &
-    log_pid=$!
-
-    wait_time=0
-    until curl -s http://localhost:30000/v1/models | grep -q '"object"'; do
-        echo "Waiting for the SGLang server to start...$wait_time sec"
-        sleep 5
-        wait_time=$((wait_time + 5))
+        echo "--------------------------- SGLang Accuracy Test ------------------------------------"
+        model_path="$container_model_dir/${model_name}"
+        docker exec "CI_SGLang" python3 server_lifecycle.py start \
+            --state-file /tmp/sglang_accuracy_server.json --port 30000 --log-file /tmp/sglang_accuracy_test.log -- \
+            python -m sglang.launch_server --model-path $model_path --tp 8 \
+            --mem-fraction-static 0.7 --context-length 8192 --log-level warning \
+            || docker exec "CI_SGLang" tail -n 100 /tmp/sglang_accuracy_test.log
+        output=$(docker exec "CI_SGLang" bash -c \ "python3 -m sglang.test.few_shot_gsm8k --num-questions 200 --parallel 200")
+        acc=$(echo "$output" | grep "Accuracy:" | awk '{print $2}')
+        docker exec "CI_SGLang" python3 server_lifecycle.py stop --state-file /tmp/sglang_accuracy_server.json
+        if [[ -n "$acc" ]]; then
+            python3 RecordAccuracy.py --engine SGLang --model $model_name_str --acc $acc --out $out_json \
+                && mark_stage accuracy/SGLang/$model_name_str
+        fi
+        echo "------------------------------------------------------------------------" 
     done
-    kill $log_pid
-    output=$(docker exec "CI_SGLang" bash -c \ "python3 -m sglang.test.few_shot_gsm8k --num-questions 200 --parallel 200")
-    acc=$(echo "$output" | grep "Accuracy:" | awk '{print $2}')
-    docker exec "CI_SGLang" bash -c "ps -ef | grep '[p]ython' | awk '{print \$2}' | xargs kill -9 && echo 'Kill server...'"
-    sleep 10 # Wait for killing server
-    model_name_str=$(echo "$model_name" | sed 's/\//_/g') # "meta-llama/Llama-3.1-8B-Instruct" -> "meta-llama_Llama-3.1-8B-Instruct"
-    python3 RecordAccuracy.py --engine SGLang --model $model_name_str --acc $acc --out $out_json
-    echo "------------------------------------------------------------------------" 
-done
 
-# 4.2 Performance Test
-docker exec "CI_SGLang" bash -c \
-    "./benchmark.sh --engine SGLang  --model-dir $container_model_dir --out-dir $out_dir "
+    # 4.2 Performance Test
+    docker exec "CI_SGLang" bash -c \
+        "python3 Scheduler.py --engine SGLang --model-dir $container_model_dir --out-dir $out_dir -- $benchmark_args"
+fi
 
 
 
 # 5. Visualization
 # 5.1 Parse benchmark logs and save metrics into json file
 python3 ParseBenchmark.py --json-file $out_json --folder $out_dir
-# 5.2 Check regression. Threshold: 3%
-python3 CheckRegression.py --json-file $out_json --result-folder $ci_dir/Result --exclude-date $date --threshold 3
-# 5.3 Plot accuracy and performance figures 
+# 5.2 Carry the numbers of an unchanged image forward, record the digest of a new image that got numbers
+for engine in vLLM SGLang; do
+    run_var=run_$engine
+    if [[ "${!run_var}" == "true" ]]; then
+        docker_var=latest_${engine}_docker
+        python3 image_index.py --index $image_index record --engine $engine --image ${!docker_var} --date $date --json-file $out_json
+    else
+        from_var=${engine}_from_date
+        python3 image_index.py carry --engine $engine --from-date ${!from_var} --json-file $out_json --result-folder $ci_dir/Result
+    fi
+done
+# 5.3 Check regression against the last 7 runs. Threshold: 3%. The verdict is saved to $out_dir/Regression.json
+python3 CheckRegression.py --json-file $out_json --result-folder $ci_dir/Result --exclude-date $date --threshold 3 --window 7
+regression_status=$?
+# 5.4 Save numbers into the results store and plot accuracy and performance figures 
+python3 result_store.py --json-file $out_json --db $ci_dir/Result/results.db
+python3 DetectChangePoints.py --db $ci_dir/Result/results.db --days 180 --out-json $out_dir/ChangePoints.json
+python3 RayOverhead.py report --db $ci_dir/Result/results.db --result-folder $ci_dir/Result --date $date --days 180 \
+    --out-json $out_dir/RayOverhead.json --out-csv $ci_dir/Result/RayOverhead.csv
 python3 SaveOverviewCSV.py --json-file $out_json
-python3 Visualize.py --out-dir Result/Figures
+python3 Visualize.py --out-dir Result/Figures --db $ci_dir/Result/results.db
+python3 Dashboard.py --out-html Result/Figures/Dashboard.html --db $ci_dir/Result/results.db
 
+python3 checkpoint.py --checkpoint $checkpoint summary
 echo "----------------------------- Finish ------------------------"
 rm -f *.jsonl 
 docker stop CI_vLLM CI_SGLang
+exit $regression_status
 
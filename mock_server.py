@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from aiohttp import web
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("mock_server_logger")
+
+# A fake vLLM/SGLang OpenAI server for running the whole pipeline without GPUs.
+# Requests go through a continuous-batching loop like the real engines:
+#   - waiting requests join the running batch while it has room (--max-num-seqs, --max-num-batched-tokens)
+#   - a step with new requests pays their prefill: prefill_ms + prefill_ms_per_token * new input tokens
+#   - every step emits one token to each running request and costs decode_ms + decode_ms_per_seq * batch size
+
+class Request:
+    def __init__(self, input_len: int, output_len: int):
+        self.input_len = input_len
+        self.output_len = output_len
+        self.generated = 0
+        self.tokens = asyncio.Queue() # One item per generated token, None when finished
+
+class MockEngine:
+    def __init__(self, args):
+        self.args = args
+        self.waiting = []
+        self.running = []
+        self.wakeup = asyncio.Event()
+        self.n_steps = 0
+
+    def Add(self, request: Request):
+        self.waiting.append(request)
+        self.wakeup.set()
+
+    def Schedule(self):
+        # FCFS admission, at least one request per step so a long prompt can't stall the queue
+        new, budget = [], self.args.max_num_batched_tokens
+        while self.waiting and len(self.running) + len(new) < self.args.max_num_seqs:
+            if new and self.waiting[0].input_len > budget:
+                break
+            request = self.waiting.pop(0)
+            budget -= request.input_len
+            new.append(request)
+        return new
+
+    async def Loop(self):
+        while True:
+            if not self.waiting and not self.running:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+            new = self.Schedule()
+            self.running += new
+            step_ms = self.args.decode_ms + self.args.decode_ms_per_seq * len(self.running)
+            if new:
+                step_ms += self.args.prefill_ms + self.args.prefill_ms_per_token * sum(r.input_len for r in new)
+            await asyncio.sleep(step_ms / 1000)
+            self.n_steps += 1
+            for request in self.running:
+                request.generated += 1
+                request.tokens.put_nowait(request.generated)
+                if request.generated >= request.output_len:
+                    request.tokens.put_nowait(None)
+            self.running = [r for r in self.running if r.generated < r.output_len]
+
+def GetInputLen(prompt):
+    # Token id list from bench_client.py, or text from vllm bench serve / sglang.bench_serving
+    if isinstance(prompt, list):
+        if prompt and isinstance(prompt[0], list):
+            return len(prompt[0])
+        return max(len(prompt), 1)
+    return max(len(str(prompt).split()), 1)
+
+def Chunk(request_id: str, model: str, text: str, finish_reason=None, usage=None):
+    chunk = {
+        "id": request_id,
+        "object": "text_completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "text": text, "logprobs": None, "finish_reason": finish_reason}] if usage is None else [],
+    }
+    if usage is not None:
+        chunk["usage"] = usage
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+async def Completions(http_request: web.Request):
+    app = http_request.app
+    body = await http_request.json()
+    model = body.get("model", app["model"])
+    if app["args"].strict_model and model != app["model"]:
+        return web.json_response({"error": {"message": f"The model `{model}` does not exist.", "type": "NotFoundError"}}, status=404)
+    input_len = GetInputLen(body.get("prompt", ""))
+    output_len = int(body.get("max_tokens") or 16)
+    if input_len + output_len > app["args"].max_model_len:
+        return web.json_response({"error": {"message": f"Prompt of {input_len} tokens plus {output_len} output tokens "
+                                            f"exceeds max_model_len {app['args'].max_model_len}", "type": "BadRequestError"}}, status=400)
+    request_id = f"cmpl-{uuid.uuid4().hex}"
+    usage = {"prompt_tokens": input_len, "completion_tokens": output_len, "total_tokens": input_len + output_len}
+
+    async with app["limit"]:
+        request = Request(input_len, output_len)
+        app["engine"].Add(request)
+
+        if not body.get("stream", False):
+            while await request.tokens.get() is not None:
+                pass
+            return web.json_response({
+                "id": request_id,
+                "object": "text_completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "text": app["token_text"] * output_len, "logprobs": None, "finish_reason": "length"}],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(http_request)
+        while True:
+            token = await request.tokens.get()
+            if token is None:
+                break
+            finish_reason = "length" if token == output_len else None
+            await response.write(Chunk(request_id, model, app["token_text"], finish_reason))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            await response.write(Chunk(request_id, model, "", usage=usage))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+async def Models(http_request: web.Request):
+    app = http_request.app
+    return web.json_response({
+        "object": "list",
+        "data": [{"id": app["model"], "object": "model", "created": app["created"], "owned_by": "mock",
+                  "root": app["model"], "max_model_len": app["args"].max_model_len}],
+    })
+
+async def Health(http_request: web.Request):
+    return web.Response(text="")
+
+async def StartEngine(app: web.Application):
+    app["engine_task"] = asyncio.create_task(app["engine"].Loop())
+
+async def StopEngine(app: web.Application):
+    app["engine_task"].cancel()
+    logger.info(f"[{py_script}] {app['engine'].n_steps} engine steps.")
+
+def CreateApp(args):
+    app = web.Application()
+    app["args"] = args
+    app["model"] = args.model
+    app["created"] = int(time.time())
+    app["token_text"] = " x"
+    app["engine"] = MockEngine(args)
+    app["limit"] = asyncio.Semaphore(args.max_concurrency)
+    app.on_startup.append(StartEngine)
+    app.on_cleanup.append(StopEngine)
+    app.router.add_post("/v1/completions", Completions)
+    app.router.add_get("/v1/models", Models)
+    app.router.add_get("/health", Health)
+    app.router.add_get("/", Health)
+    return app
+
+def main(args):
+    logger.info(f"[{py_script}] Serving mock model '{args.model}' on {args.host}:{args.port}")
+    if args.startup_delay > 0:
+        # Like a real engine loading weights, the port stays closed meanwhile
+        time.sleep(args.startup_delay)
+    web.run_app(CreateApp(args), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible streaming server with a batching latency model")
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--model", type=str, default="mock", help="Served model name, e.g., the model path given to benchmark.sh")
+    parser.add_argument("--strict-model", action="store_true", help="Reject requests for any other model name")
+    parser.add_argument("--prefill-ms", type=float, default=2.0, help="Fixed cost of a step that runs prefill")
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.01, help="Prefill cost per input token")
+    parser.add_argument("--decode-ms", type=float, default=8.0, help="Fixed cost of one decode step")
+    parser.add_argument("--decode-ms-per-seq", type=float, default=0.02, help="Extra decode step cost per running sequence")
+    parser.add_argument("--max-num-seqs", type=int, default=256, help="Max running batch size")
+    parser.add_argument("--max-num-batched-tokens", type=int, default=8192, help="Max prefill tokens admitted in one step")
+    parser.add_argument("--max-model-len", type=int, default=4096)
+    parser.add_argument("--max-concurrency", type=int, default=1024, help="Max in-flight HTTP requests, the rest wait")
+    parser.add_argument("--startup-delay", type=float, default=0, help="Seconds to wait before opening the port")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+python mock_server.py --port 8123 --model /data/huggingface/hub/meta-llama/Llama-3.1-8B-Instruct
+python bench_client.py --port 8123 --model /data/huggingface/hub/meta-llama/Llama-3.1-8B-Instruct \
+    --num-prompts 300 --random-input-len 128 --random-output-len 128 --max-concurrency 64
+'''
@@ -0,0 +1,197 @@
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("prewarm_logger")
+
+# Reads model weights into the page cache while main.sh starts containers, so the server launches that follow
+# load them from memory instead of the disk. Every file is split into chunks read by a thread pool (os.preadv
+# releases the GIL), or mapped and advised with MADV_WILLNEED. Residency is measured with mincore(2).
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+libc.mmap.restype = ctypes.c_void_p
+libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p]
+MAP_FAILED = ctypes.c_void_p(-1).value
+
+def ListFiles(paths: list, pattern: str):
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, _, names in os.walk(path):
+            files += [os.path.join(root, name) for name in sorted(names) if fnmatch.fnmatch(name, pattern)]
+    return files
+
+def ResidentBytes(file: str):
+    # Bytes of the file in the page cache, the file is mapped but never touched
+    size = os.path.getsize(file)
+    if size == 0:
+        return 0
+    fd = os.open(file, os.O_RDONLY)
+    try:
+        address = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+        if address == MAP_FAILED:
+            raise OSError(ctypes.get_errno(), f"mmap failed for {file}")
+        try:
+            n_pages = (size + PAGE_SIZE - 1) // PAGE_SIZE
+            vec = ctypes.create_string_buffer(n_pages)
+            if libc.mincore(address, size, vec) != 0:
+                raise OSError(ctypes.get_errno(), f"mincore failed for {file}")
+            resident = int(np.count_nonzero(np.frombuffer(vec.raw, dtype=np.uint8) & 1))
+        finally:
+            libc.munmap(address, size)
+    finally:
+        os.close(fd)
+    return min(resident * PAGE_SIZE, size)
+
+def Evict(file: str):
+    # Drop the clean pages of the file from the page cache, no root needed. For measuring a cold read.
+    fd = os.open(file, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def ReadChunk(fd: int, offset: int, length: int, buffers: dict):
+    # One reusable buffer per thread, the data is thrown away. A thread's first chunk may be the short tail of a
+    # file, so the buffer grows to the largest chunk it reads.
+    buffer = buffers.get(threading.get_ident())
+    if buffer is None or len(buffer) < length:
+        buffer = buffers[threading.get_ident()] = bytearray(length)
+    view = memoryview(buffer)[:length]
+    done = 0
+    while done < length:
+        n = os.preadv(fd, [view[done:]], offset + done)
+        if n == 0:
+            break
+        done += n
+    return done
+
+def PrewarmRead(files: list, workers: int, chunk_size: int):
+    fds = {file: os.open(file, os.O_RDONLY) for file in files}
+    try:
+        for file, fd in fds.items():
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        chunks = [(fds[file], offset, min(chunk_size, os.path.getsize(file) - offset))
+                  for file in files for offset in range(0, os.path.getsize(file), chunk_size)]
+        buffers = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(lambda chunk: ReadChunk(*chunk, buffers), chunks))
+    finally:
+        for fd in fds.values():
+            os.close(fd)
+
+def PrewarmMadvise(files: list, workers: int):
+    # The kernel reads ahead asynchronously after MADV_WILLNEED, touching one byte per page waits for it
+    def Prewarm(file: str):
+        size = os.path.getsize(file)
+        if size == 0:
+            return 0
+        with open(file, "rb") as f, mmap.mmap(f.fileno(), size, prot=mmap.PROT_READ) as m:
+            m.madvise(mmap.MADV_WILLNEED)
+            for offset in range(0, size, PAGE_SIZE):
+                m[offset]
+        return size
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(Prewarm, files))
+
+def MemAvailable():
+    with open("/proc/meminfo", "r") as f:
+        for line in f:
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+def main(args):
+    files = ListFiles(args.paths, args.pattern)
+    if not files:
+        logger.warning(f"[{py_script}] No '{args.pattern}' file under {args.paths}.")
+        return
+    # Weights beyond the free memory would evict the ones read before them
+    budget = args.max_gb * (1 << 30) if args.max_gb else 0.8 * (MemAvailable() or float("inf"))
+    selected, total = [], 0
+    for file in files:
+        if total + os.path.getsize(file) > budget:
+            logger.warning(f"[{py_script}] {file} and later files exceed the budget of {budget / (1 << 30):.1f} GB, skip them.")
+            break
+        selected.append(file)
+        total += os.path.getsize(file)
+
+    if args.evict:
+        for file in selected:
+            Evict(file)
+    resident_before = {file: ResidentBytes(file) for file in selected}
+    start = time.time()
+    read = 0 # Bytes actually read, short reads included
+    if not args.check_only:
+        if args.method == "read":
+            read = PrewarmRead(selected, args.workers, args.chunk_mb << 20)
+        else:
+            read = PrewarmMadvise(selected, args.workers)
+        if read < total:
+            logger.warning(f"[{py_script}] Only {read} of {total} bytes were read.")
+    seconds = time.time() - start
+    resident_after = {file: ResidentBytes(file) for file in selected}
+
+    cold = sum(os.path.getsize(file) - resident_before[file] for file in selected) # Bytes that came from the disk
+    report = {
+        "method": args.method,
+        "workers": args.workers,
+        "files": len(selected),
+        "skipped_files": len(files) - len(selected),
+        "total_bytes": total,
+        "read_bytes": read,
+        "seconds": seconds,
+        "bandwidth_GBps": read / seconds / 1e9 if seconds > 0 else None,
+        "cold_bandwidth_GBps": cold / seconds / 1e9 if seconds > 0 else None,
+        "resident_before": sum(resident_before.values()) / total if total else None,
+        "resident_after": sum(resident_after.values()) / total if total else None,
+        "per_file": {file: {"bytes": os.path.getsize(file),
+                            "resident_before": resident_before[file] / max(os.path.getsize(file), 1),
+                            "resident_after": resident_after[file] / max(os.path.getsize(file), 1)} for file in selected},
+    }
+    if not args.check_only:
+        logger.info(f"[{py_script}] Read {read / 1e9:.1f} GB in {seconds:.1f}s with {args.workers} {args.method} workers: "
+                    f"{report['bandwidth_GBps']:.2f} GB/s, {report['cold_bandwidth_GBps']:.2f} GB/s from the disk.")
+    logger.info(f"[{py_script}] Resident in the page cache: {report['resident_before']:.1%} before, {report['resident_after']:.1%} after.")
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read model weights into the page cache ahead of the server launch")
+    parser.add_argument("paths", nargs="+", help="Model folders or files")
+    parser.add_argument("--pattern", type=str, default="*.safetensors", help="File name pattern inside the folders")
+    parser.add_argument("--method", type=str, default="read", choices=["read", "madvise"],
+                        help="read: chunks read by a thread pool. madvise: mmap + MADV_WILLNEED per file")
+    parser.add_argument("--workers", type=int, default=16, help="Parallel readers")
+    parser.add_argument("--chunk-mb", type=int, default=16, help="Read size of the read method")
+    parser.add_argument("--max-gb", type=float, default=None, help="Read at most this much (default: 80%% of the available memory)")
+    parser.add_argument("--evict", action="store_true", help="(Testing) Drop the files from the page cache first to measure a cold read")
+    parser.add_argument("--check-only", action="store_true", help="Only report how much of the files is resident")
+    parser.add_argument("--json-file", type=str, default=None, help="Save the report here")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+python3 prewarm.py $HOME/data/huggingface/hub/meta-llama/Llama-3.3-70B-Instruct --json-file Result/2025-08-18/Prewarm.json
+python3 prewarm.py /tmp/big_files --pattern "*" --evict --workers 8
+'''
@@ -8,10 +8,79 @@ import time
 import logging
 import uvicorn
 import json
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+def log_phase(message):
+    # Timestamped like the Ray logs so startup_phases.py can time the phases of this start
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S,%f} [ray_engine.py] {message}", flush=True)
+
+class MockLLMEngine:
+    """CPU-only stand-in for the engine inside LLMServer, for timing the Ray Serve layer alone (see RouterSweep.py).
+    Tokens come from the batching loop of mock_server.py with the latency model in experimental_configs["mock_engine"],
+    so mock_server.py run directly with the same arguments is the same engine without Ray. Streams the same SSE chunks
+    as vLLM."""
+    def __init__(self, llm_config, *args, **kwargs):
+        self.llm_config = llm_config
+        self.model = llm_config.model_loading_config.model_id
+
+    async def start(self):
+        from mock_server import MockEngine
+        self.engine = MockEngine(SimpleNamespace(**self.llm_config.experimental_configs["mock_engine"]))
+        self.loop_task = asyncio.create_task(self.engine.Loop())
+
+    async def check_health(self):
+        if self.loop_task.done():
+            raise RuntimeError("The mock engine loop stopped")
+
+    async def reset_prefix_cache(self):
+        pass
+
+    async def resolve_lora(self, *args, **kwargs):
+        pass
+
+    async def _Tokens(self, input_len: int, output_len: int):
+        from mock_server import Request
+        request = Request(input_len, output_len)
+        self.engine.Add(request)
+        while (token := await request.tokens.get()) is not None:
+            yield token
+
+    async def completions(self, request):
+        from mock_server import GetInputLen, Chunk
+        input_len, output_len = GetInputLen(request.prompt), request.max_tokens or 16
+        request_id = f"cmpl-{uuid.uuid4().hex}"
+        usage = {"prompt_tokens": input_len, "completion_tokens": output_len, "total_tokens": input_len + output_len}
+        async for token in self._Tokens(input_len, output_len):
+            if request.stream:
+                yield Chunk(request_id, self.model, " x", "length" if token == output_len else None).decode()
+        if not request.stream:
+            from ray.serve.llm.openai_api_models import CompletionResponse
+            yield CompletionResponse(id=request_id, model=self.model, usage=usage,
+                                     choices=[{"index": 0, "text": " x" * output_len, "finish_reason": "length"}])
+        elif (request.stream_options and request.stream_options.include_usage):
+            yield Chunk(request_id, self.model, "", usage=usage).decode()
+
+    async def chat(self, request):
+        input_len = max(sum(len(str(message.content).split()) for message in request.messages), 1)
+        output_len = request.max_tokens or request.max_completion_tokens or 16
+        request_id = f"chatcmpl-{uuid.uuid4().hex}"
+        async for token in self._Tokens(input_len, output_len):
+            if request.stream:
+                chunk = {"id": request_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": self.model,
+                         "choices": [{"index": 0, "delta": {"content": " x"}, "finish_reason": "length" if token == output_len else None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+        if not request.stream:
+            from ray.serve.llm.openai_api_models import ChatCompletionResponse
+            yield ChatCompletionResponse(id=request_id, model=self.model,
+                                         usage={"prompt_tokens": input_len, "completion_tokens": output_len, "total_tokens": input_len + output_len},
+                                         choices=[{"index": 0, "message": {"role": "assistant", "content": " x" * output_len}, "finish_reason": "length"}])
 
 def main():
     parser = argparse.ArgumentParser(description="Deploy and test LLM using Ray Serve")
-    parser.add_argument("--engine", type=str, help="LLM engine:[vLLM, SGLang]", choices=["vLLM", "SGLang"], required=True)
+    parser.add_argument("--engine", type=str, help="LLM engine:[vLLM, SGLang, Mock]. Mock: MockLLMEngine on CPUs", choices=["vLLM", "SGLang", "Mock"], required=True)
     parser.add_argument("--port", type=int, help="server port", default=8000)
     parser.add_argument("--cpu_core_per_llm_replica", type=int, help="cpu core per llm replica", required=True)
     parser.add_argument("--accelerator_type", type=str, help="MI300X or H100", required=True)
@@ -24,19 +93,23 @@ def main():
     parser.add_argument("--kv_type", type=str, default="auto", help="KV cache data type")
     parser.add_argument("--max_model_len", type=int, help="Maximum model length", required=True)
     parser.add_argument("--max_num_batched_tokens", type=int, help="Maximum number of batched tokens", default=8192)
+    parser.add_argument("--stream_batching_interval_ms", type=float, help="Ray Serve batching of streamed tokens", default=50)
+    parser.add_argument("--max_ongoing_requests", type=int, help="Max in-flight requests per LLM replica", default=256)
+    parser.add_argument("--mock_args", type=str, default="{}", help="(Mock) JSON of mock_server.py latency args, e.g., '{\"decode_ms\": 10}'")
     args = parser.parse_args()
     # Create LLMConfig object
 
 
     n_replica=args.llm_replica
     server_config = LLMConfig(
-        llm_engine=args.engine,
+        # LLMConfig has no Mock engine. Mock keeps the default, its engine config is never built (see below)
+        **({} if args.engine == "Mock" else {"llm_engine": args.engine}),
         model_loading_config=dict(
             model_id=args.model_path,
             model_source=args.model_path,
         ),
         deployment_config=dict(
-            max_ongoing_requests=256, 
+            max_ongoing_requests=args.max_ongoing_requests,
             autoscaling_config=dict(
                 initial_replicas=n_replica,
                 min_replicas=n_replica,
@@ -48,13 +121,13 @@ def main():
         ),
         experimental_configs={
             # Maximum batching
-            "stream_batching_interval_ms": 50,
+            "stream_batching_interval_ms": args.stream_batching_interval_ms,
         },
         # accelerator_type=args.accelerator_type,
     )
-    from vllm.config import CompilationConfig
-    vllm_compilation_config = CompilationConfig(full_cuda_graph=False)
     if args.engine == "vLLM":
+        from vllm.config import CompilationConfig
+        vllm_compilation_config = CompilationConfig(full_cuda_graph=False)
         server_config.engine_kwargs=dict(
             swap_space=16,
             tensor_parallel_size=args.tp,
@@ -85,6 +158,12 @@ def main():
             attention_backend="aiter",
             log_level='warning',
         )
+    elif args.engine == "Mock":
+        # Defaults of mock_server.py, overridden by --mock_args. Not engine_kwargs, those are vLLM engine args.
+        mock_engine = dict(prefill_ms=2.0, prefill_ms_per_token=0.01, decode_ms=8.0, decode_ms_per_seq=0.02,
+                           max_num_seqs=256, max_num_batched_tokens=args.max_num_batched_tokens)
+        mock_engine.update(json.loads(args.mock_args))
+        server_config.experimental_configs["mock_engine"] = mock_engine
 
     # Configure LLMRouter with explicit settings
     router_config = LLMConfig(
@@ -99,14 +178,33 @@ def main():
 
 
     print(f"[DEBUG] server_config={server_config}")
-    # Deploy the LLMServer. name_prefix must be "vLLM" to help parsing correctly in utils.sh
-    deployment = LLMServer.as_deployment(server_config.get_serve_options(name_prefix=f"{args.engine}:")).bind(server_config)
+    # Deploy the LLMServer. The deployment name starts with "<engine>:", server_lifecycle.py --deployment-prefix
+    # waits for the replicas of that engine
+    if args.engine == "Mock":
+        # get_serve_options would build the vLLM engine config for the GPU placement group. A mock replica is
+        # one actor on CPUs, so the options are set here.
+        serve_options = dict(
+            name=f"Mock:{args.model_path.replace('/', '--').replace('.', '_')}",
+            max_ongoing_requests=args.max_ongoing_requests,
+            autoscaling_config=dict(initial_replicas=n_replica, min_replicas=n_replica, max_replicas=n_replica),
+            ray_actor_options=dict(num_cpus=args.cpu_core_per_llm_replica, num_gpus=0,
+                                   runtime_env={"env_vars": {"PYTHONPATH": os.path.dirname(os.path.abspath(__file__))}}), # mock_server.py
+        )
+        deployment = LLMServer.as_deployment(serve_options).bind(server_config, engine_cls=MockLLMEngine)
+    else:
+        serve_options = server_config.get_serve_options(name_prefix=f"{args.engine}:")
+        deployment = LLMServer.as_deployment(serve_options).bind(server_config)
     llm_app = LLMRouter.as_deployment([router_config]).bind([deployment])
 
     # Run the serve deployment
+    if args.engine == "Mock":
+        # Every router replica takes one CPU of the Ray cluster, give a small host enough for the whole topology
+        ray.init(num_cpus=max(os.cpu_count(), args.router_replica + n_replica * args.cpu_core_per_llm_replica))
+    log_phase("Starting Ray Serve")
     serve.start(http_options={"host": "0.0.0.0", "port": args.port})
     logging_config = LoggingConfig(log_level="WARNING")
     serve.run(llm_app, logging_config=logging_config)
+    log_phase("Deployed app 'default'")
     
     while True:
         time.sleep(100)
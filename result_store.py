@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("result_store_logger")
+
+DEFAULT_DB = "Result/results.db"
+# Accuracy rows use the engine name as bench_type, e.g., ("vLLM", model, "gsm8k", "Accuracy")
+ACCURACY_CONFIG = "gsm8k"
+ACCURACY_METRIC = "Accuracy"
+# Startup rows use this config, e.g., ("vLLM_standalone", model, "startup", "Weight load (s)")
+STARTUP_CONFIG = "startup"
+
+# One typed row per (date, docker, bench_type, model, config, metric).
+# The primary key starts with the series keys and ends with date, so
+# "one metric of one config over a date range" is a single index range scan.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    date       TEXT NOT NULL,
+    docker     TEXT NOT NULL DEFAULT '',
+    bench_type TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    config     TEXT NOT NULL,
+    metric     TEXT NOT NULL,
+    value      REAL,
+    PRIMARY KEY (bench_type, model, config, metric, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_date ON results (date);
+CREATE INDEX IF NOT EXISTS idx_results_docker ON results (docker);
+"""
+
+def OpenStore(db_path: str = DEFAULT_DB):
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def GetDockerName(data: dict, bench_type: str):
+    engine = bench_type.split('_')[0] # e.g., vLLM_ray -> vLLM
+    return data.get(f"{engine} Docker", "")
+
+def ResultJsonToRows(data: dict, date_str: str):
+    rows = []
+    for engine, model_dict in data.get("Accuracy", {}).items():
+        for model, value in model_dict.items():
+            if value is None:
+                continue
+            rows.append((date_str, GetDockerName(data, engine), engine, model, ACCURACY_CONFIG, ACCURACY_METRIC, float(value)))
+
+    for bench_type, model_dict in data.get("Startup", {}).items():
+        docker = GetDockerName(data, bench_type)
+        for model, metric_dict in model_dict.items():
+            for metric, value in metric_dict.items():
+                if value is None:
+                    continue
+                rows.append((date_str, docker, bench_type, model, STARTUP_CONFIG, metric, float(value)))
+
+    for bench_type, model_dict in data.get("Benchmark", {}).items():
+        docker = GetDockerName(data, bench_type)
+        for model, config_dict in model_dict.items():
+            for config, metric_dict in config_dict.items():
+                for metric, value in metric_dict.items():
+                    if value is None:
+                        continue
+                    rows.append((date_str, docker, bench_type, model, config, metric, float(value)))
+    return rows
+
+def SaveRows(conn, rows: list, date_str: str):
+    # Replace everything recorded for this date in one transaction. Other dates are untouched.
+    with conn:
+        conn.execute("DELETE FROM results WHERE date = ?", (date_str,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO results (date, docker, bench_type, model, config, metric, value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+def SaveManyDates(conn, rows_by_date: dict):
+    # Replace several dates in one transaction, e.g., a backfill of the whole history.
+    # Rows are inserted in primary key order, so the table is appended to instead of split page by page.
+    rows = sorted((row for date_rows in rows_by_date.values() for row in date_rows), key=lambda r: (r[2], r[3], r[4], r[5], r[0]))
+    with conn:
+        conn.executemany("DELETE FROM results WHERE date = ?", [(date_str,) for date_str in rows_by_date])
+        conn.executemany(
+            "INSERT OR REPLACE INTO results (date, docker, bench_type, model, config, metric, value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+def SaveResultJson(conn, json_file: str, date_str: str = None):
+    with open(json_file, "r") as f:
+        data = json.load(f)
+    if date_str is None:
+        date_str = data.get("Date", json_file.split('/')[-2]) # e.g., Result/2025-08-12/Result.json
+    rows = ResultJsonToRows(data, date_str)
+    SaveRows(conn, rows, date_str)
+    return len(rows)
+
+def GetSince(days: int):
+    if days is None:
+        return "0000-00-00"
+    return (date.today() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+def QuerySeries(conn, bench_type: str, model: str, config: str, metric: str, days: int = None):
+    # e.g., TTFT of i2048_o128_c256_p1000 on vLLM_standalone over the last 180 days
+    cursor = conn.execute(
+        "SELECT date, value FROM results "
+        "WHERE bench_type = ? AND model = ? AND config = ? AND metric = ? AND date >= ? "
+        "ORDER BY date", (bench_type, model, config, metric, GetSince(days)))
+    return cursor.fetchall()
+
+def LoadHistory(conn, bench_types: list, models: list, metrics: list = None, days: int = None):
+    """Return (dates, history) where history[(bench_type, model, config, metric)][date] = value."""
+    query = (f"SELECT date, bench_type, model, config, metric, value FROM results "
+             f"WHERE bench_type IN ({','.join('?' * len(bench_types))}) "
+             f"AND model IN ({','.join('?' * len(models))}) AND date >= ?")
+    params = list(bench_types) + list(models) + [GetSince(days)]
+    if metrics:
+        query += f" AND metric IN ({','.join('?' * len(metrics))})"
+        params += list(metrics)
+
+    dates = set()
+    history = {}
+    for date_str, bench_type, model, config, metric, value in conn.execute(query, params):
+        dates.add(date_str)
+        history.setdefault((bench_type, model, config, metric), {})[date_str] = value
+    return sorted(dates), history
+
+def LoadDockerNames(conn):
+    # {(date, bench_type): docker}
+    dockers = {}
+    for date_str, bench_type, docker in conn.execute("SELECT DISTINCT date, bench_type, docker FROM results"):
+        dockers[(date_str, bench_type)] = docker
+    return dockers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Path to the results database.")
+    parser.add_argument("--json-file", type=str, default=None, help="Save this Result.json into the database.")
+    parser.add_argument("--bench-type", type=str, default=None, help="(Query) e.g., vLLM_standalone")
+    parser.add_argument("--model", type=str, default=None, help="(Query) e.g., meta-llama_Llama-3.1-8B-Instruct")
+    parser.add_argument("--config", type=str, default=None, help="(Query) e.g., i2048_o128_c256_p1000")
+    parser.add_argument("--metric", type=str, default=None, help="(Query) e.g., 'Mean TTFT (ms)'")
+    parser.add_argument("--days", type=int, default=None, help="(Query) Only return the last N days")
+    args = parser.parse_args()
+
+    conn = OpenStore(args.db)
+    if args.json_file is not None:
+        if not os.path.exists(args.json_file):
+            logger.error(f"[{py_script}] Error: Json file {args.json_file} doesn't exist.")
+            sys.exit(1)
+        n_rows = SaveResultJson(conn, args.json_file)
+        logger.info(f"[{py_script}] Saved {n_rows} rows from '{args.json_file}' to '{args.db}'.")
+    elif None not in (args.bench_type, args.model, args.config, args.metric):
+        for date_str, value in QuerySeries(conn, args.bench_type, args.model, args.config, args.metric, args.days):
+            print(f"{date_str},{value}")
+    else:
+        logger.error(f"[{py_script}] Either --json-file or all of --bench-type/--model/--config/--metric are required.")
+        sys.exit(1)
+    conn.close()
+
+'''
+python $HOME/CI/result_store.py --json-file $HOME/CI/Result/2025-08-12/Result.json
+
+# Import every existing date folder
+for f in $HOME/CI/Result/*/Result.json; do python $HOME/CI/result_store.py --json-file $f; done
+
+python $HOME/CI/result_store.py --bench-type vLLM_standalone --model meta-llama_Llama-3.1-8B-Instruct \
+    --config i2048_o128_c256_p1000 --metric "Mean TTFT (ms)" --days 180
+'''
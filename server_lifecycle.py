@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("server_lifecycle_logger")
+
+# Launch a vLLM/SGLang/ray_engine.py server and return once it serves requests, then stop it by process group.
+# The server runs in its own session, so `stop` signals exactly its process tree and nothing else of ours.
+# Timestamps of every phase are kept in --state-file.
+
+GPU_MEMORY_MARGIN = 1 << 30 # Bytes a GPU may still hold above its pre-launch usage and count as released
+LAUNCH_MARKER = "[server_lifecycle.py] Launch" # Written to --log-file before every launch, see startup_phases.py
+
+def Now():
+    return time.time()
+
+def IsoTime(t: float):
+    return datetime.fromtimestamp(t).isoformat(timespec="milliseconds")
+
+def LoadState(state_file: str):
+    with open(state_file, "r") as f:
+        return json.load(f)
+
+def SaveState(state_file: str, state: dict):
+    folder = os.path.dirname(state_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(state_file, "w") as f:
+        json.dump(state, f, indent=4)
+
+def FetchJson(url: str, timeout: float = 5):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def IsOpenAIReady(host: str, port: int):
+    try:
+        return "data" in FetchJson(f"http://{host}:{port}/v1/models")
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
+
+def IsRayServeReady(api_url: str, deployment_prefix: str):
+    # Every replica of the engine deployment is RUNNING, e.g., deployment "vLLM:meta-llama--Llama-3_1-8B-Instruct",
+    # and so is the application, i.e., the router in front of it
+    try:
+        application = FetchJson(api_url)["applications"]["default"]
+        deployments = application["deployments"]
+    except (urllib.error.URLError, OSError, ValueError, KeyError, TypeError):
+        return False
+    replicas = [replica for name, deployment in deployments.items() if name.startswith(deployment_prefix)
+                for replica in deployment.get("replicas", [])]
+    return (application.get("status") == "RUNNING" and len(replicas) > 0
+            and all(replica.get("state") == "RUNNING" for replica in replicas))
+
+def IsPortFree(host: str, port: int):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(1)
+        return s.connect_ex((host, port)) != 0
+
+def GetVisibleDevices():
+    devices = os.environ.get("HIP_VISIBLE_DEVICES") or os.environ.get("CUDA_VISIBLE_DEVICES")
+    return [int(d) for d in devices.split(",")] if devices else None
+
+def GetGpuUsedMemory():
+    # {gpu index: used VRAM bytes}, None when no tool is available
+    try:
+        output = subprocess.run(["rocm-smi", "--showmeminfo", "vram", "--json"], capture_output=True, text=True, timeout=30).stdout
+        cards = json.loads(output)
+        return {int(card.replace("card", "")): int(info["VRAM Total Used Memory (B)"])
+                for card, info in cards.items() if card.startswith("card")}
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError):
+        pass
+    try:
+        output = subprocess.run(["nvidia-smi", "--query-gpu=index,memory.used", "--format=csv,noheader,nounits"],
+                                capture_output=True, text=True, timeout=30).stdout
+        return {int(index): int(used) << 20 for index, used in (line.split(",") for line in output.strip().splitlines())}
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+def Start(args):
+    devices = GetVisibleDevices()
+    gpu_memory = GetGpuUsedMemory()
+    log = open(args.log_file, "a") if args.log_file else None
+    if log:
+        log.write(f"{LAUNCH_MARKER} {IsoTime(Now())}: {' '.join(args.cmd)}\n")
+        log.flush()
+    process = subprocess.Popen(args.cmd, start_new_session=True, stdout=log, stderr=subprocess.STDOUT if log else None)
+    state = {
+        "cmd": args.cmd,
+        "pid": process.pid,
+        "pgid": os.getpgid(process.pid),
+        "port": args.port,
+        "devices": devices,
+        "gpu_memory_before": gpu_memory,
+        "launch_time": IsoTime(Now()),
+        "launch_epoch": Now(),
+    }
+    SaveState(args.state_file, state)
+    logger.info(f"[{py_script}] Launched pid {process.pid}: {' '.join(args.cmd)}")
+
+    # Poll with backoff, a fast server is seen within half a second and a slow one isn't hammered
+    delay = args.min_interval
+    while True:
+        if args.ray_api:
+            ready = IsRayServeReady(args.ray_api, args.deployment_prefix)
+        else:
+            ready = IsOpenAIReady(args.host, args.port)
+        if ready:
+            break
+        if process.poll() is not None:
+            state["exit_code"] = process.returncode
+            SaveState(args.state_file, state)
+            logger.error(f"[{py_script}] Server exited with code {process.returncode} before it was ready.")
+            sys.exit(1)
+        if Now() - state["launch_epoch"] > args.timeout:
+            logger.error(f"[{py_script}] Server is not ready after {args.timeout}s, stopping it.")
+            Stop(args)
+            sys.exit(1)
+        time.sleep(delay)
+        delay = min(delay * 1.5, args.max_interval)
+
+    state["ready_epoch"] = Now()
+    state["ready_time"] = IsoTime(state["ready_epoch"])
+    state["startup_seconds"] = state["ready_epoch"] - state["launch_epoch"]
+    SaveState(args.state_file, state)
+    logger.info(f"[{py_script}] Server is ready after {state['startup_seconds']:.1f}s.")
+
+def IsGroupAlive(pgid: int):
+    try:
+        os.killpg(pgid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+def WaitUntil(condition, timeout: float, interval: float = 0.2):
+    deadline = Now() + timeout
+    while Now() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+def IsGpuMemoryReleased(before: dict, devices: list):
+    after = GetGpuUsedMemory()
+    if after is None or before is None:
+        return True
+    indices = devices if devices is not None else list(after)
+    return all(after.get(i, 0) <= before.get(str(i), before.get(i, 0)) + GPU_MEMORY_MARGIN for i in indices)
+
+def KillGroup(pgid: int, sig: int):
+    # The group may exit between the liveness check and the signal
+    try:
+        os.killpg(pgid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+
+def Stop(args):
+    state = LoadState(args.state_file)
+    pgid = state["pgid"]
+    state["stop_epoch"] = Now()
+    state["stop_time"] = IsoTime(state["stop_epoch"])
+
+    # SIGTERM lets the engines free their workers, SIGKILL only after the grace period
+    state["killed"] = False
+    if IsGroupAlive(pgid):
+        KillGroup(pgid, signal.SIGTERM)
+        if not WaitUntil(lambda: not IsGroupAlive(pgid), args.grace):
+            logger.warning(f"[{py_script}] Process group {pgid} is alive after {args.grace}s, sending SIGKILL.")
+            state["killed"] = KillGroup(pgid, signal.SIGKILL)
+            WaitUntil(lambda: not IsGroupAlive(pgid), 10)
+    if args.ray:
+        # Ray daemons run in their own sessions
+        subprocess.run(["ray", "stop", "--force"], capture_output=True)
+
+    port = state.get("port")
+    state["port_free"] = port is None or WaitUntil(lambda: IsPortFree("127.0.0.1", port), args.timeout)
+    state["gpu_memory_released"] = WaitUntil(lambda: IsGpuMemoryReleased(state.get("gpu_memory_before"), state.get("devices")),
+                                             args.timeout, interval=1)
+    state["stopped_epoch"] = Now()
+    state["stopped_time"] = IsoTime(state["stopped_epoch"])
+    state["stop_seconds"] = state["stopped_epoch"] - state["stop_epoch"]
+    SaveState(args.state_file, state)
+    if not state["port_free"] or not state["gpu_memory_released"]:
+        logger.error(f"[{py_script}] Server is stopped but port free={state['port_free']}, "
+                     f"GPU memory released={state['gpu_memory_released']} after {args.timeout}s.")
+        sys.exit(1)
+    logger.info(f"[{py_script}] Server is stopped in {state['stop_seconds']:.1f}s, port and GPU memory are free.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start a server and wait for readiness, or stop it by process group")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    start = subparsers.add_parser("start", help="Launch the command after '--' and return once it is ready")
+    start.add_argument("--state-file", type=str, required=True, help="Pid and timestamps of the server")
+    start.add_argument("--host", type=str, default="127.0.0.1")
+    start.add_argument("--port", type=int, required=True)
+    start.add_argument("--ray-api", type=str, default=None, help="Ray Serve API, e.g., http://localhost:8265/api/serve/applications/. "
+                       "Readiness is checked there instead of /v1/models")
+    start.add_argument("--deployment-prefix", type=str, default="vLLM", help="Ray Serve deployment name prefix of the engine")
+    start.add_argument("--log-file", type=str, default=None, help="Save the server output here instead of the console")
+    start.add_argument("--timeout", type=float, default=3600, help="Seconds to wait for readiness")
+    start.add_argument("--min-interval", type=float, default=0.5, help="First polling interval in seconds")
+    start.add_argument("--max-interval", type=float, default=5, help="Max polling interval in seconds")
+    start.add_argument("--grace", type=float, default=30, help="Used when the server times out, see stop")
+    start.add_argument("--ray", action="store_true", help="Used when the server times out, see stop")
+    start.add_argument("cmd", nargs=argparse.REMAINDER, help="-- followed by the server command")
+
+    stop = subparsers.add_parser("stop", help="Stop the server of --state-file")
+    stop.add_argument("--state-file", type=str, required=True)
+    stop.add_argument("--grace", type=float, default=30, help="Seconds between SIGTERM and SIGKILL")
+    stop.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the port and GPU memory to be free")
+    stop.add_argument("--ray", action="store_true", help="Also run 'ray stop --force'")
+    args = parser.parse_args()
+
+    if args.action == "start":
+        if args.cmd and args.cmd[0] == "--":
+            args.cmd = args.cmd[1:]
+        if not args.cmd:
+            parser.error("The server command is missing")
+        Start(args)
+    else:
+        Stop(args)
+
+
+'''
+python3 server_lifecycle.py start --state-file /tmp/server.json --port 8123 -- \
+    vllm serve /data/huggingface/hub/meta-llama/Llama-3.1-8B-Instruct --port 8123
+python3 server_lifecycle.py stop --state-file /tmp/server.json
+'''
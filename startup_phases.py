@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from utils import setup_logger
+from server_lifecycle import LAUNCH_MARKER
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("startup_phases_logger")
+
+# Timings of one server start, from the server log written by server_lifecycle.py --log-file and its --state-file.
+# Every known phase is stamped with the timestamp of its first log line, in seconds after the launch.
+# Lines without a timestamp (tracebacks, progress bars) take the timestamp of the line before them.
+
+PHASES = {
+    "vLLM": [
+        ("weight_load_start", r"Starting to load model"),
+        ("weight_load_end", r"Loading weights took|Model loading took"),
+        ("compile_end", r"torch\.compile takes"),
+        ("kv_cache", r"GPU KV cache size|Available KV cache memory"),
+        ("graph_capture_start", r"Capturing CUDA graph"),
+        ("graph_capture_end", r"Graph capturing finished"),
+        ("api_server", r"Starting vLLM API server|Application startup complete"),
+    ],
+    "SGLang": [
+        ("weight_load_start", r"Load weight begin"),
+        ("weight_load_end", r"Load weight end"),
+        ("kv_cache", r"KV Cache is allocated|Memory pool end"),
+        ("graph_capture_start", r"Capture cuda graph begin"),
+        ("graph_capture_end", r"Capture cuda graph end"),
+        ("api_server", r"The server is fired up and ready to roll|Application startup complete"),
+    ],
+    "Ray": [
+        ("ray_start", r"Started a local Ray instance|Connected to Ray cluster|Starting Ray Serve"),
+        ("replica_placement", r"Adding \d+ replicas? to Deployment"),
+        ("app_ready", r"Application '[^']*' is ready|Deployed app"),
+    ],
+}
+
+# metric: (from phase, to phase), "launch" is 0. A metric whose phases aren't both logged is left out.
+PHASE_METRICS = {
+    "Weight load (s)": ("weight_load_start", "weight_load_end"),
+    "torch.compile (s)": ("weight_load_end", "compile_end"),
+    "Graph capture (s)": ("graph_capture_start", "graph_capture_end"),
+}
+RAY_METRICS = {
+    "Ray placement (s)": ("launch", "weight_load_start"),
+}
+
+# vLLM: "INFO 08-18 12:34:56 [loader.py:...]", SGLang: "[2025-08-18 12:34:56 TP0]", Ray: "2025-08-18 12:34:56,123"
+TIMESTAMP_PATTERNS = [
+    (re.compile(r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:[.,](\d+))?"), True),
+    (re.compile(r"(?:DEBUG|INFO|WARNING|ERROR|CRITICAL)\s+(\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:[.,](\d+))?"), False),
+]
+
+def ParseTimestamp(line: str, launch: datetime):
+    for pattern, has_year in TIMESTAMP_PATTERNS:
+        match = pattern.search(line)
+        if match is None:
+            continue
+        text, fraction = match.group(1).replace("T", " "), match.group(2)
+        if has_year:
+            t = datetime.strptime(text, "%Y-%m-%d %H:%M:%S")
+        else:
+            # vLLM logs have no year, a start around New Year's Eve may cross into the next one
+            t = datetime.strptime(f"{launch.year}-{text}", "%Y-%m-%d %H:%M:%S")
+            if t < launch - timedelta(days=1):
+                t = t.replace(year=launch.year + 1)
+        if fraction:
+            t += timedelta(seconds=float(f"0.{fraction}"))
+        return t
+    return None
+
+def LastLaunch(lines: list):
+    # A restarted server appends to the same log, only its last start counts
+    starts = [i for i, line in enumerate(lines) if line.startswith(LAUNCH_MARKER)]
+    return lines[starts[-1] + 1:] if starts else lines
+
+def ParsePhases(lines: list, engine: str, ray: bool, launch: datetime):
+    """{phase: seconds after the launch} of the first log line of every known phase."""
+    patterns = [(phase, re.compile(regex)) for phase, regex in PHASES[engine] + (PHASES["Ray"] if ray else [])]
+    phases = {}
+    last_time = None
+    for line in lines:
+        t = ParseTimestamp(line, launch)
+        if t is not None:
+            last_time = t
+        if last_time is None:
+            continue
+        for phase, pattern in patterns:
+            if phase not in phases and pattern.search(line):
+                phases[phase] = max((last_time - launch).total_seconds(), 0.0)
+    return phases
+
+def StartupMetrics(phases: dict, startup_seconds: float, ray: bool):
+    metrics = {}
+    if startup_seconds is not None:
+        metrics["Startup time (s)"] = startup_seconds
+    known = dict(phases, launch=0.0)
+    for metric, (begin, end) in list(PHASE_METRICS.items()) + (list(RAY_METRICS.items()) if ray else []):
+        if begin in known and end in known and known[end] >= known[begin]:
+            metrics[metric] = known[end] - known[begin]
+    return metrics
+
+def ParseStartup(log_file: str, state_file: str, engine: str, ray: bool):
+    with open(state_file, "r") as f:
+        state = json.load(f)
+    # The log timestamps are local time of the server, like launch_time
+    launch = datetime.fromtimestamp(state["launch_epoch"])
+    lines = []
+    if os.path.exists(log_file):
+        with open(log_file, "r", errors="replace") as f:
+            lines = LastLaunch(f.read().splitlines())
+    phases = ParsePhases(lines, engine, ray, launch)
+    return {
+        "launch_time": state["launch_time"],
+        "ready_time": state.get("ready_time"),
+        "phases": phases,
+        "metrics": StartupMetrics(phases, state.get("startup_seconds"), ray),
+    }
+
+def main(args):
+    startup = ParseStartup(args.log_file, args.state_file, args.engine, args.ray)
+    with open(args.out_json, "w") as f:
+        json.dump(startup, f, indent=4)
+    summary = ", ".join(f"{metric} {value:.1f}" for metric, value in startup["metrics"].items())
+    logger.info(f"[{py_script}] {args.engine}{' + Ray' if args.ray else ''} startup: {summary or 'no timing'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the phases of a server start from its log")
+    parser.add_argument("--log-file", type=str, required=True, help="Server log of server_lifecycle.py --log-file")
+    parser.add_argument("--state-file", type=str, required=True, help="State file of server_lifecycle.py")
+    parser.add_argument("--engine", type=str, required=True, choices=["vLLM", "SGLang"])
+    parser.add_argument("--ray", action="store_true", help="The server is ray_engine.py")
+    parser.add_argument("--out-json", type=str, required=True, help="e.g., Result/2025-08-18/vLLM_standalone/<model>/startup.json")
+    args = parser.parse_args()
+
+    main(args)
+
+
+'''
+python3 startup_phases.py --engine vLLM --log-file Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/server.log \
+    --state-file Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/server_lifecycle.json \
+    --out-json Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/startup.json
+'''
@@ -0,0 +1,358 @@
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import numpy as np
+from utils import setup_logger, metric_mapping
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("telemetry_logger")
+
+# Hardware telemetry of a benchmark server, sampled in the background by benchmark.sh.
+#   record:    sample GPU power, GFX clock, temperature, VRAM use and the CPU frequency every --interval seconds
+#              into telemetry_<epoch>.npz (float32 [samples, devices] arrays) until SIGTERM
+#   summarize: cut the samples into the benchmark windows of telemetry_windows.tsv ("test run start end" per line)
+#              and save power, energy, clocks and throttling of every test to telemetry.json
+# ParseBenchmark.py adds the summary to Result.json and derives the output tokens per joule.
+
+CHANNELS = ["power_w", "clock_mhz", "temp_c", "vram_gb"]
+WINDOWS_FILE = "telemetry_windows.tsv"
+SUMMARY_FILE = "telemetry.json"
+FLUSH_SECONDS = 60 # A killed sampler loses at most this much
+
+def CpuMhz():
+    # Mean current frequency of the CPUs, /sys first, /proc/cpuinfo without cpufreq
+    freqs = []
+    for path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"):
+        try:
+            with open(path, "r") as f:
+                freqs.append(int(f.read()) / 1000)
+        except (OSError, ValueError):
+            pass
+    if not freqs and os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo", "r") as f:
+            freqs = [float(line.split(":")[1]) for line in f if line.startswith("cpu MHz")]
+    return float(np.mean(freqs)) if freqs else np.nan
+
+class FakeSource:
+    """Deterministic telemetry for tests and benchmark.sh --mock. After throttle_after seconds
+    the clock drops by 30% and the temperature rises, like a thermally throttled GPU."""
+    name = "fake"
+
+    def __init__(self, devices: list, throttle_after: float = None):
+        self.devices = devices
+        self.throttle_after = throttle_after
+        self.start = time.time()
+
+    def Sample(self):
+        throttled = self.throttle_after is not None and time.time() - self.start >= self.throttle_after
+        n = len(self.devices)
+        return {
+            "power_w": [700.0] * n,
+            "clock_mhz": [1470.0 if throttled else 2100.0] * n,
+            "temp_c": [105.0 if throttled else 70.0] * n,
+            "vram_gb": [150.0] * n,
+        }
+
+    def CpuMhz(self):
+        return 2400.0
+
+class AmdSmiSource:
+    # amdsmi Python library of amd-smi, no process per sample
+    name = "amd-smi"
+
+    def __init__(self, devices: list):
+        import amdsmi
+        self.amdsmi = amdsmi
+        amdsmi.amdsmi_init()
+        handles = amdsmi.amdsmi_get_processor_handles()
+        self.devices = devices if devices is not None else list(range(len(handles)))
+        self.handles = [handles[i] for i in self.devices]
+
+    def _Read(self, function):
+        try:
+            return float(function())
+        except Exception:
+            return np.nan
+
+    def _Power(self, handle):
+        # MI300 reports the current socket power, older GPUs only the average
+        info = self.amdsmi.amdsmi_get_power_info(handle)
+        return next(info[key] for key in ("current_socket_power", "average_socket_power") if info.get(key) not in (None, "N/A"))
+
+    def Sample(self):
+        amdsmi = self.amdsmi
+        sample = {channel: [] for channel in CHANNELS}
+        for handle in self.handles:
+            sample["power_w"].append(self._Read(lambda: self._Power(handle)))
+            sample["clock_mhz"].append(self._Read(lambda: amdsmi.amdsmi_get_clock_info(handle, amdsmi.AmdSmiClkType.GFX)["clk"]))
+            sample["temp_c"].append(self._Read(lambda: amdsmi.amdsmi_get_temp_metric(
+                handle, amdsmi.AmdSmiTemperatureType.HOTSPOT, amdsmi.AmdSmiTemperatureMetric.CURRENT)))
+            sample["vram_gb"].append(self._Read(lambda: amdsmi.amdsmi_get_gpu_memory_usage(handle, amdsmi.AmdSmiMemoryType.VRAM) / (1 << 30)))
+        return sample
+
+    def CpuMhz(self):
+        return CpuMhz()
+
+class RocmSmiSource:
+    # One rocm-smi call per sample, keys differ between ROCm versions so they are matched loosely
+    name = "rocm-smi"
+
+    def __init__(self, devices: list):
+        cards = self._Query()
+        if not cards:
+            raise RuntimeError("rocm-smi returned no card")
+        self.devices = devices if devices is not None else sorted(cards)
+
+    def _Query(self):
+        output = subprocess.run(["rocm-smi", "--showpower", "--showtemp", "--showgpuclocks", "--showmeminfo", "vram", "--json"],
+                                capture_output=True, text=True, timeout=30).stdout
+        cards = {int(card.replace("card", "")): info for card, info in json.loads(output).items() if card.startswith("card")}
+        return cards
+
+    @staticmethod
+    def _Find(info: dict, pattern: str):
+        for key, value in info.items():
+            if re.search(pattern, key):
+                number = re.search(r"[\d.]+", str(value))
+                if number:
+                    return float(number.group())
+        return np.nan
+
+    def Sample(self):
+        cards = self._Query()
+        sample = {channel: [] for channel in CHANNELS}
+        for device in self.devices:
+            info = cards.get(device, {})
+            sample["power_w"].append(self._Find(info, r"Power \(W\)"))
+            sample["clock_mhz"].append(self._Find(info, r"sclk"))
+            sample["temp_c"].append(self._Find(info, r"Temperature.*junction"))
+            sample["vram_gb"].append(self._Find(info, r"VRAM Total Used Memory") / (1 << 30))
+        return sample
+
+    def CpuMhz(self):
+        return CpuMhz()
+
+class SysfsSource:
+    # amdgpu hwmon files: power in uW, temperature in m°C, clock in Hz
+    name = "sysfs"
+
+    def __init__(self, devices: list):
+        cards = []
+        for card in sorted(glob.glob("/sys/class/drm/card[0-9]*"), key=lambda c: int(re.sub(r"\D", "", os.path.basename(c)))):
+            if "-" in os.path.basename(card): # Display connectors, e.g., card0-DP-1
+                continue
+            try:
+                with open(os.path.join(card, "device", "vendor"), "r") as f:
+                    if f.read().strip() != "0x1002":
+                        continue
+            except OSError:
+                continue
+            hwmons = glob.glob(os.path.join(card, "device", "hwmon", "hwmon*"))
+            if hwmons:
+                cards.append((os.path.join(card, "device"), hwmons[0]))
+        if not cards:
+            raise RuntimeError("No amdgpu card in /sys/class/drm")
+        self.devices = devices if devices is not None else list(range(len(cards)))
+        self.cards = [cards[i] for i in self.devices]
+
+    @staticmethod
+    def _Read(*paths, scale: float = 1):
+        for path in paths:
+            try:
+                with open(path, "r") as f:
+                    return int(f.read()) * scale
+            except (OSError, ValueError):
+                continue
+        return np.nan
+
+    @staticmethod
+    def _Labeled(hwmon: str, kind: str, label: str):
+        # e.g., temp2_input of temp2_label "junction", else the first sensor
+        for label_file in glob.glob(os.path.join(hwmon, f"{kind}*_label")):
+            with open(label_file, "r") as f:
+                if f.read().strip() == label:
+                    return label_file.replace("_label", "_input")
+        return os.path.join(hwmon, f"{kind}1_input")
+
+    def Sample(self):
+        sample = {channel: [] for channel in CHANNELS}
+        for device, hwmon in self.cards:
+            sample["power_w"].append(self._Read(os.path.join(hwmon, "power1_average"), os.path.join(hwmon, "power1_input"), scale=1e-6))
+            sample["clock_mhz"].append(self._Read(self._Labeled(hwmon, "freq", "sclk"), scale=1e-6))
+            sample["temp_c"].append(self._Read(self._Labeled(hwmon, "temp", "junction"), scale=1e-3))
+            sample["vram_gb"].append(self._Read(os.path.join(device, "mem_info_vram_used"), scale=1 / (1 << 30)))
+        return sample
+
+    def CpuMhz(self):
+        return CpuMhz()
+
+def OpenSource(name: str, devices: list, throttle_after: float = None):
+    if name == "fake":
+        return FakeSource(devices or [0], throttle_after)
+    candidates = {"amd-smi": AmdSmiSource, "rocm-smi": RocmSmiSource, "sysfs": SysfsSource}
+    order = list(candidates) if name == "auto" else [name]
+    for candidate in order:
+        if candidate == "rocm-smi" and shutil.which("rocm-smi") is None:
+            continue
+        try:
+            return candidates[candidate](devices)
+        except Exception as e:
+            logger.debug(f"[{py_script}] Telemetry source {candidate} is not available: {e}")
+    return None
+
+def SaveSamples(out_file: str, source, times: list, samples: dict, cpu_mhz: list):
+    tmp = out_file + ".tmp.npz"
+    np.savez_compressed(tmp, t=np.asarray(times, dtype=np.float64), cpu_mhz=np.asarray(cpu_mhz, dtype=np.float32),
+                        devices=np.asarray(source.devices), source=np.asarray(source.name),
+                        **{channel: np.asarray(values, dtype=np.float32) for channel, values in samples.items()})
+    os.replace(tmp, out_file)
+
+def Record(args):
+    devices = None if args.devices in (None, "all") else [int(d) for d in args.devices.split(",")]
+    source = OpenSource(args.source, devices, args.fake_throttle_after)
+    if source is None:
+        logger.warning(f"[{py_script}] No telemetry source is available, nothing is recorded.")
+        return
+    stop = {"now": False}
+    def Stop(signum, frame):
+        stop["now"] = True
+    signal.signal(signal.SIGTERM, Stop)
+    signal.signal(signal.SIGINT, Stop)
+
+    times, cpu_mhz = [], []
+    samples = {channel: [] for channel in CHANNELS}
+    last_flush = time.time()
+    logger.info(f"[{py_script}] Recording {source.name} telemetry of devices {source.devices} every {args.interval}s to {args.out}")
+    next_time = time.time()
+    while not stop["now"]:
+        times.append(time.time())
+        sample = source.Sample()
+        for channel in CHANNELS:
+            samples[channel].append(sample[channel])
+        cpu_mhz.append(source.CpuMhz())
+        if time.time() - last_flush >= FLUSH_SECONDS:
+            SaveSamples(args.out, source, times, samples, cpu_mhz)
+            last_flush = time.time()
+        # Fixed rate, a slow sample doesn't shift the following ones
+        next_time += args.interval
+        time.sleep(max(next_time - time.time(), 0))
+    SaveSamples(args.out, source, times, samples, cpu_mhz)
+    logger.info(f"[{py_script}] Saved {len(times)} samples to {args.out}")
+
+def LoadSamples(folder: str):
+    # Every recording of the folder (one per server launch), ordered by time
+    recordings = [dict(np.load(f)) for f in sorted(glob.glob(os.path.join(folder, "telemetry_*.npz")))]
+    recordings = [r for r in recordings if len(r["t"]) > 0]
+    if not recordings:
+        return None
+    n_devices = min(r["power_w"].shape[1] for r in recordings)
+    merged = {"t": np.concatenate([r["t"] for r in recordings]), "cpu_mhz": np.concatenate([r["cpu_mhz"] for r in recordings])}
+    for channel in CHANNELS:
+        merged[channel] = np.concatenate([r[channel][:, :n_devices] for r in recordings])
+    order = np.argsort(merged["t"])
+    return {key: value[order] for key, value in merged.items()}
+
+def LoadWindows(folder: str):
+    # {test: [(start, end), ...]}, one window per run (iter or adaptive)
+    windows = {}
+    path = os.path.join(folder, WINDOWS_FILE)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            for line in f:
+                test, _, start, end = line.split()
+                windows.setdefault(test, []).append((float(start), float(end)))
+    return windows
+
+def SummarizeWindows(samples: dict, windows: list, busy_ratio: float, clock_tolerance: float, temp_limit: float):
+    """Power, energy, clocks and throttling of a test over all its runs, None without samples.
+    A sample is throttled when its device is busy (power >= busy_ratio * the device's max power of the recording)
+    and the clock is clock_tolerance below the device's max clock, or when the temperature reaches temp_limit."""
+    t, power, clock, temp = samples["t"], samples["power_w"], samples["clock_mhz"], samples["temp_c"]
+    with np.errstate(invalid="ignore"):
+        busy = power >= busy_ratio * np.nanmax(power, axis=0)
+        throttled = (busy & (clock < (1 - clock_tolerance) * np.nanmax(clock, axis=0))) | (temp >= temp_limit)
+    energy, seconds, masks = 0.0, 0.0, []
+    for start, end in windows:
+        mask = (t >= start) & (t <= end)
+        if mask.sum() < 2:
+            continue
+        masks.append(mask)
+        total_power = np.nansum(power[mask], axis=1)
+        energy += float(np.sum((total_power[1:] + total_power[:-1]) / 2 * np.diff(t[mask]))) # Trapezoidal rule
+        seconds += float(t[mask][-1] - t[mask][0])
+    if not masks or seconds <= 0:
+        return None
+    mask = np.any(masks, axis=0)
+    busy_samples = busy[mask].sum()
+    return {
+        "Mean GPU power (W)": energy / seconds,
+        "GPU energy (J)": energy,
+        "Mean GPU clock (MHz)": float(np.nanmean(clock[mask])),
+        "Max GPU temperature (C)": float(np.nanmax(temp[mask])),
+        "Max VRAM used (GB)": float(np.nanmax(np.nansum(samples["vram_gb"][mask], axis=1))),
+        "Mean CPU frequency (MHz)": float(np.nanmean(samples["cpu_mhz"][mask])),
+        "Throttled time (%)": float(100 * (throttled[mask] & busy[mask]).sum() / busy_samples) if busy_samples else 0.0,
+    }
+
+def Summarize(args):
+    samples = LoadSamples(args.folder)
+    windows = LoadWindows(args.folder)
+    if samples is None or not windows:
+        logger.warning(f"[{py_script}] No telemetry or benchmark window in {args.folder}.")
+        return
+    summary = {}
+    for test, test_windows in windows.items():
+        result = SummarizeWindows(samples, test_windows, args.busy_ratio, args.clock_tolerance, args.temp_limit)
+        if result is None:
+            continue
+        summary[test] = result
+        if result["Throttled time (%)"] > args.throttle_alert:
+            logger.warning(f"[{py_script}] {test} was throttled {result['Throttled time (%)']:.1f}% of its busy time, "
+                           f"max temperature {result['Max GPU temperature (C)']:.0f}C.")
+    with open(os.path.join(args.folder, SUMMARY_FILE), "w") as f:
+        json.dump(summary, f, indent=4)
+    logger.info(f"[{py_script}] Telemetry of {len(summary)} tests is saved to {os.path.join(args.folder, SUMMARY_FILE)}")
+
+def TokensPerJoule(metrics: dict):
+    # Output tokens per joule of GPU energy: (tok/s) / W
+    tput, power = metrics.get(metric_mapping["tput"]), metrics.get("Mean GPU power (W)")
+    return tput / power if tput and power else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record hardware telemetry of a benchmark server, or summarize it per test")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    record = subparsers.add_parser("record", help="Sample until SIGTERM")
+    record.add_argument("--out", type=str, required=True, help="e.g., Result/2025-08-18/vLLM_standalone/<model>/telemetry_1755500000.npz")
+    record.add_argument("--devices", type=str, default="all", help="Comma separated GPU ids, e.g., $HIP_VISIBLE_DEVICES")
+    record.add_argument("--interval", type=float, default=1, help="Seconds between samples")
+    record.add_argument("--source", type=str, default="auto", choices=["auto", "amd-smi", "rocm-smi", "sysfs", "fake"],
+                        help="auto: amd-smi, then rocm-smi, then /sys")
+    record.add_argument("--fake-throttle-after", type=float, default=None, help="(fake) Throttle after this many seconds")
+
+    summarize = subparsers.add_parser("summarize", help="Save the telemetry of every test of a folder to telemetry.json")
+    summarize.add_argument("--folder", type=str, required=True, help="Folder of the telemetry_*.npz and telemetry_windows.tsv")
+    summarize.add_argument("--busy-ratio", type=float, default=0.5, help="A device is busy above this share of its max power")
+    summarize.add_argument("--clock-tolerance", type=float, default=0.15, help="A busy device is throttled this far below its max clock")
+    summarize.add_argument("--temp-limit", type=float, default=100, help="A device is throttled at this temperature (C)")
+    summarize.add_argument("--throttle-alert", type=float, default=5, help="Warn when a test is throttled more than this %% of its busy time")
+    args = parser.parse_args()
+
+    if args.action == "record":
+        Record(args)
+    else:
+        Summarize(args)
+
+
+'''
+python3 telemetry.py record --out /tmp/telemetry_0.npz --devices 0,1 --interval 0.5 &
+python3 telemetry.py summarize --folder Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct
+'''
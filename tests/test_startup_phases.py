@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+from datetime import datetime
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from startup_phases import LastLaunch, ParsePhases, ParseStartup, StartupMetrics
+
+# Canned server logs of one start each, launched at 12:00:00 like the last marker in every log
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_logs")
+LAUNCH = datetime(2025, 8, 18, 12, 0, 0)
+
+def ReadLog(name: str):
+    with open(os.path.join(LOG_DIR, name), "r") as f:
+        return f.read().splitlines()
+
+def WriteState(folder, startup_seconds: float):
+    state_file = os.path.join(folder, "server_lifecycle.json")
+    with open(state_file, "w") as f:
+        json.dump({"launch_time": LAUNCH.isoformat(), "launch_epoch": LAUNCH.timestamp(),
+                   "startup_seconds": startup_seconds}, f)
+    return state_file
+
+def test_last_launch():
+    # vllm.log has a failed start before the one that counts
+    lines = ReadLog("vllm.log")
+    last = LastLaunch(lines)
+    assert last[0] == "INFO 08-18 12:00:03 [__init__.py:241] Automatically detected platform rocm."
+    assert not any("11:50" in line for line in last)
+    assert LastLaunch(lines[1:5]) == lines[1:5] # No marker, the whole log
+
+def test_vllm_phases():
+    phases = ParsePhases(LastLaunch(ReadLog("vllm.log")), "vLLM", False, LAUNCH)
+    assert phases == {"weight_load_start": 10.0, "weight_load_end": 22.0, "compile_end": 41.0, "kv_cache": 43.0,
+                      "graph_capture_start": 43.0, # The progress bar has no timestamp, it takes the line before
+                      "graph_capture_end": 69.0, "api_server": 72.0}
+    assert StartupMetrics(phases, 73.5, False) == {"Startup time (s)": 73.5, "Weight load (s)": 12.0,
+                                                    "torch.compile (s)": 19.0, "Graph capture (s)": 26.0}
+
+def test_failed_start_is_ignored():
+    # Without LastLaunch the failed start's weight load would be the first one
+    phases = ParsePhases(ReadLog("vllm.log"), "vLLM", False, LAUNCH)
+    assert phases["weight_load_start"] == 0.0
+
+def test_sglang_phases():
+    phases = ParsePhases(LastLaunch(ReadLog("sglang.log")), "SGLang", False, LAUNCH)
+    assert phases == {"weight_load_start": 11.0, "weight_load_end": 21.0, "kv_cache": 22.0,
+                      "graph_capture_start": 23.0, "graph_capture_end": 41.0, "api_server": 44.0}
+    # SGLang logs no torch.compile, the metric is left out
+    assert StartupMetrics(phases, None, False) == {"Weight load (s)": 10.0, "Graph capture (s)": 18.0}
+
+def test_ray_phases():
+    phases = ParsePhases(LastLaunch(ReadLog("ray_vllm.log")), "vLLM", True, LAUNCH)
+    assert phases["ray_start"] == pytest.approx(4.512)
+    assert phases["replica_placement"] == pytest.approx(9.25)
+    assert phases["weight_load_start"] == 21.0
+    assert phases["app_ready"] == pytest.approx(85.01)
+    metrics = StartupMetrics(phases, 86.0, True)
+    assert metrics["Ray placement (s)"] == 21.0
+    assert metrics["Graph capture (s)"] == 25.0
+    assert "Ray placement (s)" not in StartupMetrics(phases, 86.0, False)
+
+def test_parse_startup(tmp_path):
+    startup = ParseStartup(os.path.join(LOG_DIR, "vllm.log"), WriteState(tmp_path, 73.5), "vLLM", False)
+    assert startup["launch_time"] == LAUNCH.isoformat()
+    assert startup["metrics"]["Weight load (s)"] == 12.0
+    assert startup["metrics"]["Startup time (s)"] == 73.5
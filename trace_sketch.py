@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from utils import setup_logger
+
+py_script = os.path.basename(sys.argv[0])
+logger = setup_logger("trace_sketch_logger")
+
+# Per-request traces and mergeable latency sketches of one benchmark run, saved next to its log:
+#   i32_o32_c16_p3000_iter1.trace.npz   columns of every request, the token times as inter-token gaps (CSR)
+#   i32_o32_c16_p3000_iter1.sketch.json a t-digest per latency, ~10 KB each
+# Digests of several iterations, dates or hosts merge into one, so P50/P99/P99.9 of any set of runs are computed
+# from the sketch files alone, without reloading the traces.
+
+TRACE_SUFFIX = ".trace.npz"
+SKETCH_SUFFIX = ".sketch.json"
+LATENCIES = ["TTFT", "TPOT", "ITL", "E2EL"] # Sketched in ms, named like utils.benchmark_metrics
+QUANTILES = [50, 99, 99.9]
+DEFAULT_COMPRESSION = 500 # About compression/2 centroids, P99.9 within ~1% of the exact value
+
+class TDigest:
+    """Merging t-digest: centroids (mean, weight) sorted by mean, sized by the k1 scale function so the tails keep
+    single values. Adding a batch or merging digests is one sort and one grouping, no per-value loop."""
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def _Compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        # k1(q) = compression / 2π * asin(2q - 1), centroids whose middle falls into the same unit of k are merged
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1)))
+        starts = np.flatnonzero(np.r_[True, np.diff(k) != 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def Add(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        self._Compress(np.r_[self.means, values], np.r_[self.weights, np.ones(len(values))])
+        return self
+
+    @classmethod
+    def MergeAll(cls, digests: list):
+        digests = [digest for digest in digests if digest.count > 0]
+        merged = cls(min((digest.compression for digest in digests), default=DEFAULT_COMPRESSION))
+        if digests:
+            merged.min = min(digest.min for digest in digests)
+            merged.max = max(digest.max for digest in digests)
+            merged._Compress(np.concatenate([digest.means for digest in digests]),
+                             np.concatenate([digest.weights for digest in digests]))
+        return merged
+
+    def Quantile(self, q):
+        """Value at quantile q in [0, 1] (scalar or array), interpolated between centroid centers. NaN if empty."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return np.interp(np.asarray(q) * self.count, np.r_[0, centers, self.count], np.r_[self.min, self.means, self.max])
+
+    def ToDict(self):
+        return {"compression": self.compression, "min": float(self.min), "max": float(self.max),
+                "means": self.means.tolist(), "weights": self.weights.astype(np.int64).tolist()}
+
+    @classmethod
+    def FromDict(cls, data: dict):
+        digest = cls(data["compression"])
+        digest.means = np.asarray(data["means"], dtype=float)
+        digest.weights = np.asarray(data["weights"], dtype=float)
+        if len(digest.weights):
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+def MakeTrace(ttfts, itls, input_lens, output_lens, errors, starts=None, source: str = ""):
+    """Columnar trace in seconds. itls is a list per request, stored flat with the offset of each request.
+    A failed request has an error message, its ttft is NaN."""
+    n = len(ttfts)
+    gaps = [np.asarray(itl if itl else [], dtype=np.float32) for itl in itls]
+    ttft = np.array([np.nan if t is None or error else t for t, error in zip(ttfts, errors)], dtype=np.float64)
+    return {
+        "start_s": np.asarray(starts if starts is not None else [np.nan] * n, dtype=np.float64),
+        "ttft_s": ttft,
+        # Last token - request start, the token times are start + ttft + cumsum(itl)
+        "e2el_s": ttft + np.array([gap.sum(dtype=np.float64) for gap in gaps]),
+        "input_len": np.asarray(input_lens, dtype=np.int32),
+        "output_len": np.asarray(output_lens, dtype=np.int32),
+        "failed": np.array([bool(error) for error in errors]),
+        "itl_s": np.concatenate(gaps) if gaps else np.empty(0, dtype=np.float32),
+        "itl_offsets": np.r_[0, np.cumsum([len(gap) for gap in gaps])].astype(np.int64),
+        "source": np.array(source),
+    }
+
+def TraceFromBenchClient(requests: list):
+    # Per-request results of bench_client.py
+    return MakeTrace([r["ttft"] for r in requests], [r["itl"] for r in requests], [r["input_len"] for r in requests],
+                     [r["output_len"] for r in requests], [r["error"] for r in requests],
+                     starts=[r["start"] for r in requests], source="bench_client")
+
+def TraceFromEngineResult(result: dict):
+    # vllm bench serve --save-detailed and sglang.bench_serving --output-details save the same per-request lists
+    n = len(result["ttfts"])
+    errors = result.get("errors") or [""] * n
+    return MakeTrace(result["ttfts"], result["itls"], result.get("input_lens", [0] * n), result["output_lens"], errors,
+                     starts=result.get("start_times"), source=result.get("backend", "engine"))
+
+def LoadEngineResult(result_file: str):
+    # sglang.bench_serving appends one JSON line per run to --output-file, the last one is this run
+    with open(result_file, "r") as f:
+        text = f.read().strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(text.splitlines()[-1])
+
+def SaveTrace(trace_file: str, trace: dict):
+    tmp = f"{trace_file}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp, **trace)
+    os.replace(tmp, trace_file)
+
+def LoadTrace(trace_file: str):
+    with np.load(trace_file) as data:
+        return {key: data[key] for key in data.files}
+
+def TraceLatencies(trace: dict):
+    """{latency: values in ms} of the successful requests, TPOT excludes the first token like the engine clients."""
+    ok = ~trace["failed"] & np.isfinite(trace["ttft_s"])
+    request_of_gap = np.repeat(np.arange(len(ok)), np.diff(trace["itl_offsets"]))
+    multi = ok & (trace["output_len"] > 1)
+    return {
+        "TTFT": trace["ttft_s"][ok] * 1000,
+        "TPOT": (trace["e2el_s"][multi] - trace["ttft_s"][multi]) / (trace["output_len"][multi] - 1) * 1000,
+        "ITL": trace["itl_s"][ok[request_of_gap]].astype(np.float64) * 1000,
+        "E2EL": trace["e2el_s"][ok] * 1000,
+    }
+
+def BuildSketches(trace: dict, compression: float = DEFAULT_COMPRESSION):
+    return {latency: TDigest(compression).Add(values) for latency, values in TraceLatencies(trace).items()}
+
+def SaveSketches(sketch_file: str, sketches: dict):
+    with open(sketch_file, "w") as f:
+        json.dump({latency: digest.ToDict() for latency, digest in sketches.items()}, f)
+
+def LoadSketches(sketch_file: str):
+    with open(sketch_file, "r") as f:
+        return {latency: TDigest.FromDict(data) for latency, data in json.load(f).items()}
+
+def MergeSketchFiles(sketch_files: list):
+    loaded = [LoadSketches(sketch_file) for sketch_file in sketch_files]
+    return {latency: TDigest.MergeAll([sketches[latency] for sketches in loaded if latency in sketches])
+            for latency in LATENCIES if any(latency in sketches for sketches in loaded)}
+
+def QuantileMetricName(latency: str, quantile: float):
+    return f"Median {latency} (ms)" if quantile == 50 else f"P{quantile:g} {latency} (ms)"
+
+def SketchMetrics(sketches: dict, quantiles: list = QUANTILES):
+    """{"Median TTFT (ms)": ..., "P99 TTFT (ms)": ..., "P99.9 TTFT (ms)": ...} of the merged sketches."""
+    metrics = {}
+    for latency, digest in sketches.items():
+        if digest.count == 0:
+            continue
+        for quantile, value in zip(quantiles, digest.Quantile(np.asarray(quantiles) / 100)):
+            metrics[QuantileMetricName(latency, quantile)] = float(value)
+    return metrics
+
+def TracePaths(trace_file: str):
+    # i32_o32_c16_p3000_iter1.trace.npz -> (itself, i32_o32_c16_p3000_iter1.sketch.json)
+    if not trace_file.endswith(TRACE_SUFFIX):
+        raise ValueError(f"Trace file '{trace_file}' doesn't end with {TRACE_SUFFIX}")
+    return trace_file, trace_file[:-len(TRACE_SUFFIX)] + SKETCH_SUFFIX
+
+def SaveTraceAndSketches(trace_file: str, trace: dict):
+    trace_file, sketch_file = TracePaths(trace_file)
+    SaveTrace(trace_file, trace)
+    SaveSketches(sketch_file, BuildSketches(trace))
+    return sketch_file
+
+def Convert(args):
+    trace = TraceFromEngineResult(LoadEngineResult(args.input))
+    sketch_file = SaveTraceAndSketches(args.trace, trace)
+    logger.info(f"[{py_script}] {len(trace['ttft_s'])} requests of {args.input} are saved to {args.trace} and {sketch_file}.")
+    if args.remove_input:
+        os.remove(args.input)
+
+def Merge(args):
+    sketches = MergeSketchFiles(args.sketch_files)
+    counts = {latency: int(digest.count) for latency, digest in sketches.items()}
+    logger.info(f"[{py_script}] Merged {len(args.sketch_files)} sketch files, samples: {counts}")
+    metrics = SketchMetrics(sketches, args.quantiles)
+    for metric, value in metrics.items():
+        print("{:<40} {:<10.2f}".format(metric + ":", value))
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump(metrics, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request traces and mergeable latency sketches")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    convert = subparsers.add_parser("convert", help="Save the detailed result of vllm bench serve / sglang.bench_serving as trace and sketch")
+    convert.add_argument("--input", type=str, required=True, help="vllm --save-detailed result or sglang --output-details file")
+    convert.add_argument("--trace", type=str, required=True, help=f"Output trace, must end with {TRACE_SUFFIX}")
+    convert.add_argument("--remove-input", action="store_true", help="Delete the JSON result once converted")
+
+    merge = subparsers.add_parser("merge", help="Percentiles of several runs from their sketch files")
+    merge.add_argument("sketch_files", nargs="+", help=f"*{SKETCH_SUFFIX} of any iterations, dates or hosts")
+    merge.add_argument("--quantiles", type=float, nargs="+", default=QUANTILES)
+    merge.add_argument("--json-file", type=str, default=None, help="Save the percentiles here")
+    args = parser.parse_args()
+
+    {"convert": Convert, "merge": Merge}[args.action](args)
+
+
+'''
+python3 trace_sketch.py convert --input Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter1.detail.json \
+    --trace Result/2025-08-18/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter1.trace.npz --remove-input
+python3 trace_sketch.py merge Result/2025-08-1*/vLLM_standalone/meta-llama_Llama-3.1-8B-Instruct/i32_o32_c16_p3000_iter*.sketch.json
+'''